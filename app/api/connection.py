@@ -1,6 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException
 from typing import List
 from sqlalchemy.orm import Session
+from app.core.credential_cache import credential_cache
 from app.core.security import get_current_active_user
 from app.models.connections import Connection as DbConnection
 from app.schemas import connection as db_schemas
@@ -51,6 +52,7 @@ def update_db_connection(
     for field, value in conn.dict(exclude_unset=True).items():
         setattr(db_conn, field, value)
     db.commit()
+    credential_cache.invalidate(conn_id)
     db.refresh(db_conn)
     return db_conn
 
@@ -66,4 +68,5 @@ def delete_db_connection(
         raise HTTPException(status_code=404, detail="DbConnection not found")
     db.delete(db_conn)
     db.commit()
+    credential_cache.invalidate(conn_id)
     return {"message": "DbConnection deleted"}
@@ -0,0 +1,61 @@
+import gzip
+import os
+from typing import Iterator
+
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import FileResponse, StreamingResponse
+from app.core.config import settings
+
+router = APIRouter()
+
+_HTML_MEDIA_TYPE = "text/html; charset=utf-8"
+# 客户端不支持 gzip 时解压返回的块大小
+_CHUNK_SIZE = 64 * 1024
+
+
+def _accepts_gzip(accept_encoding: str) -> bool:
+    """按 Accept-Encoding 判断客户端是否接受 gzip，q=0 视为拒绝"""
+    for item in accept_encoding.split(","):
+        coding, _, params = item.strip().partition(";")
+        if coding.strip().lower() not in ("gzip", "*"):
+            continue
+        quality = params.strip()
+        if quality.startswith("q="):
+            try:
+                return float(quality[2:]) > 0
+            except ValueError:
+                return False
+        return True
+    return False
+
+
+def _decompress(path: str) -> Iterator[bytes]:
+    with gzip.open(path, "rb") as f:
+        while True:
+            chunk = f.read(_CHUNK_SIZE)
+            if not chunk:
+                return
+            yield chunk
+
+
+@router.get("/reports/{filename}", include_in_schema=False)
+def get_report(filename: str, request: Request):
+    """
+    返回报告文件。压缩保存的报告在客户端支持 gzip 时直接返回压缩内容并设置 Content-Encoding，
+    否则边读边解压；请求 .html 时若只存在 .html.gz 也按压缩报告返回，兼容未压缩的历史报告
+    """
+    if os.path.basename(filename) != filename or filename.startswith("."):
+        raise HTTPException(status_code=404, detail="Report not found")
+    path = os.path.join(settings.REPORT_OUTPUT_DIR, filename)
+    if not filename.endswith(".gz"):
+        if os.path.isfile(path):
+            return FileResponse(path, media_type=_HTML_MEDIA_TYPE)
+        path += ".gz"
+    if not os.path.isfile(path):
+        raise HTTPException(status_code=404, detail="Report not found")
+
+    headers = {"Vary": "Accept-Encoding"}
+    if _accepts_gzip(request.headers.get("accept-encoding", "")):
+        headers["Content-Encoding"] = "gzip"
+        return FileResponse(path, media_type=_HTML_MEDIA_TYPE, headers=headers)
+    return StreamingResponse(_decompress(path), media_type=_HTML_MEDIA_TYPE, headers=headers)
@@ -1,22 +1,87 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from typing import Optional
-from app.models.tasks import Task
+from sqlalchemy.orm import Session, load_only, selectinload
+from app.models.tasks import Result, ResultType, TaskLog
+from app.schemas import result as result_schemas
 from app.main import get_db
-from sqlalchemy.orm import Session
 
 router = APIRouter()
 
-@router.get("/tasks/{task_id}/reports")
-def get_comparison_reports(
-    task_id: int, format: Optional[str] = None, db: Session = Depends(get_db)
+# 不返回定义时只加载这些列，避免读取大文本
+_SUMMARY_COLUMNS = (
+    Result.id,
+    Result.task_log_id,
+    Result.type,
+    Result.object_name,
+    Result.has_differences,
+    Result.target_conn_id,
+    Result.difference_details,
+    Result.change_sql,
+    Result.created_at,
+)
+
+
+@router.get("/task_logs/{task_log_id}/results", response_model=result_schemas.ResultPage)
+def get_task_log_results(
+    task_log_id: int,
+    type: Optional[ResultType] = Query(None, description="结果类型"),
+    has_differences: Optional[bool] = Query(None, description="是否存在差异"),
+    name_prefix: Optional[str] = Query(None, description="对象名称前缀"),
+    include_definitions: bool = Query(False, description="是否返回源/目标对象定义"),
+    cursor: Optional[int] = Query(None, ge=0, description="上一页返回的 next_cursor"),
+    limit: int = Query(100, ge=1, le=500),
+    db: Session = Depends(get_db),
 ):
-    """获取比较报告"""
-    comparison = db.query(Task).get(comparison_id)
-    if not comparison:
-        raise HTTPException(status_code=404, detail="Comparison not found")
+    """
+    按游标分页获取任务日志的比较结果，按结果ID升序返回。
+    过滤条件由 (task_log_id, type, has_differences) 和 (task_log_id, object_name) 索引支撑
+    """
+    task_log = (
+        db.query(TaskLog.id, TaskLog.duplicate_of).filter(TaskLog.id == task_log_id).first()
+    )
+    if task_log is None:
+        raise HTTPException(status_code=404, detail="TaskLog not found")
+
+    # 已压缩的运行不再保存结果，读取其引用的结果相同的运行
+    query = db.query(Result).filter(
+        Result.task_log_id == (task_log.duplicate_of or task_log_id)
+    )
+    if type is not None:
+        query = query.filter(Result.type == type)
+    if has_differences is not None:
+        query = query.filter(Result.has_differences == has_differences)
+    if name_prefix:
+        query = query.filter(Result.object_name.startswith(name_prefix, autoescape=True))
+    if cursor is not None:
+        query = query.filter(Result.id > cursor)
+
+    if include_definitions:
+        # 定义文本按哈希批量加载，避免逐条查询 definitions 表
+        query = query.options(
+            selectinload(Result.source_definition_ref),
+            selectinload(Result.target_definition_ref),
+        )
+    else:
+        query = query.options(load_only(*_SUMMARY_COLUMNS))
 
-    reports = comparison.reports
-    if format:
-        reports = [r for r in reports if r.format == format]
+    results = query.order_by(Result.id).limit(limit).all()
+    items = []
+    for result in results:
+        item = result_schemas.ResultOut(
+            id=result.id,
+            task_log_id=result.task_log_id,
+            type=result.type,
+            object_name=result.object_name,
+            has_differences=result.has_differences,
+            target_conn_id=result.target_conn_id,
+            difference_details=result.difference_details,
+            change_sql=result.change_sql,
+            created_at=result.created_at,
+        )
+        if include_definitions:
+            item.source_definition = result.source_definition
+            item.target_definition = result.target_definition
+        items.append(item)
 
-    return reports
+    next_cursor = results[-1].id if len(results) == limit else None
+    return result_schemas.ResultPage(items=items, next_cursor=next_cursor)
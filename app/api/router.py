@@ -1,5 +1,5 @@
 from fastapi import APIRouter
-from app.api import auth, connection, task, result, notify
+from app.api import auth, connection, task, result, notify, snapshot
 
 api_router = APIRouter(prefix="/api/v1", tags=["api"])
 
@@ -8,3 +8,4 @@ api_router.include_router(connection.router, prefix="", tags=["connection"])
 api_router.include_router(task.router, prefix="", tags=["task"])
 api_router.include_router(result.router, tags=["result"])
 api_router.include_router(notify.router, tags=["notify"])
+api_router.include_router(snapshot.router, tags=["snapshot"])
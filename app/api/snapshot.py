@@ -0,0 +1,147 @@
+from fastapi import APIRouter, Depends, File, Form, HTTPException, UploadFile
+from fastapi.responses import Response
+from typing import Any, Dict, List, Optional
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.core.security import get_current_active_user
+from app.models.connections import Connection
+from app.models.snapshots import SchemaSnapshot
+from app.models.users import User
+from app.schemas import snapshot as snapshot_schemas
+from app.services.snapshot_service import SchemaSnapshotService, load_snapshot
+from app.main import get_db
+
+router = APIRouter()
+
+
+def _get_snapshot(db: Session, snapshot_id: int) -> SchemaSnapshot:
+    snapshot = db.query(SchemaSnapshot).get(snapshot_id)
+    if not snapshot or snapshot.deleted:
+        raise HTTPException(status_code=404, detail="Snapshot not found")
+    return snapshot
+
+
+def _get_connection(db: Session, conn_id: int) -> Connection:
+    conn = db.query(Connection).get(conn_id)
+    if not conn or conn.deleted:
+        raise HTTPException(status_code=404, detail="DbConnection not found")
+    return conn
+
+
+@router.get("/snapshots", response_model=List[snapshot_schemas.SnapshotOut])
+def list_snapshots(
+    db: Session = Depends(get_db), current_user: User = Depends(get_current_active_user)
+):
+    """获取所有库结构快照"""
+    return (
+        db.query(SchemaSnapshot)
+        .filter(SchemaSnapshot.deleted == False)
+        .order_by(SchemaSnapshot.id.desc())
+        .all()
+    )
+
+
+@router.post("/snapshots", response_model=snapshot_schemas.SnapshotOut)
+def capture_snapshot(
+    snapshot_in: snapshot_schemas.SnapshotCreate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+):
+    """从数据库连接采集库结构快照"""
+    conn = _get_connection(db, snapshot_in.connection_id)
+    try:
+        return SchemaSnapshotService(db).capture(conn, snapshot_in.name)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"采集快照失败：{e}")
+
+
+@router.get("/snapshots/{snapshot_id}/export")
+def export_snapshot(
+    snapshot_id: int,
+    compress: bool = True,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+):
+    """导出快照文件，默认 gzip 压缩"""
+    snapshot = _get_snapshot(db, snapshot_id)
+    if compress:
+        content, media_type, filename = snapshot.content, "application/gzip", f"snapshot_{snapshot.id}.json.gz"
+    else:
+        content, media_type, filename = snapshot.raw, "application/json", f"snapshot_{snapshot.id}.json"
+    return Response(
+        content=content,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+@router.post("/snapshots/import", response_model=snapshot_schemas.SnapshotOut)
+def import_snapshot(
+    file: UploadFile = File(...),
+    name: Optional[str] = Form(None, max_length=100),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+):
+    """导入快照文件（JSON 或 gzip 压缩的 JSON），文件及解压后的内容均不能超过 SNAPSHOT_MAX_SIZE"""
+    max_size = settings.SNAPSHOT_MAX_SIZE
+    data = file.file.read(max_size + 1)
+    if len(data) > max_size:
+        raise HTTPException(status_code=413, detail=f"快照文件超过 {max_size} 字节")
+    try:
+        document = load_snapshot(data, max_size)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return SchemaSnapshotService(db).save(document, name or file.filename or "imported")
+
+
+@router.delete("/snapshots/{snapshot_id}")
+def delete_snapshot(
+    snapshot_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+):
+    """删除快照（软删除）"""
+    snapshot = _get_snapshot(db, snapshot_id)
+    from datetime import datetime
+    snapshot.deleted = True
+    snapshot.deleted_at = datetime.now()
+    db.commit()
+    return {"message": "Snapshot deleted"}
+
+
+@router.post("/snapshots/compare", response_model=snapshot_schemas.SnapshotCompareOut)
+def compare_snapshots(
+    compare_in: snapshot_schemas.SnapshotCompare,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+):
+    """
+    比较快照与实时库或两份快照，结果直接返回不保存。
+    两侧都是快照时只在内存中比较，不访问任何业务数据库
+    """
+    service = SchemaSnapshotService(db)
+    types = set(compare_in.types) if compare_in.types else None
+
+    def load_side(side: snapshot_schemas.SnapshotSide) -> Dict[str, Any]:
+        if side.snapshot_id is not None:
+            return service.load(_get_snapshot(db, side.snapshot_id))
+        # 实时库只获取参与比较的对象类型
+        return service.capture_document(
+            _get_connection(db, side.connection_id), compare_in.config, types
+        )
+
+    try:
+        source = load_side(compare_in.source)
+        target = load_side(compare_in.target)
+        results = service.compare(source, target, types, compare_in.config)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"比较失败：{e}")
+
+    items = [r for r in results if r.has_differences or not compare_in.only_differences]
+    return {
+        "total_objects": len(results),
+        "total_differences": sum(1 for r in results if r.has_differences),
+        "items": items,
+    }
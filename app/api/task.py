@@ -1,16 +1,38 @@
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException
+from typing import List, Optional
+from sqlalchemy import text
 from sqlalchemy.orm import Session
 from app.models.tasks import Task, TaskLog
 from app.schemas import task as task_schemas
 from app.main import get_db
-from app.services.task_service import DatabaseComparisonService
+from app.services.job_service import JobQueueService
+from app.services.scheduler_service import validate_schedule
+from app.services.comparators.object_filter import validate_filters
 from app.models.connections import Connection
 from fastapi import Query
 from fastapi.responses import JSONResponse
 
 router = APIRouter()
 
+
+def _resolve_target_conn_ids(
+    db: Session, target_conn_id: int, target_conn_ids: Optional[List[int]]
+) -> Optional[List[int]]:
+    """合并多目标比较的目标库列表（target_conn_id 排在首位并去重），只有一个目标库时返回 None"""
+    conn_ids = list(dict.fromkeys([target_conn_id, *(target_conn_ids or [])]))
+    if len(conn_ids) == 1:
+        return None
+    found = {
+        conn_id
+        for (conn_id,) in db.query(Connection.id).filter(
+            Connection.id.in_(conn_ids), Connection.deleted == False
+        )
+    }
+    missing = [conn_id for conn_id in conn_ids if conn_id not in found]
+    if missing:
+        raise HTTPException(status_code=400, detail=f"目标库不存在：{missing}")
+    return conn_ids
+
 @router.get("/tasks", response_model=List[task_schemas.Task])
 def list_tasks(db: Session = Depends(get_db)):
     # 只查询未删除的任务
@@ -30,33 +52,63 @@ def get_task_status(task_id: int, db: Session = Depends(get_db)):
         raise HTTPException(status_code=404, detail="Task not found")
     return task.status
 
+def _approximate_log_count(db: Session, task_id: int) -> int:
+    """估算任务的日志条数：MySQL 下读取执行计划中索引统计的行数，不扫描索引；其他数据库精确统计"""
+    if db.get_bind().dialect.name != "mysql":
+        return db.query(TaskLog).filter(TaskLog.task_id == task_id).count()
+    row = db.execute(
+        text("EXPLAIN SELECT id FROM task_logs WHERE task_id = :task_id"),
+        {"task_id": task_id},
+    ).mappings().first()
+    return int(row["rows"] or 0) if row else 0
+
+
 @router.get("/task_logs")
 def get_task_logs(
     task_id: int = Query(...),
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100),
+    cursor: Optional[int] = Query(None, ge=0, description="上一页返回的 next_cursor，指定时忽略 page"),
+    total: str = Query("exact", pattern="^(exact|approx|none)$", description="总数统计方式"),
     db: Session = Depends(get_db)
 ):
+    """
+    按执行时间倒序获取任务日志，(task_id, id) 索引支撑过滤和排序。
+    指定 cursor 时按游标翻页，耗时与历史日志数量无关；
+    total 为 approx 时返回索引统计的估算值，为 none 时不统计总数
+    """
     query = db.query(TaskLog).filter(TaskLog.task_id == task_id)
-    total = query.count()
-    logs = (
-        query.order_by(TaskLog.id.desc())
-        .offset((page - 1) * page_size)
-        .limit(page_size)
-        .all()
-    )
+    if total == "exact":
+        total_count = query.count()
+    elif total == "approx":
+        total_count = _approximate_log_count(db, task_id)
+    else:
+        total_count = None
+
+    query = query.order_by(TaskLog.id.desc())
+    if cursor is not None:
+        query = query.filter(TaskLog.id < cursor)
+    else:
+        query = query.offset((page - 1) * page_size)
+    logs = query.limit(page_size).all()
+    next_cursor = logs[-1].id if len(logs) == page_size else None
     result = [
         {
+            'id': log.id,
             'task_id': log.task_id,
             'status': log.status.value if hasattr(log.status, 'value') else str(log.status),
             'error_message': log.error_message,
             'created_at': log.created_at.strftime('%Y-%m-%d %H:%M:%S') if hasattr(log, 'created_at') and log.created_at else '',
             'result_url': log.result_url,
-            'cost_time': log.cost_time  # 添加执行耗时字段
+            'cost_time': log.cost_time,  # 添加执行耗时字段
+            'telemetry': log.telemetry,  # 各阶段耗时、查询次数等运行统计
+            'duplicate_of': log.duplicate_of,  # 压缩后引用的结果相同的运行
         }
         for log in logs
     ]
-    return JSONResponse(content={"total": total, "items": result})
+    return JSONResponse(
+        content={"total": total_count, "items": result, "next_cursor": next_cursor}
+    )
 
 @router.post("/tasks", response_model=task_schemas.Task)
 def create_task(task_in: task_schemas.TaskCreate, db: Session = Depends(get_db)):
@@ -69,6 +121,14 @@ def create_task(task_in: task_schemas.TaskCreate, db: Session = Depends(get_db))
     target_conn = db.query(Connection).get(task_in.target_conn_id)
     if not source_conn or not target_conn:
         raise HTTPException(status_code=400, detail="源库或目标库不存在")
+    try:
+        validate_schedule(task_in.schedule_cron, task_in.schedule_interval)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"定时配置无效：{e}")
+    try:
+        validate_filters(task_in.config)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"过滤规则无效：{e}")
     # 只保留模型定义的字段
     task_data = {
         'name': task_in.name,
@@ -77,7 +137,11 @@ def create_task(task_in: task_schemas.TaskCreate, db: Session = Depends(get_db))
         'source_conn_name': source_conn.name,
         'target_conn_id': task_in.target_conn_id,
         'target_conn_name': target_conn.name,
+        'target_conn_ids': _resolve_target_conn_ids(db, task_in.target_conn_id, task_in.target_conn_ids),
         'config': task_in.config,
+        'schedule_enabled': task_in.schedule_enabled,
+        'schedule_cron': task_in.schedule_cron,
+        'schedule_interval': task_in.schedule_interval,
         # status等由模型默认
     }
     task = Task(**task_data)
@@ -91,7 +155,7 @@ def update_task(task_id: int, task_in: task_schemas.TaskCreate, db: Session = De
     task = db.query(Task).get(task_id)
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
-    # 只允许修改名称、描述、config
+    # 只允许修改名称、描述、config、多目标列表和定时配置
     if task_in.name:
         exists = db.query(Task).filter(Task.name == task_in.name, Task.id != task_id).first()
         if exists:
@@ -100,7 +164,27 @@ def update_task(task_id: int, task_in: task_schemas.TaskCreate, db: Session = De
     if task_in.description is not None:
         task.description = task_in.description
     if hasattr(task_in, 'config') and task_in.config is not None:
+        try:
+            validate_filters(task_in.config)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=f"过滤规则无效：{e}")
         task.config = task_in.config
+    # 多目标列表只在请求中显式传入时修改，首个目标库仍为任务的目标库
+    if 'target_conn_ids' in task_in.model_fields_set:
+        task.target_conn_ids = _resolve_target_conn_ids(db, task.target_conn_id, task_in.target_conn_ids)
+    # 定时配置只在请求中显式传入时修改
+    schedule_fields = {'schedule_enabled', 'schedule_cron', 'schedule_interval'}
+    if schedule_fields & task_in.model_fields_set:
+        cron = task_in.schedule_cron if 'schedule_cron' in task_in.model_fields_set else task.schedule_cron
+        interval = task_in.schedule_interval if 'schedule_interval' in task_in.model_fields_set else task.schedule_interval
+        try:
+            validate_schedule(cron, interval)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=f"定时配置无效：{e}")
+        task.schedule_cron = cron
+        task.schedule_interval = interval
+        if 'schedule_enabled' in task_in.model_fields_set:
+            task.schedule_enabled = task_in.schedule_enabled
     db.commit()
     db.refresh(task)
     return task
@@ -123,19 +207,14 @@ def delete_task(task_id: int, db: Session = Depends(get_db)):
 # 推荐使用异步接口（见 task_execute_async.py）
 # 保留原接口，但仅作兼容用途
 @router.post("/tasks/{task_id}/execute")
-def execute_task(task_id: int, background_tasks: BackgroundTasks, db: Session = Depends(get_db)):
-    """执行数据库对比，生成报告（异步）"""
+def execute_task(task_id: int, db: Session = Depends(get_db)):
+    """执行数据库对比，生成报告（提交到执行队列，由 worker 进程执行）"""
     task = db.query(Task).get(task_id)
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
-    # 后台异步执行
-    background_tasks.add_task(_run_comparison_and_notify, task_id)
-    return {"message": "任务已提交执行，报告生成中。"}
-
-def _run_comparison_and_notify(task_id: int):
-    db = next(get_db())
-    try:
-        comparison_service = DatabaseComparisonService(db)
-        comparison_service.run_comparison(task_id)
-    finally:
-        db.close()
+    job = JobQueueService(db).enqueue(task_id)
+    return {
+        "message": "任务已提交执行，报告生成中。",
+        "job_id": job.id,
+        "task_log_id": job.task_log_id,
+    }
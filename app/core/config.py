@@ -37,6 +37,99 @@ class Settings(BaseSettings):
 
     # 报告配置
     REPORT_OUTPUT_DIR: str = Field(default="./reports")
+    # 生成报告时每次从数据库读取的结果行数
+    REPORT_PAGE_SIZE: int = Field(default=500)
+    # 报告是否以 gzip 压缩保存（.html.gz），访问时按客户端是否支持 gzip 直接返回压缩内容或解压后返回
+    REPORT_COMPRESSION: bool = Field(default=True)
+    # gzip 压缩级别（1-9）
+    REPORT_COMPRESSION_LEVEL: int = Field(default=6)
+
+    # 导入库结构快照时文件及解压后内容的最大字节数
+    SNAPSHOT_MAX_SIZE: int = Field(default=100 * 1024 * 1024)
+
+    # 对象定义按内容哈希去重存储时是否使用 zlib 压缩
+    DEFINITION_COMPRESSION: bool = Field(default=True)
+
+    # 应用启动时是否建表并初始化 admin 用户；关闭后需执行 python -m app.scripts.init_db
+    DB_INIT_ON_STARTUP: bool = Field(default=True)
+
+    # 解密后连接密码的缓存时间（秒），0 表示不缓存
+    CREDENTIAL_CACHE_TTL: float = Field(default=3600)
+
+    # 对比执行配置
+    # 表结构元数据加载方式：bulk 按库批量查询 INFORMATION_SCHEMA，per_table 逐表查询，
+    # parallel 逐表查询但分散到连接池中的多个连接并发执行
+    TABLE_METADATA_MODE: str = Field(default="bulk")
+    # parallel 模式下每侧并发查询的连接数
+    TABLE_METADATA_WORKERS: int = Field(default=4)
+    # 是否并行执行配置、表、视图、存储过程、函数、触发器六个比较阶段
+    COMPARISON_PARALLEL: bool = Field(default=False)
+    # 并行执行时的线程数
+    COMPARISON_WORKERS: int = Field(default=6)
+    # 每个数据库连接配置在单次运行内的最大连接数
+    CONNECTION_POOL_SIZE: int = Field(default=6)
+    # 等待空闲连接的超时时间（秒）
+    CONNECTION_POOL_TIMEOUT: float = Field(default=60)
+    # 空闲超过该时间（秒）的连接在借出前先 ping 检查
+    CONNECTION_POOL_PING_INTERVAL: float = Field(default=30)
+    # 表统计信息（行数、数据/索引大小、自增值）变化比例超过该值时标记为差异，
+    # 可在任务配置 statistics.ratio_threshold 中覆盖
+    STATISTICS_RATIO_THRESHOLD: float = Field(default=0.1)
+    # 表数据比较（任务配置 data_comparison.enabled 开启）
+    # 顶层区间的行数
+    DATA_CHUNK_SIZE: int = Field(default=100000)
+    # 区间行数不超过该值时改为逐行比对行哈希
+    DATA_LEAF_ROWS: int = Field(default=1000)
+    # 不一致区间每次细分的份数
+    DATA_SPLIT_FACTOR: int = Field(default=10)
+    # 每张表最多记录的差异行主键数
+    DATA_MAX_REPORTED_ROWS: int = Field(default=100)
+    # 比较结果批量写入时每批插入并提交的行数
+    RESULT_BATCH_SIZE: int = Field(default=1000)
+
+    # 执行队列配置
+    # 是否在 API 进程内启动队列 worker；关闭时需单独运行 python -m app.worker，否则提交的执行不会被处理
+    JOB_WORKER_ENABLED: bool = Field(default=True)
+    # 每个 worker 进程同时执行的任务数
+    JOB_WORKER_CONCURRENCY: int = Field(default=2)
+    # 队列为空时的轮询间隔（秒）
+    JOB_POLL_INTERVAL: float = Field(default=2)
+    # 执行中任务的心跳间隔（秒）
+    JOB_HEARTBEAT_INTERVAL: float = Field(default=10)
+    # 心跳超过该时间（秒）未刷新的任务视为中断
+    JOB_HEARTBEAT_TIMEOUT: float = Field(default=120)
+    # 中断任务的最大执行次数，未达到时重新排队
+    JOB_MAX_ATTEMPTS: int = Field(default=2)
+    # 所有 worker 合计同时执行的任务数上限，0 表示不限制
+    JOB_GLOBAL_CONCURRENCY: int = Field(default=0)
+
+    # 数据保留配置，可在任务配置 retention 节按任务覆盖 keep_runs、keep_days、keep_differences、compact
+    # 是否由调度器定期清理过期的任务日志、比较结果和报告文件；也可单独运行 python -m app.scripts.retention
+    RETENTION_ENABLED: bool = Field(default=False)
+    # 定期清理的间隔（秒）
+    RETENTION_INTERVAL: int = Field(default=3600)
+    # 每个任务保留最近的运行次数
+    RETENTION_KEEP_RUNS: int = Field(default=100)
+    # 保留最近天数内的运行，与运行次数满足其一即保留，0 表示不按天数保留
+    RETENTION_KEEP_DAYS: int = Field(default=30)
+    # 是否把结果完全相同的相邻运行压缩为引用
+    RETENTION_COMPACT: bool = Field(default=False)
+    # 每批删除的行数，每批单独提交
+    RETENTION_BATCH_SIZE: int = Field(default=1000)
+    # 修改时间在该秒数内的报告文件视为可能仍在生成，不作为孤立文件删除
+    RETENTION_REPORT_GRACE_PERIOD: int = Field(default=3600)
+
+    # 定时调度配置
+    # 是否在 API 进程内启动调度器；也可单独运行 python -m app.scheduler
+    SCHEDULER_ENABLED: bool = Field(default=False)
+    # cron 表达式所用时区
+    SCHEDULER_TIMEZONE: str = Field(default="Asia/Shanghai")
+    # 每次触发随机延后的最大秒数，用于错开同一时刻的大量任务
+    SCHEDULER_JITTER: int = Field(default=300)
+    # 从数据库同步任务定时配置的间隔（秒）
+    SCHEDULER_SYNC_INTERVAL: int = Field(default=60)
+    # 错过触发时间后仍允许补执行的秒数
+    SCHEDULER_MISFIRE_GRACE_TIME: int = Field(default=600)
 
 
 settings = Settings()
@@ -0,0 +1,58 @@
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+
+from app.core.config import settings
+from app.core.encrypt_util import decrypt_password
+
+
+class CredentialCache:
+    """
+    解密后连接密码的进程内缓存，按 (连接ID, updated_at) 区分版本，超过 TTL 后重新解密。
+    同时校验密文，连接对象在保存前修改了密码也不会命中旧值
+    """
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        # (连接ID, updated_at) -> (密文, 明文, 过期时间)
+        self._entries: Dict[Tuple[Any, Optional[datetime]], Tuple[str, str, float]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, conn_id: Any, updated_at: Optional[datetime], token: str) -> str:
+        """返回密文对应的明文密码，未命中时解密并缓存"""
+        if conn_id is None or self.ttl <= 0:
+            return decrypt_password(token)
+
+        key = (conn_id, updated_at)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is not None and entry[0] == token and entry[2] > now:
+            return entry[1]
+
+        plain = decrypt_password(token)
+        with self._lock:
+            self._evict_expired(now)
+            # 同一连接只保留最新版本
+            for stale in [k for k in self._entries if k[0] == conn_id]:
+                del self._entries[stale]
+            self._entries[key] = (token, plain, now + self.ttl)
+        return plain
+
+    def invalidate(self, conn_id: Any) -> None:
+        """连接被修改或删除时清除其缓存"""
+        with self._lock:
+            for key in [k for k in self._entries if k[0] == conn_id]:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def _evict_expired(self, now: float) -> None:
+        for key in [k for k, v in self._entries.items() if v[2] <= now]:
+            del self._entries[key]
+
+
+credential_cache = CredentialCache(ttl=settings.CREDENTIAL_CACHE_TTL)
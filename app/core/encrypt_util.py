@@ -3,7 +3,9 @@ from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
 from cryptography.hazmat.primitives import hashes
 from cryptography.hazmat.backends import default_backend
 from base64 import urlsafe_b64encode, urlsafe_b64decode
+from functools import lru_cache
 import os
+import time
 from app.core.config import settings
 
 # Use SECRET_KEY for key derivation, but you may want to use a separate salt for production
@@ -21,16 +23,26 @@ def _derive_key(secret_key: bytes, salt: bytes = SALT) -> bytes:
     )
     return kdf.derive(secret_key)
 
-KEY = _derive_key(SECRET_KEY)
+# 密钥派生需要 10 万次 PBKDF2 迭代，推迟到第一次加解密时执行并缓存结果，
+# 不使用连接密码的进程（alembic、worker 启动、脚本等）无需付出这部分开销
+@lru_cache(maxsize=1)
+def get_key() -> bytes:
+    start = time.perf_counter()
+    key = _derive_key(SECRET_KEY)
+    print(f"连接密码密钥派生耗时：{time.perf_counter() - start:.3f} 秒")
+    return key
+
+# AESGCM 对象无状态、线程安全，全进程复用一个实例
+@lru_cache(maxsize=1)
+def _get_cipher() -> AESGCM:
+    return AESGCM(get_key())
 
 def encrypt_password(plain: str) -> str:
-    aesgcm = AESGCM(KEY)
     nonce = os.urandom(12)
-    ct = aesgcm.encrypt(nonce, plain.encode(), None)
+    ct = _get_cipher().encrypt(nonce, plain.encode(), None)
     return urlsafe_b64encode(nonce + ct).decode()
 
 def decrypt_password(token: str) -> str:
     raw = urlsafe_b64decode(token.encode())
     nonce, ct = raw[:12], raw[12:]
-    aesgcm = AESGCM(KEY)
-    return aesgcm.decrypt(nonce, ct, None).decode()
+    return _get_cipher().decrypt(nonce, ct, None).decode()
@@ -0,0 +1,28 @@
+import time
+from typing import Dict
+
+
+class StartupTimer:
+    """记录进程启动各阶段耗时，用于衡量冷启动时间"""
+
+    def __init__(self):
+        self._started = time.perf_counter()
+        self._last = self._started
+        self.phases: Dict[str, float] = {}
+
+    def mark(self, name: str) -> None:
+        """记录从上一个阶段结束到现在的耗时"""
+        now = time.perf_counter()
+        self.phases[name] = round(now - self._last, 4)
+        self._last = now
+
+    def total(self) -> float:
+        return round(self._last - self._started, 4)
+
+    def report(self) -> str:
+        parts = "，".join(f"{name} {seconds:.3f}s" for name, seconds in self.phases.items())
+        return f"启动耗时 {self.total():.3f}s：{parts}"
+
+
+# 应用进程的启动计时，在 app.main 中最先导入
+startup_timer = StartupTimer()
@@ -1,13 +1,13 @@
+from app.core.startup import startup_timer
+import threading
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request
 from fastapi.staticfiles import StaticFiles
 from fastapi.responses import HTMLResponse
 from fastapi.templating import Jinja2Templates
 from app.core.config import settings
-from app.models.tasks import Task, TaskLog
-from app.models.connections import Connection
-from app.models.users import User
-from app.database import engine, SessionLocal
-from app.scripts.create_admin import create_admin_user
+from app.database import SessionLocal
+startup_timer.mark("导入依赖")
 
 # 依赖注入
 def get_db():
@@ -18,33 +18,71 @@ def get_db():
         db.close()
 
 
-# 创建数据库表
-User.metadata.create_all(bind=engine)
-Connection.metadata.create_all(bind=engine)
-Task.metadata.create_all(bind=engine)
-TaskLog.metadata.create_all(bind=engine)
+# 进程内定时调度，多进程部署时应关闭并单独运行 python -m app.scheduler
+task_scheduler = None
+# 进程内队列 worker，也可关闭后单独运行 python -m app.worker
+job_worker = None
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    global task_scheduler, job_worker
+    # 建表和初始化 admin 用户不再在导入时执行；多实例部署时可关闭，
+    # 改为发布时执行一次 python -m app.scripts.init_db
+    if settings.DB_INIT_ON_STARTUP:
+        from app.scripts.init_db import init_db
+
+        init_db()
+        startup_timer.mark("初始化数据库")
+
+    if settings.SCHEDULER_ENABLED:
+        from app.services.scheduler_service import TaskScheduler
+
+        task_scheduler = TaskScheduler()
+        task_scheduler.start()
+        startup_timer.mark("启动调度器")
+
+    if settings.JOB_WORKER_ENABLED:
+        from app.services.job_service import JobWorker
+
+        job_worker = JobWorker()
+        threading.Thread(target=job_worker.run, name="job-worker", daemon=True).start()
+        startup_timer.mark("启动队列worker")
+    else:
+        print("警告：JOB_WORKER_ENABLED 已关闭，提交的执行会一直排队，需单独运行 python -m app.worker")
+
+    app.state.startup_timings = {**startup_timer.phases, "total": startup_timer.total()}
+    print(startup_timer.report())
+    yield
+
+    if task_scheduler is not None:
+        task_scheduler.shutdown()
+    if job_worker is not None:
+        # 停止领取新任务，执行中的任务完成后 worker 线程退出
+        job_worker.stop()
 
-# 初始化admin用户
-create_admin_user()
 
 app = FastAPI(
     title=settings.APP_NAME,
     description="数据库结构对比工具API",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
 # 挂载静态文件
 app.mount("/static", StaticFiles(directory="app/static"), name="static")
-# 挂载报告文件目录
-app.mount("/reports", StaticFiles(directory=settings.REPORT_OUTPUT_DIR), name="reports")
 
 # 配置模板
 templates = Jinja2Templates(directory="app/templates")
 
 # 注册路由
 from app.api.router import api_router
+from app.api import report
 
 app.include_router(api_router)
+# 报告文件，压缩保存的报告按客户端是否支持 gzip 返回
+app.include_router(report.router)
+startup_timer.mark("加载应用")
 
 
 @app.get("/", response_class=HTMLResponse)
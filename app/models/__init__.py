@@ -1,4 +1,7 @@
 from app.models.base import Base
 from app.models.connections import Connection
-from app.models.tasks import Task, TaskLog, Result, TaskStatus
+from app.models.definitions import Definition
+from app.models.jobs import Job, JobStatus
+from app.models.snapshots import SchemaSnapshot
+from app.models.tasks import Task, TaskLog, Result, TaskStatus, ObjectFingerprint
 from app.models.users import User
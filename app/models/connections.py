@@ -2,7 +2,8 @@ from sqlalchemy import String, Text, Integer, BigInteger
 from sqlalchemy.dialects.mysql import BIGINT as MYSQL_BIGINT
 from sqlalchemy.orm import Mapped, mapped_column
 from .base import Base
-from app.core.encrypt_util import encrypt_password, decrypt_password
+from app.core.credential_cache import credential_cache
+from app.core.encrypt_util import encrypt_password
 
 
 class Connection(Base):
@@ -29,9 +30,9 @@ class Connection(Base):
     @property
     def password(self) -> str:
         """
-        获取解密后的密码
+        获取解密后的密码，同一连接版本只解密一次
         """
-        return decrypt_password(self.password_encrypted)
+        return credential_cache.get(self.id, self.updated_at, self.password_encrypted)
 
     @password.setter
     def password(self, value: str) -> None:
@@ -0,0 +1,104 @@
+import hashlib
+import zlib
+from typing import Dict, Optional
+
+from sqlalchemy import Boolean, Integer, LargeBinary, String, event, insert, select
+from sqlalchemy.dialects.mysql import LONGBLOB
+from sqlalchemy.orm import Mapped, Session, mapped_column
+
+from .base import Base
+from app.core.config import settings
+
+# 查询已存在定义时每批的哈希数
+_LOOKUP_BATCH_SIZE = 500
+
+
+def definition_hash(text: str) -> str:
+    """计算对象定义文本的 SHA-256 哈希"""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class Definition(Base):
+    """对象定义内容表，按内容哈希去重存储 DDL 文本"""
+
+    __tablename__ = "definitions"
+
+    hash: Mapped[str] = mapped_column(
+        String(64), primary_key=True, comment="定义内容SHA-256哈希"
+    )
+    content: Mapped[bytes] = mapped_column(
+        LargeBinary().with_variant(LONGBLOB(), "mysql"),
+        nullable=False,
+        comment="定义内容（UTF-8，可能经过zlib压缩）",
+    )
+    compressed: Mapped[bool] = mapped_column(
+        Boolean, default=False, nullable=False, comment="是否zlib压缩"
+    )
+    length: Mapped[int] = mapped_column(
+        Integer, nullable=False, comment="原始文本长度"
+    )
+
+    @property
+    def text(self) -> str:
+        """解压并返回定义文本"""
+        data = zlib.decompress(self.content) if self.compressed else self.content
+        return data.decode("utf-8")
+
+
+def _encode_definition(text: str) -> Dict[str, object]:
+    """编码定义文本，开启压缩且压缩后更小时存压缩内容"""
+    data = text.encode("utf-8")
+    compressed = False
+    if settings.DEFINITION_COMPRESSION:
+        packed = zlib.compress(data, 6)
+        if len(packed) < len(data):
+            data = packed
+            compressed = True
+    return {"content": data, "compressed": compressed, "length": len(text)}
+
+
+def store_definitions(session: Session, definitions: Dict[str, str]) -> int:
+    """
+    把 {哈希: 文本} 中数据库尚不存在的定义写入 definitions 表，返回新写入的条数。
+    先按哈希批量查询已有定义，只上传缺失的内容；并发写入同一内容时依赖 INSERT IGNORE 去重
+    """
+    if not definitions:
+        return 0
+
+    # 直接使用会话当前连接执行 Core 语句，可在 flush 事件中安全调用
+    conn = session.connection()
+    table = Definition.__table__
+
+    hashes = list(definitions)
+    existing = set()
+    for i in range(0, len(hashes), _LOOKUP_BATCH_SIZE):
+        batch = hashes[i:i + _LOOKUP_BATCH_SIZE]
+        existing.update(
+            conn.execute(select(table.c.hash).where(table.c.hash.in_(batch))).scalars()
+        )
+
+    rows = [
+        {"hash": hash, **_encode_definition(text)}
+        for hash, text in definitions.items()
+        if hash not in existing
+    ]
+    if rows:
+        conn.execute(
+            insert(table)
+            .prefix_with("IGNORE", dialect="mysql")
+            .prefix_with("OR IGNORE", dialect="sqlite"),
+            rows,
+        )
+    return len(rows)
+
+
+@event.listens_for(Session, "before_flush")
+def _store_pending_definitions(session: Session, flush_context, instances) -> None:
+    """新增结果写入前，先把其引用的定义内容写入 definitions 表"""
+    pending: Dict[str, str] = {}
+    for obj in session.new:
+        definitions: Optional[Dict[str, str]] = getattr(obj, "_pending_definitions", None)
+        if definitions:
+            pending.update(definitions)
+    if pending:
+        store_definitions(session, pending)
@@ -0,0 +1,86 @@
+from datetime import datetime
+
+from sqlalchemy import (
+    String,
+    ForeignKey,
+    Enum,
+    Integer,
+    BigInteger,
+    DateTime,
+    Index,
+)
+from sqlalchemy.dialects.mysql import BIGINT as MYSQL_BIGINT
+from sqlalchemy.orm import relationship, Mapped, mapped_column
+import enum
+
+from .base import Base
+
+
+class JobStatus(enum.Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+class Job(Base):
+    """比较任务执行队列表，由独立的 worker 进程领取执行"""
+
+    __tablename__ = "jobs"
+    __table_args__ = (
+        Index("ix_jobs_status_id", "status", "id"),
+    )
+
+    id: Mapped[int] = mapped_column(
+        BigInteger().with_variant(MYSQL_BIGINT(unsigned=True), "mysql"),
+        primary_key=True,
+        autoincrement=True,
+        comment="自增主键"
+    )
+    task_id: Mapped[int] = mapped_column(
+        BigInteger().with_variant(MYSQL_BIGINT(unsigned=True), "mysql"),
+        ForeignKey("tasks.id"),
+        nullable=False,
+        comment="任务信息表ID",
+    )
+    task_log_id: Mapped[int | None] = mapped_column(
+        BigInteger().with_variant(MYSQL_BIGINT(unsigned=True), "mysql"),
+        ForeignKey("task_logs.id"),
+        nullable=True,
+        comment="本次执行对应的任务执行日志表Id",
+    )
+    status: Mapped[JobStatus] = mapped_column(
+        Enum(JobStatus), default=JobStatus.QUEUED, nullable=False, comment="队列状态"
+    )
+    attempts: Mapped[int] = mapped_column(
+        Integer, default=0, nullable=False, comment="已领取执行次数"
+    )
+    worker_id: Mapped[str | None] = mapped_column(
+        String(100), nullable=True, comment="执行该任务的worker标识"
+    )
+    heartbeat_at: Mapped[datetime | None] = mapped_column(
+        DateTime, nullable=True, comment="最近一次心跳时间"
+    )
+    started_at: Mapped[datetime | None] = mapped_column(
+        DateTime, nullable=True, comment="开始执行时间"
+    )
+    finished_at: Mapped[datetime | None] = mapped_column(
+        DateTime, nullable=True, comment="执行结束时间"
+    )
+    error_message: Mapped[str | None] = mapped_column(
+        String(500), nullable=True, comment="错误信息"
+    )
+
+    # 关系定义
+    task = relationship(
+        "app.models.tasks.Task",
+        foreign_keys=[task_id],
+        primaryjoin="Job.task_id==Task.id",
+        uselist=False,
+    )
+    task_log = relationship(
+        "app.models.tasks.TaskLog",
+        foreign_keys=[task_log_id],
+        primaryjoin="Job.task_log_id==TaskLog.id",
+        uselist=False,
+    )
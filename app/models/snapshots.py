@@ -0,0 +1,69 @@
+import gzip
+
+from sqlalchemy import (
+    String,
+    JSON,
+    ForeignKey,
+    Integer,
+    BigInteger,
+    LargeBinary,
+)
+from sqlalchemy.dialects.mysql import BIGINT as MYSQL_BIGINT, LONGBLOB
+from sqlalchemy.orm import relationship, Mapped, mapped_column
+
+from .base import Base
+
+
+class SchemaSnapshot(Base):
+    """库结构快照表，保存某个数据库连接在某一时刻的目录数据，用于离线比较"""
+
+    __tablename__ = "schema_snapshots"
+
+    id: Mapped[int] = mapped_column(
+        BigInteger().with_variant(MYSQL_BIGINT(unsigned=True), "mysql"),
+        primary_key=True,
+        autoincrement=True,
+        comment="自增主键"
+    )
+    name: Mapped[str] = mapped_column(
+        String(100), nullable=False, comment="快照名称"
+    )
+    connection_id: Mapped[int | None] = mapped_column(
+        BigInteger().with_variant(MYSQL_BIGINT(unsigned=True), "mysql"),
+        ForeignKey("connections.id"),
+        nullable=True,
+        comment="采集快照的数据库连接ID，导入的快照为空",
+    )
+    connection_name: Mapped[str | None] = mapped_column(
+        String(50), nullable=True, comment="采集快照的数据库连接名称"
+    )
+    database: Mapped[str | None] = mapped_column(
+        String(64), nullable=True, comment="数据库名"
+    )
+    format_version: Mapped[int] = mapped_column(
+        Integer, nullable=False, comment="快照格式版本"
+    )
+    content: Mapped[bytes] = mapped_column(
+        LargeBinary().with_variant(LONGBLOB(), "mysql"),
+        nullable=False,
+        comment="快照内容（gzip压缩的JSON）",
+    )
+    length: Mapped[int] = mapped_column(
+        Integer, nullable=False, comment="未压缩JSON长度"
+    )
+    object_counts: Mapped[dict | None] = mapped_column(
+        JSON, nullable=True, comment="各类对象数量"
+    )
+
+    # 关系定义
+    connection = relationship(
+        "app.models.connections.Connection",
+        foreign_keys=[connection_id],
+        primaryjoin="SchemaSnapshot.connection_id==Connection.id",
+        uselist=False,
+    )
+
+    @property
+    def raw(self) -> bytes:
+        """解压后的快照 JSON"""
+        return gzip.decompress(self.content)
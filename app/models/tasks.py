@@ -8,12 +8,14 @@ from sqlalchemy import (
     Integer,
     BigInteger,
     Float,
+    Index,
 )
 from sqlalchemy.dialects.mysql import BIGINT as MYSQL_BIGINT
 from sqlalchemy.orm import relationship, Mapped, mapped_column
 import enum
 
 from .base import Base
+from .definitions import definition_hash
 
 
 class TaskStatus(enum.Enum):
@@ -30,6 +32,8 @@ class ResultType(enum.Enum):
     PROCEDURE = "procedure"
     FUNCTION = "function"
     TRIGGER = "trigger"
+    DATA = "data"
+    STATISTICS = "statistics"
 
 
 class Task(Base):
@@ -71,6 +75,11 @@ class Task(Base):
         nullable=False,
         comment="目标数据库连接名称",
     )
+    target_conn_ids: Mapped[list | None] = mapped_column(
+        JSON,
+        nullable=True,
+        comment="多目标比较的目标数据库连接ID列表，为空时只比较目标数据库连接",
+    )
     config: Mapped[dict | None] = mapped_column(
         JSON,
         nullable=True,
@@ -80,6 +89,15 @@ class Task(Base):
         Enum(TaskStatus), default=TaskStatus.PENDING,
         comment="任务状态"
     )
+    schedule_enabled: Mapped[bool] = mapped_column(
+        Boolean, default=False, nullable=False, comment="是否启用定时执行"
+    )
+    schedule_cron: Mapped[str | None] = mapped_column(
+        String(100), nullable=True, comment="定时执行cron表达式（分 时 日 月 周）"
+    )
+    schedule_interval: Mapped[int | None] = mapped_column(
+        Integer, nullable=True, comment="定时执行间隔（秒），与cron表达式二选一"
+    )
 
     # 关系定义
     source_conn = relationship(
@@ -100,6 +118,10 @@ class TaskLog(Base):
     """数据库任务执行日志表"""
 
     __tablename__ = "task_logs"
+    __table_args__ = (
+        # 日志列表按任务过滤并按 id 倒序翻页，倒序时反向扫描该索引
+        Index("ix_task_logs_task_id_id", "task_id", "id"),
+    )
 
     id: Mapped[int] = mapped_column(
         BigInteger().with_variant(MYSQL_BIGINT(unsigned=True), "mysql"),
@@ -125,6 +147,18 @@ class TaskLog(Base):
     cost_time: Mapped[float | None] = mapped_column(
         Float, nullable=True, comment="执行耗时（秒）"
     )
+    telemetry: Mapped[dict | None] = mapped_column(
+        JSON, nullable=True, comment="运行统计（各阶段耗时、查询次数、接收字节数等）"
+    )
+    result_digest: Mapped[str | None] = mapped_column(
+        String(64), nullable=True, comment="全部结果的摘要，用于识别结果相同的运行"
+    )
+    duplicate_of: Mapped[int | None] = mapped_column(
+        BigInteger().with_variant(MYSQL_BIGINT(unsigned=True), "mysql"),
+        ForeignKey("task_logs.id"),
+        nullable=True,
+        comment="压缩后引用的结果相同的运行ID，结果和报告以该运行为准",
+    )
 
     # 关系定义
     task = relationship(
@@ -144,6 +178,11 @@ class Result(Base):
     """比较结果详情表"""
 
     __tablename__ = "results"
+    __table_args__ = (
+        # 结果分页接口按类型/差异过滤和按名称前缀过滤使用的索引，InnoDB 二级索引隐含主键，可直接按 id 翻页
+        Index("ix_results_task_log_type_diff", "task_log_id", "type", "has_differences"),
+        Index("ix_results_task_log_object_name", "task_log_id", "object_name"),
+    )
 
     id: Mapped[int] = mapped_column(
         BigInteger().with_variant(MYSQL_BIGINT(unsigned=True), "mysql"),
@@ -168,11 +207,24 @@ class Result(Base):
     has_differences: Mapped[bool] = mapped_column(
         Boolean, default=False, comment="是否存在差异"
     )
-    source_definition: Mapped[str | None] = mapped_column(
-        Text, nullable=True, comment="源对象定义"
+    # 历史数据直接内联存储定义文本，新数据只保存 definitions 表中的内容哈希
+    source_definition_inline: Mapped[str | None] = mapped_column(
+        "source_definition", Text, nullable=True, comment="源对象定义"
+    )
+    target_definition_inline: Mapped[str | None] = mapped_column(
+        "target_definition", Text, nullable=True, comment="目标对象定义"
     )
-    target_definition: Mapped[str | None] = mapped_column(
-        Text, nullable=True, comment="目标对象定义"
+    source_definition_hash: Mapped[str | None] = mapped_column(
+        String(64), nullable=True, comment="源对象定义哈希"
+    )
+    target_definition_hash: Mapped[str | None] = mapped_column(
+        String(64), nullable=True, comment="目标对象定义哈希"
+    )
+    target_conn_id: Mapped[int | None] = mapped_column(
+        BigInteger().with_variant(MYSQL_BIGINT(unsigned=True), "mysql"),
+        ForeignKey("connections.id"),
+        nullable=True,
+        comment="多目标比较时结果对应的目标数据库连接ID",
     )
     difference_details: Mapped[dict | None] = mapped_column(
         JSON, nullable=True, comment="差异详情"
@@ -188,4 +240,91 @@ class Result(Base):
         primaryjoin="Result.task_log_id==TaskLog.id",
         back_populates="results",
         uselist=False,
-    )
\ No newline at end of file
+    )
+    source_definition_ref = relationship(
+        "app.models.definitions.Definition",
+        primaryjoin="foreign(Result.source_definition_hash)==Definition.hash",
+        uselist=False,
+        viewonly=True,
+    )
+    target_definition_ref = relationship(
+        "app.models.definitions.Definition",
+        primaryjoin="foreign(Result.target_definition_hash)==Definition.hash",
+        uselist=False,
+        viewonly=True,
+    )
+
+    def _set_definition(self, side: str, value: str | None) -> None:
+        """记录定义哈希，文本暂存在对象上，flush 前写入 definitions 表"""
+        if value is None:
+            setattr(self, f"{side}_definition_hash", None)
+            return
+        hash = definition_hash(value)
+        self.__dict__.setdefault("_pending_definitions", {})[hash] = value
+        setattr(self, f"{side}_definition_hash", hash)
+
+    def _get_definition(self, side: str) -> str | None:
+        """按需解析定义文本：未保存的暂存值、definitions 表内容或历史内联文本"""
+        hash = getattr(self, f"{side}_definition_hash")
+        if hash is None:
+            return getattr(self, f"{side}_definition_inline")
+        pending = self.__dict__.get("_pending_definitions")
+        if pending and hash in pending:
+            return pending[hash]
+        ref = getattr(self, f"{side}_definition_ref")
+        return ref.text if ref is not None else None
+
+    @property
+    def source_definition(self) -> str | None:
+        """源对象定义"""
+        return self._get_definition("source")
+
+    @source_definition.setter
+    def source_definition(self, value: str | None) -> None:
+        self._set_definition("source", value)
+
+    @property
+    def target_definition(self) -> str | None:
+        """目标对象定义"""
+        return self._get_definition("target")
+
+    @target_definition.setter
+    def target_definition(self, value: str | None) -> None:
+        self._set_definition("target", value)
+
+class ObjectFingerprint(Base):
+    """对象指纹表，记录每次运行中各对象在源库和目标库上的指纹，用于增量比较"""
+
+    __tablename__ = "object_fingerprints"
+
+    id: Mapped[int] = mapped_column(
+        BigInteger().with_variant(MYSQL_BIGINT(unsigned=True), "mysql"),
+        primary_key=True,
+        autoincrement=True,
+        comment="自增主键"
+    )
+    task_id: Mapped[int] = mapped_column(
+        BigInteger().with_variant(MYSQL_BIGINT(unsigned=True), "mysql"),
+        ForeignKey("tasks.id"),
+        nullable=False,
+        comment="任务信息表ID",
+    )
+    task_log_id: Mapped[int] = mapped_column(
+        BigInteger().with_variant(MYSQL_BIGINT(unsigned=True), "mysql"),
+        ForeignKey("task_logs.id"),
+        nullable=False,
+        index=True,
+        comment="任务执行日志表Id",
+    )
+    type: Mapped[ResultType] = mapped_column(
+        Enum(ResultType), nullable=False, comment="对象类型"
+    )
+    object_name: Mapped[str] = mapped_column(
+        String(64), nullable=False, comment="对象名称"
+    )
+    source_fingerprint: Mapped[str | None] = mapped_column(
+        String(64), nullable=True, comment="源库对象指纹，为空表示源库不存在"
+    )
+    target_fingerprint: Mapped[str | None] = mapped_column(
+        String(64), nullable=True, comment="目标库对象指纹，为空表示目标库不存在"
+    )
@@ -0,0 +1,23 @@
+import signal
+
+from apscheduler.schedulers.blocking import BlockingScheduler
+
+from app.core.config import settings
+from app.services.scheduler_service import TaskScheduler
+
+
+def main() -> None:
+    """独立调度进程入口：python -m app.scheduler"""
+    scheduler = TaskScheduler(BlockingScheduler(timezone=settings.SCHEDULER_TIMEZONE))
+
+    def _shutdown(signum, frame):
+        print(f"收到信号 {signum}，停止任务调度器")
+        scheduler.shutdown()
+
+    signal.signal(signal.SIGINT, _shutdown)
+    signal.signal(signal.SIGTERM, _shutdown)
+    scheduler.start()
+
+
+if __name__ == "__main__":
+    main()
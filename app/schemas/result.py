@@ -0,0 +1,28 @@
+from datetime import datetime
+from typing import Optional, Dict, Any, List
+from pydantic import BaseModel, ConfigDict
+
+from app.models.tasks import ResultType
+
+
+class ResultOut(BaseModel):
+    id: int
+    task_log_id: int
+    type: ResultType
+    object_name: str
+    has_differences: bool
+    target_conn_id: Optional[int] = None
+    difference_details: Optional[Dict[str, Any]] = None
+    change_sql: Optional[str] = None
+    # 未要求返回定义时为空
+    source_definition: Optional[str] = None
+    target_definition: Optional[str] = None
+    created_at: datetime
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class ResultPage(BaseModel):
+    items: List[ResultOut]
+    # 下一页的游标（本页最后一条结果的ID），没有更多结果时为空
+    next_cursor: Optional[int] = None
@@ -0,0 +1,61 @@
+from datetime import datetime
+from typing import Optional, Dict, Any, List
+from pydantic import BaseModel, ConfigDict, Field, model_validator
+
+from app.models.tasks import ResultType
+
+
+class SnapshotCreate(BaseModel):
+    connection_id: int = Field(..., description="采集快照的数据库连接ID")
+    name: Optional[str] = Field(None, max_length=100, description="快照名称，默认为连接名称加采集时间")
+
+
+class SnapshotOut(BaseModel):
+    id: int
+    name: str
+    connection_id: Optional[int] = None
+    connection_name: Optional[str] = None
+    database: Optional[str] = None
+    format_version: int
+    length: int
+    object_counts: Optional[Dict[str, int]] = None
+    created_at: datetime
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class SnapshotSide(BaseModel):
+    """比较的一侧：已保存的快照或实时数据库连接，二选一"""
+
+    snapshot_id: Optional[int] = None
+    connection_id: Optional[int] = None
+
+    @model_validator(mode="after")
+    def check_one_source(self):
+        if (self.snapshot_id is None) == (self.connection_id is None):
+            raise ValueError("snapshot_id 与 connection_id 必须且只能指定一个")
+        return self
+
+
+class SnapshotCompare(BaseModel):
+    source: SnapshotSide
+    target: SnapshotSide
+    types: Optional[List[ResultType]] = Field(None, description="参与比较的对象类型，默认全部")
+    config: Optional[Dict[str, Any]] = Field(None, description="比较配置（忽略项等）")
+    only_differences: bool = Field(True, description="是否只返回有差异的对象")
+
+
+class SnapshotCompareItem(BaseModel):
+    type: ResultType
+    object_name: str
+    has_differences: bool
+    difference_details: Optional[Dict[str, Any]] = None
+    change_sql: Optional[str] = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class SnapshotCompareOut(BaseModel):
+    total_objects: int
+    total_differences: int
+    items: List[SnapshotCompareItem]
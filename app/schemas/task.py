@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 from pydantic import BaseModel, ConfigDict
 
 from app.models.tasks import TaskStatus, ResultType
@@ -13,16 +13,25 @@ class TaskBase(BaseModel):
     source_conn_name: str
     target_conn_id: int
     target_conn_name: str
+    target_conn_ids: Optional[List[int]] = None
     config: Optional[Dict[str, Any]] = None
     status: TaskStatus = TaskStatus.PENDING
     error_message: Optional[str] = None
+    schedule_enabled: bool = False
+    schedule_cron: Optional[str] = None
+    schedule_interval: Optional[int] = None
 
 class TaskCreate(BaseModel):
     name: str
     description: Optional[str] = None
     source_conn_id: int
     target_conn_id: int
+    # 多目标比较时的其余目标库，与 target_conn_id 一起组成目标库列表
+    target_conn_ids: Optional[List[int]] = None
     config: Optional[Dict[str, Any]] = None
+    schedule_enabled: bool = False
+    schedule_cron: Optional[str] = None
+    schedule_interval: Optional[int] = None
 
 
 class ResultBase(BaseModel):
@@ -0,0 +1,17 @@
+from app.database import engine
+from app.models.base import Base
+from app.scripts.create_admin import create_admin_user
+
+
+def init_db() -> None:
+    """创建缺失的数据表并初始化 admin 用户，已存在时不做修改"""
+    # 导入全部模型，确保注册到 Base.metadata
+    import app.models  # noqa: F401
+
+    Base.metadata.create_all(bind=engine)
+    create_admin_user()
+
+
+if __name__ == "__main__":
+    init_db()
+    print("数据库初始化完成")
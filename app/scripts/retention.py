@@ -0,0 +1,6 @@
+from app.services.retention_service import run_retention
+
+
+if __name__ == "__main__":
+    # 按各任务的保留策略执行一次清理：python -m app.scripts.retention
+    run_retention()
@@ -4,6 +4,8 @@ from .table_comparator import TableComparator
 from .procedure_comparator import ProcedureComparator
 from .function_comparator import FunctionComparator
 from .trigger_comparator import TriggerComparator
+from .data_comparator import DataComparator
+from .statistics_comparator import StatisticsComparator
 
 __all__ = [
     'BaseComparator',
@@ -11,5 +13,7 @@ __all__ = [
     'TableComparator',
     'ProcedureComparator',
     'FunctionComparator',
-    'TriggerComparator'
+    'TriggerComparator',
+    'DataComparator',
+    'StatisticsComparator'
 ] 
\ No newline at end of file
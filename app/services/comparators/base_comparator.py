@@ -1,29 +1,70 @@
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Callable, Optional
 import pymysql
 from sqlalchemy.orm import Session
 
 from app.models.tasks import Result, TaskLog, TaskStatus, ResultType
-
-
-def _get_connection(
-    host: str, port: str, user: str, password: str, database: str
-) -> pymysql.Connection:
-    """创建数据库连接"""
-    return pymysql.connect(
-        host=host,
-        port=int(port),
-        user=user,
-        password=password,
-        database=database,
-        charset="utf8mb4",
-    )
+from app.services.connection_manager import ConnectionManager, ConnectionPool
+from app.services.incremental_service import IncrementalState
+from app.services.result_writer import ResultWriter
+from .object_filter import ObjectFilter, object_filter
 
 
 class BaseComparator:
     """基础比较器类，提供通用的数据库连接和比较逻辑"""
 
-    def __init__(self, db: Session):
+    # 任务配置中该类对象忽略规则的键名，如 ignored_tables
+    ignore_config_key: str = None
+    # 过滤规则中的对象类型，如 table
+    object_kind: str = None
+
+    def __init__(self, db: Session, writer: ResultWriter = None):
         self.db = db
+        # 结果批量写入器，由服务层传入时各比较器共用同一份写入统计
+        self.writer = writer or ResultWriter(db)
+
+    def _result_type(self) -> ResultType:
+        """根据比较器类型确定结果类型"""
+        comparator_name = self.__class__.__name__.lower()
+        if 'table' in comparator_name:
+            return ResultType.TABLE
+        elif 'view' in comparator_name:
+            return ResultType.VIEW
+        elif 'procedure' in comparator_name:
+            return ResultType.PROCEDURE
+        elif 'function' in comparator_name:
+            return ResultType.FUNCTION
+        elif 'trigger' in comparator_name:
+            return ResultType.TRIGGER
+        elif 'config' in comparator_name:
+            return ResultType.CONFIG
+        elif 'data' in comparator_name:
+            return ResultType.DATA
+        elif 'statistics' in comparator_name:
+            return ResultType.STATISTICS
+        # 默认为表类型
+        return ResultType.TABLE
+
+    def _object_filter(self, config: Dict[str, Any] = None) -> ObjectFilter:
+        """根据任务配置生成预编译的对象过滤器，返回 True 表示该对象参与比较"""
+        return object_filter(config, self.object_kind, self.ignore_config_key)
+
+    def _ignore_filter(self, config: Dict[str, Any] = None) -> Callable[[str], bool]:
+        """根据任务配置生成忽略判断函数，返回 True 表示该对象被忽略"""
+        included = self._object_filter(config)
+        return lambda name: not included(name)
+
+    def _name_filter(
+        self, config: Dict[str, Any] = None, name_filter: Callable[[str], bool] = None
+    ) -> Callable[[str], bool]:
+        """合并任务配置的过滤规则与 name_filter，获取对象定义前即排除不参与比较的对象"""
+        included = self._object_filter(config)
+        if name_filter is None:
+            return included
+        return lambda name: included(name) and name_filter(name)
+
+    def _get_fingerprints(self, conn: pymysql.Connection) -> Optional[Dict[str, str]]:
+        """获取对象指纹，返回 None 表示该比较器不支持增量比较，由子类实现"""
+        return None
 
     def _create_result(
         self,
@@ -39,22 +80,7 @@ class BaseComparator:
         """创建比较结果对象"""
         if type is None:
             # 根据比较器类型自动设置结果类型
-            comparator_name = self.__class__.__name__.lower()
-            if 'table' in comparator_name:
-                type = ResultType.TABLE
-            elif 'view' in comparator_name:
-                type = ResultType.VIEW
-            elif 'procedure' in comparator_name:
-                type = ResultType.PROCEDURE
-            elif 'function' in comparator_name:
-                type = ResultType.FUNCTION
-            elif 'trigger' in comparator_name:
-                type = ResultType.TRIGGER
-            elif 'config' in comparator_name:
-                type = ResultType.CONFIG
-            else:
-                # 默认为表类型
-                type = ResultType.TABLE
+            type = self._result_type()
 
         return Result(
             task_log_id=task_log_id,
@@ -67,8 +93,17 @@ class BaseComparator:
             type=type,
         )
 
-    def compare(self, task_log_id: int, report_path: str = None) -> List[Result]:
-        """执行比较"""
+    def compare(
+        self,
+        task_log_id: int,
+        report_path: str = None,
+        connections: ConnectionManager = None,
+        incremental: IncrementalState = None,
+    ) -> List[Result]:
+        """
+        执行比较，connections 为本次运行共享的连接管理器，未传入时临时创建；
+        incremental 不为空时跳过指纹未变化的对象
+        """
         task_log = self.db.query(TaskLog).get(task_log_id)
         if not task_log:
             raise ValueError(f"任务日志 {task_log_id} 不存在")
@@ -78,31 +113,23 @@ class BaseComparator:
         task = self.db.query(Task).get(task_log.task_id)
         if not task:
             raise ValueError(f"任务 {task_log.task_id} 不存在")
-        source_conn_obj = task.source_conn
-        target_conn_obj = task.target_conn
-
-        source_conn = _get_connection(
-            source_conn_obj.host,
-            source_conn_obj.port,
-            source_conn_obj.user,
-            source_conn_obj.password,
-            source_conn_obj.database,
-        )
-        target_conn = _get_connection(
-            target_conn_obj.host,
-            target_conn_obj.port,
-            target_conn_obj.user,
-            target_conn_obj.password,
-            target_conn_obj.database,
-        )
+
+        owns_connections = connections is None
+        if owns_connections:
+            connections = ConnectionManager()
 
         try:
             # 传递任务配置到_do_compare方法
-            results = self._do_compare(task_log_id, source_conn, target_conn, task.config)
-
-            # 保存所有结果
-            for result in results:
-                self.db.add(result)
+            results = self.collect(
+                task_log_id,
+                connections.pool(task.source_conn),
+                connections.pool(task.target_conn),
+                task.config,
+                incremental,
+            )
+
+            # 批量保存所有结果
+            self.writer.write(results, phase=self._result_type().value)
             # 成功：状态同步到日志
             task_log.status = TaskStatus.COMPLETED
             task_log.error_message = None
@@ -120,22 +147,99 @@ class BaseComparator:
             raise
 
         finally:
-            try:
-                if hasattr(source_conn, 'close') and callable(source_conn.close):
-                    source_conn.close()
-            except Exception:
-                pass
-            try:
-                if hasattr(target_conn, 'close') and callable(target_conn.close):
-                    target_conn.close()
-            except Exception:
-                pass
+            if owns_connections:
+                connections.close()
+
+    def collect(
+        self,
+        task_log_id: int,
+        source_pool: ConnectionPool,
+        target_pool: ConnectionPool,
+        config: Dict[str, Any] = None,
+        incremental: IncrementalState = None,
+    ) -> List[Result]:
+        """
+        从连接池借用源库和目标库连接并执行比较，只返回未保存的结果对象。
+        不访问 self.db，可在并行执行的线程中调用。
+        """
+        if source_pool is target_pool:
+            # 源库与目标库为同一连接配置时共用一个连接，避免同一连接池内互相等待
+            with source_pool.connection() as conn:
+                name_filter = self._incremental_filter(conn, conn, config, incremental)
+                return self._do_compare(task_log_id, conn, conn, config, name_filter)
+
+        with source_pool.connection() as source_conn:
+            with target_pool.connection() as target_conn:
+                name_filter = self._incremental_filter(
+                    source_conn, target_conn, config, incremental
+                )
+                return self._do_compare(
+                    task_log_id, source_conn, target_conn, config, name_filter
+                )
+
+    def _incremental_filter(
+        self,
+        source_conn: pymysql.Connection,
+        target_conn: pymysql.Connection,
+        config: Dict[str, Any],
+        incremental: Optional[IncrementalState],
+    ) -> Optional[Callable[[str], bool]]:
+        """增量模式下比对两侧指纹，返回只放行已变化对象的名称过滤函数"""
+        if incremental is None:
+            return None
+        source_fingerprints = self._get_fingerprints(source_conn)
+        if source_fingerprints is None:
+            return None
+        target_fingerprints = self._get_fingerprints(target_conn)
+
+        unchanged = incremental.plan(
+            self._result_type(),
+            source_fingerprints,
+            target_fingerprints,
+            self._ignore_filter(config),
+        )
+        if not unchanged:
+            return None
+        print(f"{self.__class__.__name__} 增量比较：{len(unchanged)} 个对象未变化，沿用上次结果")
+        return lambda name: name not in unchanged
+
+    def fetch(
+        self,
+        conn: pymysql.Connection,
+        config: Dict[str, Any] = None,
+        name_filter: Callable[[str], bool] = None,
+    ) -> Any:
+        """
+        获取单侧数据库中参与比较的目录数据，由支持快照比较的子类实现。
+        返回值只包含基本类型，可在多次比较间复用，如多目标比较时源库只获取一次
+        """
+        raise NotImplementedError(f"{self.__class__.__name__} 不支持快照比较")
+
+    def diff(
+        self,
+        task_log_id: int,
+        source: Any,
+        target: Any,
+        config: Dict[str, Any] = None,
+    ) -> List[Result]:
+        """比较两侧由 fetch 获取的目录数据，不访问数据库，由支持快照比较的子类实现"""
+        raise NotImplementedError(f"{self.__class__.__name__} 不支持快照比较")
 
     def _do_compare(
         self,
         task_log_id: int,
         source_conn: pymysql.Connection,
         target_conn: pymysql.Connection,
+        config: Dict[str, Any] = None,
+        name_filter: Callable[[str], bool] = None,
     ) -> List[Result]:
-        """执行具体的比较逻辑，由子类实现"""
-        raise NotImplementedError("子类必须实现此方法")
+        """
+        执行具体的比较逻辑，默认分别获取两侧目录数据后比较，子类可覆盖。
+        name_filter 不为空时，只获取并比较返回 True 的对象
+        """
+        return self.diff(
+            task_log_id,
+            self.fetch(source_conn, config, name_filter),
+            self.fetch(target_conn, config, name_filter),
+            config,
+        )
@@ -0,0 +1,145 @@
+import re
+from functools import lru_cache
+from typing import NamedTuple, Optional, Tuple
+
+# 整数类型的显示宽度不影响取值范围，MySQL 8.0.19 起 SHOW COLUMNS 也不再返回，比较时忽略；
+# ZEROFILL 列的显示宽度决定补零后的取值，MySQL 8 仍会返回，需要比较
+_INTEGER_TYPES = frozenset({"tinyint", "smallint", "mediumint", "int", "bigint"})
+
+# 同义类型名统一为 MySQL 显示的名称
+_ALIASES = {"integer": "int", "dec": "decimal", "numeric": "decimal", "fixed": "decimal"}
+
+_BASE_RE = re.compile(r"\w+")
+_CHARSET_RE = re.compile(r"\b(?:character\s+set|charset)\s+(\w+)")
+_COLLATE_RE = re.compile(r"\bcollate\s+(\w+)")
+
+
+class ColumnType(NamedTuple):
+    """
+    解析后的列类型。length 为长度、显示宽度、小数秒精度或 DECIMAL 的总位数，
+    scale 为 DECIMAL/FLOAT/DOUBLE 的小数位数，values 为 ENUM/SET 的取值列表
+    """
+
+    base: str
+    length: Optional[int] = None
+    scale: Optional[int] = None
+    values: Optional[Tuple[str, ...]] = None
+    unsigned: bool = False
+    zerofill: bool = False
+    charset: Optional[str] = None
+    collation: Optional[str] = None
+
+
+def _split_args(args: str) -> Tuple[str, ...]:
+    """按逗号拆分括号内参数，引号内的逗号和括号不拆分"""
+    parts, current, quote = [], [], None
+    i = 0
+    while i < len(args):
+        char = args[i]
+        if quote:
+            current.append(char)
+            if char == quote:
+                if i + 1 < len(args) and args[i + 1] == quote:
+                    current.append(args[i + 1])
+                    i += 1
+                else:
+                    quote = None
+        elif char in ("'", '"'):
+            quote = char
+            current.append(char)
+        elif char == ",":
+            parts.append("".join(current).strip())
+            current = []
+        else:
+            current.append(char)
+        i += 1
+    parts.append("".join(current).strip())
+    return tuple(parts)
+
+
+def _unquote(value: str) -> str:
+    """去掉 ENUM/SET 取值两侧的引号并还原转义的引号"""
+    if len(value) >= 2 and value[0] == value[-1] and value[0] in ("'", '"'):
+        quote = value[0]
+        return value[1:-1].replace(quote * 2, quote)
+    return value
+
+
+def _find_closing(type_str: str, start: int) -> int:
+    """返回与 start 处左括号匹配的右括号位置，跳过引号内的字符"""
+    quote = None
+    i = start + 1
+    while i < len(type_str):
+        char = type_str[i]
+        if quote:
+            if char == quote:
+                if i + 1 < len(type_str) and type_str[i + 1] == quote:
+                    i += 1
+                else:
+                    quote = None
+        elif char in ("'", '"'):
+            quote = char
+        elif char == ")":
+            return i
+        i += 1
+    return len(type_str)
+
+
+@lru_cache(maxsize=None)
+def parse_column_type(type_str: str) -> ColumnType:
+    """
+    解析 MySQL 列类型字符串，如 int(10) unsigned zerofill、decimal(12,2)、
+    varchar(64) character set utf8mb4、enum('a','b')。
+    相同字符串只解析一次并返回同一个对象
+    """
+    text = type_str.strip()
+    match = _BASE_RE.match(text)
+    if not match:
+        return ColumnType(base=text.lower())
+    base = match.group(0).lower()
+    base = _ALIASES.get(base, base)
+
+    length = scale = values = None
+    rest = text[match.end():]
+    stripped = rest.lstrip()
+    if stripped.startswith("("):
+        offset = len(rest) - len(stripped)
+        start = match.end() + offset
+        end = _find_closing(text, start)
+        args = _split_args(text[start + 1:end])
+        rest = text[end + 1:]
+        if base in ("enum", "set"):
+            values = tuple(_unquote(arg) for arg in args)
+        else:
+            if args and args[0].isdigit():
+                length = int(args[0])
+            if len(args) > 1 and args[1].isdigit():
+                scale = int(args[1])
+
+    rest = rest.lower()
+    charset = _CHARSET_RE.search(rest)
+    collation = _COLLATE_RE.search(rest)
+    return ColumnType(
+        base=base,
+        length=length,
+        scale=scale,
+        values=values,
+        unsigned="unsigned" in rest.split(),
+        zerofill="zerofill" in rest.split(),
+        charset=charset.group(1) if charset else None,
+        collation=collation.group(1) if collation else None,
+    )
+
+
+@lru_cache(maxsize=None)
+def _comparison_key(type_str: str) -> ColumnType:
+    """比较用的类型表示，非 ZEROFILL 的整数类型忽略显示宽度"""
+    parsed = parse_column_type(type_str)
+    if parsed.base in _INTEGER_TYPES and parsed.length is not None and not parsed.zerofill:
+        return parsed._replace(length=None)
+    return parsed
+
+
+def column_types_equal(source: str, target: str) -> bool:
+    """判断两个列类型是否等价：字符串相同直接返回，否则比较解析后的结构"""
+    return source == target or _comparison_key(source) == _comparison_key(target)
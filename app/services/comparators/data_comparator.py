@@ -0,0 +1,341 @@
+from typing import Dict, List, Any, Callable, Optional, Tuple
+import pymysql
+
+from app.core.config import settings
+from app.models.tasks import Result
+from .base_comparator import BaseComparator
+
+# 主键值元组，None 表示区间在该侧无边界
+Key = Optional[Tuple[Any, ...]]
+
+
+def _quote(name: str) -> str:
+    """反引号转义标识符"""
+    return "`" + name.replace("`", "``") + "`"
+
+
+def _get_base_tables(conn: pymysql.Connection) -> List[str]:
+    """获取当前库的所有基表"""
+    with conn.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT TABLE_NAME
+            FROM INFORMATION_SCHEMA.TABLES
+            WHERE TABLE_SCHEMA = DATABASE() AND TABLE_TYPE = 'BASE TABLE'
+        """
+        )
+        return [row[0] for row in cursor.fetchall()]
+
+
+def _get_primary_keys(conn: pymysql.Connection) -> Dict[str, List[str]]:
+    """一次查询获取所有表的主键列，按主键内顺序排列"""
+    primary_keys: Dict[str, List[str]] = {}
+    with conn.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT TABLE_NAME, COLUMN_NAME
+            FROM INFORMATION_SCHEMA.KEY_COLUMN_USAGE
+            WHERE TABLE_SCHEMA = DATABASE() AND CONSTRAINT_NAME = 'PRIMARY'
+            ORDER BY TABLE_NAME, ORDINAL_POSITION
+        """
+        )
+        for table_name, column_name in cursor.fetchall():
+            primary_keys.setdefault(table_name, []).append(column_name)
+    return primary_keys
+
+
+def _get_column_names(conn: pymysql.Connection) -> Dict[str, List[str]]:
+    """一次查询获取所有表的列名，按列顺序排列"""
+    columns: Dict[str, List[str]] = {}
+    with conn.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT TABLE_NAME, COLUMN_NAME
+            FROM INFORMATION_SCHEMA.COLUMNS
+            WHERE TABLE_SCHEMA = DATABASE()
+            ORDER BY TABLE_NAME, ORDINAL_POSITION
+        """
+        )
+        for table_name, column_name in cursor.fetchall():
+            columns.setdefault(table_name, []).append(column_name)
+    return columns
+
+
+class _TableSpec:
+    """单表数据校验所需的 SQL 片段"""
+
+    def __init__(self, table_name: str, primary_key: List[str], columns: List[str]):
+        self.table_name = table_name
+        self.primary_key = primary_key
+        self.columns = columns
+        self.table = _quote(table_name)
+        self.key_list = ", ".join(_quote(col) for col in primary_key)
+        quoted = [_quote(col) for col in columns]
+        # CONCAT_WS 会跳过 NULL，追加每列的 ISNULL 标记以区分 NULL 与空串
+        null_flags = ", ".join(f"ISNULL({col})" for col in quoted)
+        self.row_hash = f"CRC32(CONCAT_WS('#', {', '.join(quoted)}, CONCAT({null_flags})))"
+
+    def range_clause(self, lower: Key, upper: Key) -> Tuple[str, List[Any]]:
+        """主键区间 (lower, upper] 的 WHERE 条件"""
+        conditions, params = [], []
+        key = f"({self.key_list})" if len(self.primary_key) > 1 else self.key_list
+        placeholders = ", ".join(["%s"] * len(self.primary_key))
+        holder = f"({placeholders})" if len(self.primary_key) > 1 else placeholders
+        if lower is not None:
+            conditions.append(f"{key} > {holder}")
+            params.extend(lower)
+        if upper is not None:
+            conditions.append(f"{key} <= {holder}")
+            params.extend(upper)
+        return (" AND ".join(conditions) or "1 = 1"), params
+
+
+def _chunk_checksum(
+    conn: pymysql.Connection, spec: _TableSpec, lower: Key, upper: Key
+) -> Tuple[int, int]:
+    """在服务端计算区间内的行数和行哈希的 BIT_XOR 聚合"""
+    where, params = spec.range_clause(lower, upper)
+    with conn.cursor() as cursor:
+        cursor.execute(
+            f"SELECT COUNT(*), COALESCE(BIT_XOR({spec.row_hash}), 0) "
+            f"FROM {spec.table} WHERE {where}",
+            params,
+        )
+        count, checksum = cursor.fetchone()
+    return int(count), int(checksum)
+
+
+def _chunk_boundaries(
+    conn: pymysql.Connection, spec: _TableSpec, lower: Key, upper: Key, step: int
+) -> List[Tuple[Any, ...]]:
+    """沿主键索引每隔 step 行取一个边界，只扫描索引、只传输边界值"""
+    boundaries = []
+    current = lower
+    with conn.cursor() as cursor:
+        while True:
+            where, params = spec.range_clause(current, upper)
+            cursor.execute(
+                f"SELECT {spec.key_list} FROM {spec.table} WHERE {where} "
+                f"ORDER BY {spec.key_list} LIMIT 1 OFFSET %s",
+                params + [step - 1],
+            )
+            row = cursor.fetchone()
+            if row is None:
+                return boundaries
+            boundaries.append(tuple(row))
+            current = tuple(row)
+
+
+def _row_hashes(
+    conn: pymysql.Connection, spec: _TableSpec, lower: Key, upper: Key
+) -> Dict[Tuple[Any, ...], int]:
+    """获取区间内每行的主键和行哈希，只在已缩小到少量行的区间上调用"""
+    where, params = spec.range_clause(lower, upper)
+    size = len(spec.primary_key)
+    with conn.cursor() as cursor:
+        cursor.execute(
+            f"SELECT {spec.key_list}, {spec.row_hash} FROM {spec.table} WHERE {where} "
+            f"ORDER BY {spec.key_list}",
+            params,
+        )
+        return {tuple(row[:size]): row[size] for row in cursor.fetchall()}
+
+
+def _format_key(key: Tuple[Any, ...]) -> Any:
+    """主键值转换为可 JSON 序列化的形式"""
+    values = [None if value is None else str(value) for value in key]
+    return values[0] if len(values) == 1 else values
+
+
+def _reported(report: Dict[str, Any]) -> int:
+    """已记录的差异行数"""
+    return (
+        len(report["missing_in_target"])
+        + len(report["missing_in_source"])
+        + len(report["different"])
+    )
+
+
+def _ranges(boundaries: List[Tuple[Any, ...]], lower: Key, upper: Key) -> List[Tuple[Key, Key]]:
+    """由边界列表生成首尾开放的连续区间，覆盖两侧的全部主键"""
+    points: List[Key] = [lower, *boundaries, upper]
+    return list(zip(points[:-1], points[1:]))
+
+
+class DataComparator(BaseComparator):
+    """
+    表数据比较器。
+    按主键把表切分为区间，在两侧服务端计算每个区间的 COUNT 与 CRC32 的 BIT_XOR，
+    只对不一致的区间继续细分，直到区间足够小时再逐行比对行哈希定位差异行。
+    需在任务配置中通过 data_comparison.enabled 开启。
+    """
+
+    ignore_config_key = 'ignored_tables'
+    object_kind = 'table'
+
+    def _do_compare(
+        self,
+        task_log_id: int,
+        source_conn: pymysql.Connection,
+        target_conn: pymysql.Connection,
+        config: Dict[str, Any] = None,
+        name_filter: Callable[[str], bool] = None,
+    ) -> List[Result]:
+        """比较两侧共有表的数据"""
+        options = (config or {}).get("data_comparison") or {}
+        if not options.get("enabled"):
+            return []
+
+        is_ignored = self._ignore_filter(config)
+        only_tables = set(options["tables"]) if isinstance(options.get("tables"), list) else None
+
+        source_tables = set(_get_base_tables(source_conn))
+        target_tables = set(_get_base_tables(target_conn))
+        common_tables = sorted(
+            name
+            for name in source_tables & target_tables
+            if not is_ignored(name)
+            and (only_tables is None or name in only_tables)
+            and (name_filter is None or name_filter(name))
+        )
+        if not common_tables:
+            return []
+
+        source_keys = _get_primary_keys(source_conn)
+        target_keys = _get_primary_keys(target_conn)
+        source_columns = _get_column_names(source_conn)
+        target_columns = _get_column_names(target_conn)
+
+        results = []
+        for table_name in common_tables:
+            primary_key = source_keys.get(table_name)
+            if not primary_key or primary_key != target_keys.get(table_name):
+                # 没有主键或两侧主键不一致时无法按区间对齐；数据未经校验，
+                # 标记为差异以免在汇总中被计为数据一致
+                message = "两侧主键不一致" if primary_key else "源表无主键"
+                results.append(
+                    self._create_result(
+                        task_log_id=task_log_id,
+                        object_name=table_name,
+                        has_differences=True,
+                        difference_details={
+                            "type": "skipped",
+                            "message": f"{message}，未校验表数据",
+                            "source_primary_key": primary_key or [],
+                            "target_primary_key": target_keys.get(table_name) or [],
+                        },
+                    )
+                )
+                continue
+
+            target_column_set = set(target_columns.get(table_name, []))
+            columns = [c for c in source_columns.get(table_name, []) if c in target_column_set]
+            spec = _TableSpec(table_name, primary_key, columns)
+            try:
+                differences = self._compare_table_data(source_conn, target_conn, spec, options)
+                has_differences = differences.pop("has_differences")
+            except pymysql.MySQLError as e:
+                print(f"表 {table_name} 数据比较失败: {e}")
+                differences = {"type": "failed", "message": f"数据比较失败：{e}"}
+                has_differences = True
+
+            if len(columns) < max(len(source_columns.get(table_name, [])), len(target_column_set)):
+                # 两侧列不一致时只校验共有列
+                differences["compared_columns"] = columns
+            results.append(
+                self._create_result(
+                    task_log_id=task_log_id,
+                    object_name=table_name,
+                    has_differences=has_differences,
+                    difference_details=differences,
+                )
+            )
+        return results
+
+    def _compare_table_data(
+        self,
+        source_conn: pymysql.Connection,
+        target_conn: pymysql.Connection,
+        spec: _TableSpec,
+        options: Dict[str, Any],
+    ) -> Dict[str, Any]:
+        """按区间校验单表数据，返回行数、区间统计和定位到的差异行主键"""
+        chunk_size = max(1, int(options.get("chunk_size") or settings.DATA_CHUNK_SIZE))
+        leaf_rows = max(1, int(options.get("leaf_rows") or settings.DATA_LEAF_ROWS))
+        max_rows = settings.DATA_MAX_REPORTED_ROWS
+        # 至少二分，保证子区间严格小于父区间
+        split_factor = max(2, settings.DATA_SPLIT_FACTOR)
+
+        report: Dict[str, Any] = {
+            "has_differences": False,
+            "source_rows": 0,
+            "target_rows": 0,
+            "chunks": 0,
+            "mismatched_chunks": 0,
+            "missing_in_target": [],
+            "missing_in_source": [],
+            "different": [],
+            "truncated": False,
+        }
+
+        def locate(lower: Key, upper: Key, source_count: int, target_count: int) -> None:
+            """在不一致的区间内定位差异行"""
+            if _reported(report) >= max_rows:
+                report["truncated"] = True
+                return
+            if max(source_count, target_count) <= leaf_rows:
+                self._diff_rows(source_conn, target_conn, spec, lower, upper, report, max_rows)
+                return
+
+            # 在行数较多的一侧取子区间边界，保证每次细分都能缩小区间
+            split_conn = source_conn if source_count >= target_count else target_conn
+            step = max(leaf_rows, max(source_count, target_count) // split_factor)
+            boundaries = _chunk_boundaries(split_conn, spec, lower, upper, step)
+            for sub_lower, sub_upper in _ranges(boundaries, lower, upper):
+                sub_source = _chunk_checksum(source_conn, spec, sub_lower, sub_upper)
+                sub_target = _chunk_checksum(target_conn, spec, sub_lower, sub_upper)
+                if sub_source != sub_target:
+                    locate(sub_lower, sub_upper, sub_source[0], sub_target[0])
+
+        boundaries = _chunk_boundaries(source_conn, spec, None, None, chunk_size)
+        for lower, upper in _ranges(boundaries, None, None):
+            source_count, source_checksum = _chunk_checksum(source_conn, spec, lower, upper)
+            target_count, target_checksum = _chunk_checksum(target_conn, spec, lower, upper)
+            report["chunks"] += 1
+            report["source_rows"] += source_count
+            report["target_rows"] += target_count
+            if (source_count, source_checksum) == (target_count, target_checksum):
+                continue
+            report["has_differences"] = True
+            report["mismatched_chunks"] += 1
+            locate(lower, upper, source_count, target_count)
+
+        return report
+
+    def _diff_rows(
+        self,
+        source_conn: pymysql.Connection,
+        target_conn: pymysql.Connection,
+        spec: _TableSpec,
+        lower: Key,
+        upper: Key,
+        report: Dict[str, Any],
+        max_rows: int,
+    ) -> None:
+        """逐行比对小区间内的行哈希"""
+        source_rows = _row_hashes(source_conn, spec, lower, upper)
+        target_rows = _row_hashes(target_conn, spec, lower, upper)
+        keys = list(source_rows) + [key for key in target_rows if key not in source_rows]
+        for key in keys:
+            if key not in target_rows:
+                bucket = "missing_in_target"
+            elif key not in source_rows:
+                bucket = "missing_in_source"
+            elif source_rows[key] != target_rows[key]:
+                bucket = "different"
+            else:
+                continue
+            if _reported(report) >= max_rows:
+                report["truncated"] = True
+                return
+            report[bucket].append(_format_key(key))
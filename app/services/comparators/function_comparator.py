@@ -1,12 +1,15 @@
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Callable
 import pymysql
 
 from app.models.tasks import Result
 from .base_comparator import BaseComparator
+from .sql_normalizer import normalize_sql
 
 
-def _get_functions(conn: pymysql.Connection) -> Dict[str, str]:
-    """获取数据库中的所有函数及其创建语句"""
+def _get_functions(
+    conn: pymysql.Connection, name_filter: Callable[[str], bool] = None
+) -> Dict[str, str]:
+    """获取数据库中的所有函数及其创建语句，name_filter 返回 False 的对象不获取"""
     functions = {}
     with conn.cursor() as cursor:
         # 获取所有函数
@@ -19,6 +22,8 @@ def _get_functions(conn: pymysql.Connection) -> Dict[str, str]:
         """
         )
         for (func_name,) in cursor.fetchall():
+            if name_filter is not None and not name_filter(func_name):
+                continue
             # 获取函数的创建语句
             cursor.execute(f"SHOW CREATE FUNCTION `{func_name}`")
             create_stmt = cursor.fetchone()[2]  # 第3列是创建语句
@@ -26,36 +31,65 @@ def _get_functions(conn: pymysql.Connection) -> Dict[str, str]:
     return functions
 
 
+def _get_function_fingerprints(conn: pymysql.Connection) -> Dict[str, str]:
+    """一次查询获取所有函数的指纹，由创建/修改时间和函数体计算"""
+    fingerprints = {}
+    with conn.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT
+                ROUTINE_NAME,
+                MD5(CONCAT_WS('|',
+                    CREATED, LAST_ALTERED, MD5(ROUTINE_DEFINITION), DTD_IDENTIFIER,
+                    DEFINER, SECURITY_TYPE, SQL_MODE, ROUTINE_COMMENT
+                ))
+            FROM INFORMATION_SCHEMA.ROUTINES
+            WHERE ROUTINE_TYPE = 'FUNCTION'
+            AND ROUTINE_SCHEMA = DATABASE()
+        """
+        )
+        for func_name, fingerprint in cursor.fetchall():
+            fingerprints[func_name] = fingerprint
+    return fingerprints
+
+
 class FunctionComparator(BaseComparator):
     """函数比较器"""
 
-    def _do_compare(
+    ignore_config_key = 'ignored_functions'
+    object_kind = 'function'
+
+    def _get_fingerprints(self, conn: pymysql.Connection) -> Dict[str, str]:
+        """获取所有函数的指纹"""
+        return _get_function_fingerprints(conn)
+
+    def fetch(
+        self,
+        conn: pymysql.Connection,
+        config: Dict[str, Any] = None,
+        name_filter: Callable[[str], bool] = None,
+    ) -> Dict[str, str]:
+        """获取单侧数据库的所有函数定义"""
+        return _get_functions(conn, self._name_filter(config, name_filter))
+
+    def diff(
         self,
         task_log_id: int,
-        source_conn: pymysql.Connection,
-        target_conn: pymysql.Connection,
+        source_functions: Dict[str, str],
+        target_functions: Dict[str, str],
         config: Dict[str, Any] = None,
     ) -> List[Result]:
         """执行函数比较"""
-        # 获取源数据库和目标数据库的所有函数
-        source_functions = _get_functions(source_conn)
-        target_functions = _get_functions(target_conn)
-
         results = []
         
         # 处理忽略函数配置
-        ignored_functions = []
-        
-        if config and 'ignored_functions' in config:
-            # 处理具体函数名忽略
-            if 'exact' in config['ignored_functions'] and isinstance(config['ignored_functions']['exact'], list):
-                ignored_functions = config['ignored_functions']['exact']
+        is_ignored = self._ignore_filter(config)
 
         # 比较函数
         all_function_names = set(source_functions.keys()) | set(target_functions.keys())
         
         # 过滤掉需要忽略的函数
-        all_function_names = {function_name for function_name in all_function_names if function_name not in ignored_functions}
+        all_function_names = {function_name for function_name in all_function_names if not is_ignored(function_name)}
         for function_name in all_function_names:
             if function_name not in source_functions:
                 # 函数在源数据库中不存在
@@ -89,17 +123,6 @@ class FunctionComparator(BaseComparator):
                 results.append(result)
             else:
                 # 比较函数定义
-                def normalize_sql(sql):
-                    import re
-                    # 去除多行注释
-                    sql = re.sub(r'/\*.*?\*/', '', sql, flags=re.DOTALL)
-                    # 去除单行注释 -- ... 和 # ...
-                    sql = re.sub(r'--.*?$', '', sql, flags=re.MULTILINE)
-                    sql = re.sub(r'#.*?$', '', sql, flags=re.MULTILINE)
-                    # 去除所有空白字符
-                    sql = re.sub(r'\s+', '', sql)
-                    return sql
-
                 norm_source = normalize_sql(source_functions[function_name])
                 norm_target = normalize_sql(target_functions[function_name])
                 if norm_source != norm_target:
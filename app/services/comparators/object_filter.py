@@ -0,0 +1,127 @@
+import fnmatch
+import json
+import re
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional
+
+# 配置中可以按对象类型单独设置规则的类型
+OBJECT_KINDS = ("table", "view", "procedure", "function", "trigger")
+
+
+def _as_list(value: Any) -> List[str]:
+    if isinstance(value, str):
+        return [value]
+    if isinstance(value, list):
+        return [item for item in value if isinstance(item, str)]
+    return []
+
+
+def _trie_pattern(prefixes: Iterable[str]) -> str:
+    """把前缀构造成字典树，再生成等价的正则，共享前缀只匹配一次"""
+    trie: Dict[str, Any] = {}
+    for prefix in prefixes:
+        node = trie
+        for char in prefix:
+            node = node.setdefault(char, {})
+        # 空键表示某个前缀在此结束，更长的前缀已被它覆盖
+        node[""] = {}
+
+    def emit(node: Dict[str, Any]) -> str:
+        if "" in node:
+            return ""
+        branches = [re.escape(char) + emit(child) for char, child in sorted(node.items())]
+        return branches[0] if len(branches) == 1 else f"(?:{'|'.join(branches)})"
+
+    return emit(trie)
+
+
+class NameMatcher:
+    """
+    名称匹配器。规则集支持精确名称、名称前缀、通配符（* ? [abc]）和正则（按 re.search 语义），
+    精确名称用集合判断，前缀和通配符合并为一个预编译正则；
+    用户正则可能带有全局标志或反向引用，各自单独编译
+    """
+
+    def __init__(self, rule_sets: Iterable[Any]):
+        exact, prefixes, patterns, regexes = set(), set(), [], []
+        for rules in rule_sets:
+            if isinstance(rules, list):
+                # 直接给出列表时按通配符处理
+                rules = {"globs": rules}
+            if not isinstance(rules, dict):
+                continue
+            exact.update(_as_list(rules.get("exact")))
+            prefixes.update(_as_list(rules.get("prefixes")))
+            for glob in _as_list(rules.get("globs")):
+                patterns.append(fnmatch.translate(glob))
+            for expr in _as_list(rules.get("regex")):
+                try:
+                    regexes.append(re.compile(expr))
+                except re.error as e:
+                    raise ValueError(f"过滤规则中的正则无效：{expr}（{e}）")
+
+        if prefixes:
+            patterns.insert(0, _trie_pattern(prefixes))
+        self.exact = frozenset(exact)
+        self.pattern = (
+            re.compile("|".join(f"(?:{pattern})" for pattern in patterns))
+            if patterns
+            else None
+        )
+        self.regexes = tuple(regexes)
+
+    def __bool__(self) -> bool:
+        return bool(self.exact) or self.pattern is not None or bool(self.regexes)
+
+    def __call__(self, name: str) -> bool:
+        return (
+            name in self.exact
+            or (self.pattern is not None and self.pattern.match(name) is not None)
+            or any(regex.search(name) is not None for regex in self.regexes)
+        )
+
+
+class ObjectFilter:
+    """对象过滤器，返回 True 表示对象参与比较：配置了包含规则时须命中包含规则，且不能命中排除规则"""
+
+    def __init__(self, include: NameMatcher, exclude: NameMatcher):
+        self.include = include
+        self.exclude = exclude
+
+    def __call__(self, name: str) -> bool:
+        if self.include and not self.include(name):
+            return False
+        return not self.exclude(name)
+
+
+@lru_cache(maxsize=256)
+def _compile(rules: str) -> ObjectFilter:
+    include, exclude = json.loads(rules)
+    return ObjectFilter(NameMatcher(include), NameMatcher(exclude))
+
+
+def object_filter(
+    config: Optional[Dict[str, Any]], kind: str, legacy_key: str = None
+) -> ObjectFilter:
+    """
+    根据任务配置生成某类对象的过滤器，相同规则只编译一次。配置格式：
+    {"filters": {"include": 规则集, "exclude": 规则集, "table": {"include": ..., "exclude": ...}, ...}}，
+    规则集为 {"exact": [...], "prefixes": [...], "globs": [...], "regex": [...]}。
+    兼容原有的 ignored_tables 等忽略配置，视为对应类型的排除规则
+    """
+    config = config or {}
+    filters = config.get("filters")
+    filters = filters if isinstance(filters, dict) else {}
+    per_kind = filters.get(kind)
+    per_kind = per_kind if isinstance(per_kind, dict) else {}
+    include = [filters.get("include"), per_kind.get("include")]
+    exclude = [filters.get("exclude"), per_kind.get("exclude")]
+    if legacy_key:
+        exclude.append(config.get(legacy_key))
+    return _compile(json.dumps([include, exclude], sort_keys=True, default=str))
+
+
+def validate_filters(config: Optional[Dict[str, Any]]) -> None:
+    """校验任务配置中的过滤规则，规则无效时抛出 ValueError"""
+    for kind in OBJECT_KINDS:
+        object_filter(config, kind, f"ignored_{kind}s")
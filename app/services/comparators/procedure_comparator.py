@@ -1,12 +1,15 @@
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Callable
 import pymysql
 
 from app.models.tasks import Result
 from .base_comparator import BaseComparator
+from .sql_normalizer import normalize_sql
 
 
-def _get_procedures(conn: pymysql.Connection) -> Dict[str, str]:
-    """获取数据库中的所有存储过程及其创建语句"""
+def _get_procedures(
+    conn: pymysql.Connection, name_filter: Callable[[str], bool] = None
+) -> Dict[str, str]:
+    """获取数据库中的所有存储过程及其创建语句，name_filter 返回 False 的对象不获取"""
     procedures = {}
     with conn.cursor() as cursor:
         # 获取所有存储过程
@@ -19,6 +22,8 @@ def _get_procedures(conn: pymysql.Connection) -> Dict[str, str]:
         """
         )
         for (proc_name,) in cursor.fetchall():
+            if name_filter is not None and not name_filter(proc_name):
+                continue
             # 获取存储过程的创建语句
             cursor.execute(f"SHOW CREATE PROCEDURE `{proc_name}`")
             create_stmt = cursor.fetchone()[2]  # 第3列是创建语句
@@ -26,30 +31,59 @@ def _get_procedures(conn: pymysql.Connection) -> Dict[str, str]:
     return procedures
 
 
+def _get_procedure_fingerprints(conn: pymysql.Connection) -> Dict[str, str]:
+    """一次查询获取所有存储过程的指纹，由创建/修改时间和过程体计算"""
+    fingerprints = {}
+    with conn.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT
+                ROUTINE_NAME,
+                MD5(CONCAT_WS('|',
+                    CREATED, LAST_ALTERED, MD5(ROUTINE_DEFINITION),
+                    DEFINER, SECURITY_TYPE, SQL_MODE, ROUTINE_COMMENT
+                ))
+            FROM INFORMATION_SCHEMA.ROUTINES
+            WHERE ROUTINE_TYPE = 'PROCEDURE'
+            AND ROUTINE_SCHEMA = DATABASE()
+        """
+        )
+        for proc_name, fingerprint in cursor.fetchall():
+            fingerprints[proc_name] = fingerprint
+    return fingerprints
+
+
 class ProcedureComparator(BaseComparator):
     """存储过程比较器"""
 
-    def _do_compare(
+    ignore_config_key = 'ignored_procedures'
+    object_kind = 'procedure'
+
+    def _get_fingerprints(self, conn: pymysql.Connection) -> Dict[str, str]:
+        """获取所有存储过程的指纹"""
+        return _get_procedure_fingerprints(conn)
+
+    def fetch(
+        self,
+        conn: pymysql.Connection,
+        config: Dict[str, Any] = None,
+        name_filter: Callable[[str], bool] = None,
+    ) -> Dict[str, str]:
+        """获取单侧数据库的所有存储过程定义"""
+        return _get_procedures(conn, self._name_filter(config, name_filter))
+
+    def diff(
         self,
         task_log_id: int,
-        source_conn: pymysql.Connection,
-        target_conn: pymysql.Connection,
+        source_procedures: Dict[str, str],
+        target_procedures: Dict[str, str],
         config: Dict[str, Any] = None,
     ) -> List[Result]:
         """执行存储过程比较"""
-        # 获取源数据库和目标数据库的所有存储过程
-        source_procedures = _get_procedures(source_conn)
-        target_procedures = _get_procedures(target_conn)
-
         results = []
 
         # 处理忽略存储过程配置
-        ignored_procedures = []
-
-        if config and 'ignored_procedures' in config:
-            # 处理具体存储过程名忽略
-            if 'exact' in config['ignored_procedures'] and isinstance(config['ignored_procedures']['exact'], list):
-                ignored_procedures = config['ignored_procedures']['exact']
+        is_ignored = self._ignore_filter(config)
 
         # 比较存储过程
         all_procedure_names = set(source_procedures.keys()) | set(
@@ -57,7 +91,7 @@ class ProcedureComparator(BaseComparator):
         )
 
         # 过滤掉需要忽略的存储过程
-        all_procedure_names = {procedure_name for procedure_name in all_procedure_names if procedure_name not in ignored_procedures}
+        all_procedure_names = {procedure_name for procedure_name in all_procedure_names if not is_ignored(procedure_name)}
 
         for procedure_name in all_procedure_names:
             if procedure_name not in source_procedures:
@@ -92,13 +126,6 @@ class ProcedureComparator(BaseComparator):
                 results.append(result)
             else:
                 # 比较存储过程定义
-                def normalize_sql(sql):
-                    import re
-                    sql = re.sub(r'/\*.*?\*/', '', sql, flags=re.DOTALL)
-                    sql = re.sub(r'--.*?$', '', sql, flags=re.MULTILINE)
-                    sql = re.sub(r'#.*?$', '', sql, flags=re.MULTILINE)
-                    sql = re.sub(r'\s+', '', sql)
-                    return sql
                 norm_source = normalize_sql(source_procedures[procedure_name])
                 norm_target = normalize_sql(target_procedures[procedure_name])
                 if norm_source != norm_target:
@@ -0,0 +1,172 @@
+import re
+from functools import lru_cache
+from typing import List
+
+# 规范化结果缓存条数；多目标比较时同一份源库定义会与每个目标库比较，命中缓存后不再重复扫描
+_CACHE_SIZE = 4096
+
+# 单次扫描的词法规则：空白、注释、字符串、反引号标识符、单词（含 @ 变量）和其他单个字符。
+# 按 MySQL 规则，-- 后必须跟空白或位于行尾才是注释
+_TOKEN_RE = re.compile(
+    r"""
+      (?P<space>\s+)
+    | (?P<comment>/\*.*?\*/|\#[^\n]*|--(?:[ \t\r\f\v][^\n]*|(?=\n)|$))
+    | (?P<string>'(?:[^'\\]|\\.|'')*'|"(?:[^"\\]|\\.|"")*")
+    | (?P<quoted>`(?:[^`]|``)*`)
+    | (?P<word>@{0,2}[\w$]+)
+    | (?P<other>.)
+    """,
+    re.VERBOSE | re.DOTALL,
+)
+
+_SKIPPED = ("space", "comment")
+
+
+def _tokenize(sql: str) -> List[str]:
+    """把 SQL 切分为有效词法单元，丢弃空白和注释，字符串与标识符原样保留"""
+    return [
+        match.group()
+        for match in _TOKEN_RE.finditer(sql)
+        if match.lastgroup not in _SKIPPED
+    ]
+
+
+# CREATE 语句头部以这些关键字结束，之后为对象名和对象体
+_OBJECT_KEYWORDS = frozenset({"VIEW", "PROCEDURE", "FUNCTION", "TRIGGER", "EVENT"})
+
+
+def _header_length(tokens: List[str]) -> int:
+    """返回 CREATE 语句头部（对象类型关键字之前）的词法单元数，不是 CREATE 语句时返回 0"""
+    if not tokens or tokens[0].upper() != "CREATE":
+        return 0
+    for i, token in enumerate(tokens):
+        if token.upper() in _OBJECT_KEYWORDS:
+            return i
+    return 0
+
+
+# 存储过程和函数在参数列表（函数为 RETURNS 子句）与对象体之间的特征子句
+_ROUTINE_KEYWORDS = frozenset({"PROCEDURE", "FUNCTION"})
+# RETURNS 类型之后可能出现的修饰词，CHARSET/COLLATE 后跟一个名称
+_TYPE_FLAGS = frozenset({"UNSIGNED", "SIGNED", "ZEROFILL", "BINARY"})
+
+
+def _skip_parens(tokens: List[str], i: int) -> int:
+    """i 指向左括号时返回匹配的右括号之后的位置，否则原样返回"""
+    if i >= len(tokens) or tokens[i] != "(":
+        return i
+    depth = 0
+    for j in range(i, len(tokens)):
+        if tokens[j] == "(":
+            depth += 1
+        elif tokens[j] == ")":
+            depth -= 1
+            if depth == 0:
+                return j + 1
+    return len(tokens)
+
+
+def _skip_return_type(tokens: List[str], i: int) -> int:
+    """跳过 RETURNS 之后的返回类型，如 varchar(64) CHARSET utf8mb4 COLLATE utf8mb4_bin"""
+    n = len(tokens)
+    i = _skip_parens(tokens, i + 1)
+    while i < n:
+        keyword = tokens[i].upper()
+        if keyword in _TYPE_FLAGS:
+            i += 1
+        elif keyword in ("CHARSET", "COLLATE"):
+            i += 2
+        elif keyword == "CHARACTER" and i + 1 < n and tokens[i + 1].upper() == "SET":
+            i += 3
+        else:
+            break
+    return i
+
+
+def _characteristic_length(tokens: List[str], i: int) -> int:
+    """返回从 i 开始的一个存储过程特征子句的词法单元数，不是特征子句时返回 0"""
+    words = [token.upper() for token in tokens[i:i + 3]]
+    if words[:1] == ["DETERMINISTIC"]:
+        return 1
+    if words[:2] in (["NOT", "DETERMINISTIC"], ["LANGUAGE", "SQL"], ["CONTAINS", "SQL"], ["NO", "SQL"]):
+        return 2
+    if words[:1] == ["COMMENT"] and len(words) > 1 and tokens[i + 1][:1] in ("'", '"'):
+        return 2
+    if words[:2] == ["SQL", "SECURITY"] and len(words) > 2:
+        return 3
+    if words in (["READS", "SQL", "DATA"], ["MODIFIES", "SQL", "DATA"]):
+        return 3
+    return 0
+
+
+def _strip_routine_characteristics(tokens: List[str], start: int) -> List[str]:
+    """
+    去除存储过程、函数特征子句中的 SQL SECURITY。
+    SHOW CREATE PROCEDURE/FUNCTION 把它输出在参数列表或 RETURNS 子句之后、对象体之前，
+    其他特征（DETERMINISTIC、COMMENT 等）保持不变；start 为 PROCEDURE/FUNCTION 关键字的位置
+    """
+    i = start
+    while i < len(tokens) and tokens[i] != "(":
+        i += 1
+    i = _skip_parens(tokens, i)
+    if tokens[start].upper() == "FUNCTION" and i < len(tokens) and tokens[i].upper() == "RETURNS":
+        i = _skip_return_type(tokens, i + 1)
+
+    stripped = tokens[start:i]
+    while True:
+        length = _characteristic_length(tokens, i)
+        if not length:
+            break
+        if tokens[i].upper() != "SQL":
+            stripped.extend(tokens[i:i + length])
+        i += length
+    stripped.extend(tokens[i:])
+    return stripped
+
+
+def _strip_clauses(tokens: List[str]) -> List[str]:
+    """
+    去除 CREATE 语句中与环境相关、不影响对象逻辑的子句：
+    头部的 DEFINER=user[@host]、ALGORITHM=xxx 和 SQL SECURITY {DEFINER|INVOKER}，
+    以及存储过程、函数特征子句中的 SQL SECURITY。
+    对象体中同名的子句（如 ALTER TABLE ... ALGORITHM=INPLACE）属于对象逻辑，保持不变
+    """
+    n = _header_length(tokens)
+    stripped = []
+    i = 0
+    while i < n:
+        keyword = tokens[i].upper()
+        if keyword in ("DEFINER", "ALGORITHM") and i + 2 < n and tokens[i + 1] == "=":
+            i += 3
+            if keyword == "DEFINER" and i < n:
+                if tokens[i] == "@":
+                    # `user`@`host` 或 'user'@'host'
+                    i += 2
+                elif tokens[i].startswith("@"):
+                    # 未加引号的 user@host
+                    i += 1
+                elif tokens[i] == "(" and i + 1 < n and tokens[i + 1] == ")":
+                    # CURRENT_USER()
+                    i += 2
+            continue
+        if keyword == "SQL" and i + 2 < n and tokens[i + 1].upper() == "SECURITY":
+            i += 3
+            continue
+        stripped.append(tokens[i])
+        i += 1
+    if n and tokens[n].upper() in _ROUTINE_KEYWORDS:
+        stripped.extend(_strip_routine_characteristics(tokens, n))
+    else:
+        stripped.extend(tokens[max(i, n):])
+    return stripped
+
+
+@lru_cache(maxsize=_CACHE_SIZE)
+def normalize_sql(sql: str) -> str:
+    """
+    规范化视图、存储过程、函数和触发器的定义用于比较：
+    忽略注释、空白差异，CREATE 头部的 DEFINER/ALGORITHM/SQL SECURITY 子句及存储过程、函数特征中的 SQL SECURITY，
+    字符串和反引号标识符内容保持不变。
+    按定义文本缓存结果，相同定义只扫描一次
+    """
+    return " ".join(_strip_clauses(_tokenize(sql)))
@@ -0,0 +1,116 @@
+from typing import Dict, List, Any, Callable, Optional
+import pymysql
+
+from app.core.config import settings
+from app.models.tasks import Result
+from .base_comparator import BaseComparator
+
+# 参与比较的统计项，对应 INFORMATION_SCHEMA.TABLES 的列
+_METRICS = ("table_rows", "data_length", "index_length", "auto_increment")
+
+
+def _get_table_statistics(conn: pymysql.Connection) -> Dict[str, Dict[str, Optional[int]]]:
+    """一次查询获取所有基表的行数估计、数据与索引大小和自增值"""
+    statistics = {}
+    with conn.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT TABLE_NAME, TABLE_ROWS, DATA_LENGTH, INDEX_LENGTH, AUTO_INCREMENT
+            FROM INFORMATION_SCHEMA.TABLES
+            WHERE TABLE_SCHEMA = DATABASE() AND TABLE_TYPE = 'BASE TABLE'
+        """
+        )
+        for table_name, *values in cursor.fetchall():
+            statistics[table_name] = {
+                metric: None if value is None else int(value)
+                for metric, value in zip(_METRICS, values)
+            }
+    return statistics
+
+
+def _ratio(source: Optional[int], target: Optional[int]) -> Optional[float]:
+    """差值相对两侧较大值的比例，任一侧缺失时为 None"""
+    if source is None or target is None:
+        return None
+    base = max(abs(source), abs(target))
+    return round(abs(target - source) / base, 4) if base else 0.0
+
+
+class StatisticsComparator(BaseComparator):
+    """
+    表统计信息比较器。
+    每侧只查询一次 INFORMATION_SCHEMA.TABLES，比较行数估计、数据大小、索引大小和自增值，
+    变化比例超过阈值的表标记为有差异，作为数据比较前的低成本漂移信号。
+    """
+
+    ignore_config_key = 'ignored_tables'
+    object_kind = 'table'
+
+    def fetch(
+        self,
+        conn: pymysql.Connection,
+        config: Dict[str, Any] = None,
+        name_filter: Callable[[str], bool] = None,
+    ) -> Dict[str, Dict[str, Optional[int]]]:
+        """获取单侧所有基表的统计信息，任务配置关闭该阶段时不查询"""
+        options = (config or {}).get("statistics") or {}
+        if options.get("enabled") is False:
+            return {}
+        name_filter = self._name_filter(config, name_filter)
+        return {
+            table_name: values
+            for table_name, values in _get_table_statistics(conn).items()
+            if name_filter(table_name)
+        }
+
+    def diff(
+        self,
+        task_log_id: int,
+        source_statistics: Dict[str, Dict[str, Optional[int]]],
+        target_statistics: Dict[str, Dict[str, Optional[int]]],
+        config: Dict[str, Any] = None,
+    ) -> List[Result]:
+        """比较两侧共有表的统计信息"""
+        options = (config or {}).get("statistics") or {}
+        if options.get("enabled") is False:
+            return []
+        threshold = float(options.get("ratio_threshold", settings.STATISTICS_RATIO_THRESHOLD))
+        is_ignored = self._ignore_filter(config)
+
+        results = []
+        for table_name in sorted(source_statistics.keys() & target_statistics.keys()):
+            if is_ignored(table_name):
+                continue
+
+            source = source_statistics[table_name]
+            target = target_statistics[table_name]
+            metrics = {}
+            flagged = []
+            for metric in _METRICS:
+                ratio = _ratio(source[metric], target[metric])
+                metrics[metric] = {
+                    "source": source[metric],
+                    "target": target[metric],
+                    "delta": (
+                        target[metric] - source[metric]
+                        if source[metric] is not None and target[metric] is not None
+                        else None
+                    ),
+                    "ratio": ratio,
+                }
+                if ratio is not None and ratio > threshold:
+                    flagged.append(metric)
+
+            results.append(
+                self._create_result(
+                    task_log_id=task_log_id,
+                    object_name=table_name,
+                    has_differences=bool(flagged),
+                    difference_details={
+                        "metrics": metrics,
+                        "flagged": flagged,
+                        "ratio_threshold": threshold,
+                    },
+                )
+            )
+        return results
@@ -1,12 +1,20 @@
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Tuple, Callable
+from concurrent.futures import ThreadPoolExecutor
+import threading
 import pymysql
 
+from app.core.config import settings
 from app.models.tasks import Result
+from app.services.connection_manager import ConnectionPool
+from app.services.incremental_service import IncrementalState
 from .base_comparator import BaseComparator
+from .column_types import column_types_equal
 
 
-def _get_tables(conn: pymysql.Connection) -> Dict[str, str]:
-    """获取数据库中的所有表及其创建语句"""
+def _get_tables(
+    conn: pymysql.Connection, name_filter: Callable[[str], bool] = None
+) -> Dict[str, str]:
+    """获取数据库中的所有表及其创建语句，name_filter 返回 False 的表不获取"""
     tables = {}
     with conn.cursor() as cursor:
         cursor.execute(
@@ -18,12 +26,66 @@ def _get_tables(conn: pymysql.Connection) -> Dict[str, str]:
         """
         )
         for (table_name,) in cursor.fetchall():
+            if name_filter is not None and not name_filter(table_name):
+                continue
             cursor.execute(f"SHOW CREATE TABLE `{table_name}`")
             create_stmt = cursor.fetchone()[1]
             tables[table_name] = create_stmt
     return tables
 
 
+def _get_table_fingerprints(conn: pymysql.Connection) -> Dict[str, str]:
+    """
+    一次查询获取所有表的结构指纹。由表属性及列、索引、约束定义在服务端聚合计算，
+    不包含 UPDATE_TIME、AUTO_INCREMENT 等随数据变化的字段
+    """
+    fingerprints = {}
+    with conn.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT
+                t.TABLE_NAME,
+                MD5(CONCAT_WS('|',
+                    t.CREATE_TIME, t.ENGINE, t.ROW_FORMAT, t.TABLE_COLLATION,
+                    t.CREATE_OPTIONS, t.TABLE_COMMENT,
+                    c.digest, s.digest, k.digest
+                ))
+            FROM INFORMATION_SCHEMA.TABLES t
+            LEFT JOIN (
+                SELECT TABLE_NAME, BIT_XOR(CRC32(CONCAT_WS('|',
+                    ORDINAL_POSITION, COLUMN_NAME, COLUMN_TYPE, IS_NULLABLE,
+                    IFNULL(COLUMN_DEFAULT, 'NULL'), EXTRA, COLLATION_NAME, COLUMN_COMMENT
+                ))) AS digest
+                FROM INFORMATION_SCHEMA.COLUMNS
+                WHERE TABLE_SCHEMA = DATABASE()
+                GROUP BY TABLE_NAME
+            ) c ON c.TABLE_NAME = t.TABLE_NAME
+            LEFT JOIN (
+                SELECT TABLE_NAME, BIT_XOR(CRC32(CONCAT_WS('|',
+                    INDEX_NAME, NON_UNIQUE, SEQ_IN_INDEX, COLUMN_NAME, SUB_PART, INDEX_TYPE
+                ))) AS digest
+                FROM INFORMATION_SCHEMA.STATISTICS
+                WHERE TABLE_SCHEMA = DATABASE()
+                GROUP BY TABLE_NAME
+            ) s ON s.TABLE_NAME = t.TABLE_NAME
+            LEFT JOIN (
+                SELECT TABLE_NAME, BIT_XOR(CRC32(CONCAT_WS('|',
+                    CONSTRAINT_NAME, COLUMN_NAME, ORDINAL_POSITION,
+                    REFERENCED_TABLE_NAME, REFERENCED_COLUMN_NAME
+                ))) AS digest
+                FROM INFORMATION_SCHEMA.KEY_COLUMN_USAGE
+                WHERE TABLE_SCHEMA = DATABASE()
+                GROUP BY TABLE_NAME
+            ) k ON k.TABLE_NAME = t.TABLE_NAME
+            WHERE t.TABLE_SCHEMA = DATABASE()
+            AND t.TABLE_TYPE = 'BASE TABLE'
+        """
+        )
+        for table_name, fingerprint in cursor.fetchall():
+            fingerprints[table_name] = fingerprint
+    return fingerprints
+
+
 def _get_table_columns(conn: pymysql.Connection, table_name: str) -> Dict[str, Dict]:
     """获取表的列定义"""
     columns = {}
@@ -118,6 +180,179 @@ def _get_table_constraints(
     return constraints
 
 
+def _get_schema_columns(conn: pymysql.Connection) -> Dict[str, Dict[str, Dict]]:
+    """一次性获取整个库所有表的列定义"""
+    tables = {}
+    with conn.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT
+                TABLE_NAME,
+                COLUMN_NAME,
+                COLUMN_TYPE,
+                IS_NULLABLE,
+                COLUMN_DEFAULT,
+                EXTRA
+            FROM INFORMATION_SCHEMA.COLUMNS
+            WHERE TABLE_SCHEMA = DATABASE()
+            ORDER BY TABLE_NAME, ORDINAL_POSITION
+        """
+        )
+        for row in cursor.fetchall():
+            tables.setdefault(row[0], {})[row[1]] = {
+                "type": row[2],
+                "nullable": row[3] == "YES",
+                "default": row[4],
+                "extra": row[5],
+            }
+    return tables
+
+
+def _get_schema_indexes(conn: pymysql.Connection) -> Dict[str, Dict[str, Dict]]:
+    """一次性获取整个库所有表的索引定义"""
+    tables = {}
+    with conn.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT
+                TABLE_NAME,
+                INDEX_NAME,
+                NON_UNIQUE,
+                COLUMN_NAME
+            FROM INFORMATION_SCHEMA.STATISTICS
+            WHERE TABLE_SCHEMA = DATABASE()
+            ORDER BY TABLE_NAME, INDEX_NAME, SEQ_IN_INDEX
+        """
+        )
+        for row in cursor.fetchall():
+            indexes = tables.setdefault(row[0], {})
+            if row[1] not in indexes:
+                indexes[row[1]] = {"unique": int(row[2]) == 0, "columns": []}
+            indexes[row[1]]["columns"].append(row[3])
+    return tables
+
+
+def _get_schema_constraints(
+    conn: pymysql.Connection,
+) -> Dict[str, Dict[str, Dict]]:
+    """一次性获取整个库所有表的外键和唯一约束定义"""
+    tables = {}
+    with conn.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT
+                k.TABLE_NAME,
+                k.CONSTRAINT_NAME,
+                k.COLUMN_NAME,
+                k.REFERENCED_TABLE_NAME,
+                k.REFERENCED_COLUMN_NAME,
+                c.CONSTRAINT_TYPE
+            FROM INFORMATION_SCHEMA.KEY_COLUMN_USAGE k
+            JOIN INFORMATION_SCHEMA.TABLE_CONSTRAINTS c
+                ON c.CONSTRAINT_SCHEMA = k.CONSTRAINT_SCHEMA
+                AND c.TABLE_NAME = k.TABLE_NAME
+                AND c.CONSTRAINT_NAME = k.CONSTRAINT_NAME
+            WHERE k.TABLE_SCHEMA = DATABASE()
+            AND c.CONSTRAINT_TYPE IN ('FOREIGN KEY', 'UNIQUE')
+            ORDER BY k.TABLE_NAME, k.CONSTRAINT_NAME, k.ORDINAL_POSITION
+        """
+        )
+        for row in cursor.fetchall():
+            constraints = tables.setdefault(row[0], {})
+            constraint_name = row[1]
+            if constraint_name not in constraints:
+                if row[5] == "FOREIGN KEY":
+                    constraints[constraint_name] = {
+                        "type": "FOREIGN KEY",
+                        "columns": [],
+                        "referenced_table": row[3],
+                        "referenced_columns": [],
+                    }
+                else:
+                    constraints[constraint_name] = {"type": "UNIQUE", "columns": []}
+            constraints[constraint_name]["columns"].append(row[2])
+            if row[5] == "FOREIGN KEY" and row[4]:
+                constraints[constraint_name]["referenced_columns"].append(row[4])
+    return tables
+
+
+def _get_schema_metadata(conn: pymysql.Connection) -> Dict[str, Dict[str, Dict]]:
+    """
+    批量加载整个库的表结构元数据，返回
+    {"columns": {表名: 列定义}, "indexes": {表名: 索引定义}, "constraints": {表名: 约束定义}}，
+    结构与 _get_table_columns/_get_table_indexes/_get_table_constraints 的结果一致
+    """
+    return {
+        "columns": _get_schema_columns(conn),
+        "indexes": _get_schema_indexes(conn),
+        "constraints": _get_schema_constraints(conn),
+    }
+
+
+def _get_table_details(
+    conn: pymysql.Connection, table_names: List[str]
+) -> Dict[str, Dict[str, Dict]]:
+    """在同一连接上逐表获取列、索引和约束定义，返回结构与 _get_schema_metadata 一致"""
+    metadata = {"columns": {}, "indexes": {}, "constraints": {}}
+    for table_name in table_names:
+        metadata["columns"][table_name] = _get_table_columns(conn, table_name)
+        metadata["indexes"][table_name] = _get_table_indexes(conn, table_name)
+        metadata["constraints"][table_name] = _get_table_constraints(conn, table_name)
+    return metadata
+
+
+def _get_table_details_parallel(
+    pool: ConnectionPool, table_names: List[str], workers: int
+) -> Dict[str, Dict[str, Dict]]:
+    """
+    从连接池借用多个连接，并发逐表获取列、索引和约束定义。
+    返回结构与 _get_schema_metadata 一致，各表按 table_names 的顺序合并。
+    """
+    pending = iter(table_names)
+    lock = threading.Lock()
+    started = threading.Event()
+
+    def worker() -> Dict[str, Dict[str, Dict]]:
+        fetched = {}
+        try:
+            conn = pool.acquire()
+        except TimeoutError:
+            # 连接池被其他阶段占满时，只要已有工作线程在处理剩余表即可退出
+            if started.is_set():
+                return fetched
+            raise
+        started.set()
+
+        try:
+            while True:
+                with lock:
+                    table_name = next(pending, None)
+                if table_name is None:
+                    break
+                fetched[table_name] = {
+                    "columns": _get_table_columns(conn, table_name),
+                    "indexes": _get_table_indexes(conn, table_name),
+                    "constraints": _get_table_constraints(conn, table_name),
+                }
+        except Exception:
+            pool.release(conn, discard=True)
+            raise
+        pool.release(conn)
+        return fetched
+
+    details = {}
+    workers = max(1, min(workers, len(table_names)))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for future in [executor.submit(worker) for _ in range(workers)]:
+            details.update(future.result())
+
+    metadata = {"columns": {}, "indexes": {}, "constraints": {}}
+    for table_name in table_names:
+        for key in metadata:
+            metadata[key][table_name] = details[table_name][key]
+    return metadata
+
+
 def _compare_columns(
     source: Dict[str, Dict], target: Dict[str, Dict]
 ) -> Dict[str, Any]:
@@ -141,27 +376,12 @@ def _compare_columns(
             target_col = target[col]
             col_diffs = {}
 
-            # 对于 int/bigint/smallint/tinyint 类型，只比类型名，忽略长度
-            import re
-            def get_base_type(type_str):
-                return re.match(r"^\w+", type_str).group(0).lower() if re.match(r"^\w+", type_str) else type_str.lower()
-            int_types = {"int", "bigint", "smallint", "tinyint"}
-            source_base = get_base_type(source_col["type"])
-            target_base = get_base_type(target_col["type"])
-            if source_base in int_types and target_base in int_types:
-                # 类型名一致就不报差异
-                if source_base != target_base:
-                    col_diffs["type"] = {
-                        "source": source_col["type"],
-                        "target": target_col["type"],
-                    }
-                # 类型名一致就什么都不做（不报长度差异）
-            else:
-                if source_col["type"] != target_col["type"]:
-                    col_diffs["type"] = {
-                        "source": source_col["type"],
-                        "target": target_col["type"],
-                    }
+            # 按解析后的类型结构比较，整数类型忽略显示宽度
+            if not column_types_equal(source_col["type"], target_col["type"]):
+                col_diffs["type"] = {
+                    "source": source_col["type"],
+                    "target": target_col["type"],
+                }
             if source_col["nullable"] != target_col["nullable"]:
                 col_diffs["nullable"] = {
                     "source": source_col["nullable"],
@@ -391,6 +611,13 @@ def _generate_table_change_sql(table_name: str, differences: Dict[str, Any]) ->
 class TableComparator(BaseComparator):
     """表比较器"""
 
+    ignore_config_key = 'ignored_tables'
+    object_kind = 'table'
+
+    def _get_fingerprints(self, conn: pymysql.Connection) -> Dict[str, str]:
+        """获取所有表的结构指纹"""
+        return _get_table_fingerprints(conn)
+
     def _compare_table_details(
         self,
         table_name: str,
@@ -421,57 +648,139 @@ class TableComparator(BaseComparator):
 
         return differences
 
+    def collect(
+        self,
+        task_log_id: int,
+        source_pool: ConnectionPool,
+        target_pool: ConnectionPool,
+        config: Dict[str, Any] = None,
+        incremental: IncrementalState = None,
+    ) -> List[Result]:
+        """并发模式下需要把连接池传给 _do_compare，以便逐表查询分散到多个连接"""
+        if settings.TABLE_METADATA_MODE != "parallel" or source_pool is target_pool:
+            return super().collect(
+                task_log_id, source_pool, target_pool, config, incremental
+            )
+
+        with source_pool.connection() as source_conn:
+            with target_pool.connection() as target_conn:
+                name_filter = self._incremental_filter(
+                    source_conn, target_conn, config, incremental
+                )
+                return self._do_compare(
+                    task_log_id,
+                    source_conn,
+                    target_conn,
+                    config,
+                    name_filter,
+                    source_pool=source_pool,
+                    target_pool=target_pool,
+                )
+
+    def _load_table_details_parallel(
+        self,
+        table_names: List[str],
+        source_pool: ConnectionPool,
+        target_pool: ConnectionPool,
+    ) -> Tuple[Dict[str, Dict], Dict[str, Dict]]:
+        """源库和目标库同时并发获取表结构明细"""
+        # 调用方已占用每个连接池中的一个连接
+        source_workers = min(settings.TABLE_METADATA_WORKERS, max(1, source_pool.max_size - 1))
+        target_workers = min(settings.TABLE_METADATA_WORKERS, max(1, target_pool.max_size - 1))
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            source_future = executor.submit(
+                _get_table_details_parallel, source_pool, table_names, source_workers
+            )
+            target_future = executor.submit(
+                _get_table_details_parallel, target_pool, table_names, target_workers
+            )
+            return source_future.result(), target_future.result()
+
+    def fetch(
+        self,
+        conn: pymysql.Connection,
+        config: Dict[str, Any] = None,
+        name_filter: Callable[[str], bool] = None,
+    ) -> Dict[str, Dict]:
+        """
+        获取单侧数据库的表创建语句及列、索引、约束定义，
+        表结构明细始终批量加载，只保留参与比较的表
+        """
+        tables = _get_tables(conn, self._name_filter(config, name_filter))
+        metadata = _get_schema_metadata(conn)
+        snapshot = {"tables": tables}
+        for key, values in metadata.items():
+            snapshot[key] = {
+                table_name: value
+                for table_name, value in values.items()
+                if table_name in tables
+            }
+        return snapshot
+
     def _do_compare(
         self,
         task_log_id: int,
         source_conn: pymysql.Connection,
         target_conn: pymysql.Connection,
         config: Dict[str, Any] = None,
+        name_filter: Callable[[str], bool] = None,
+        source_pool: ConnectionPool = None,
+        target_pool: ConnectionPool = None,
     ) -> List[Result]:
-        """执行表比较"""
-        # 获取源数据库和目标数据库的所有表
-        source_tables = _get_tables(source_conn)
-        target_tables = _get_tables(target_conn)
+        """执行表比较，按配置的加载方式只获取两侧共有表的结构明细"""
+        # 获取源数据库和目标数据库的所有表，被过滤规则排除的表不获取创建语句
+        name_filter = self._name_filter(config, name_filter)
+        source_tables = _get_tables(source_conn, name_filter)
+        target_tables = _get_tables(target_conn, name_filter)
+
+        # 批量模式下一次性加载两侧的列、索引和约束，避免逐表查询；
+        # 并发模式下把逐表查询分散到连接池中的多个连接
+        common_tables = sorted(source_tables.keys() & target_tables.keys())
+        if not common_tables:
+            source_metadata = {"columns": {}, "indexes": {}, "constraints": {}}
+            target_metadata = {"columns": {}, "indexes": {}, "constraints": {}}
+        elif settings.TABLE_METADATA_MODE == "bulk":
+            source_metadata = _get_schema_metadata(source_conn)
+            target_metadata = _get_schema_metadata(target_conn)
+        elif source_pool is not None and target_pool is not None:
+            source_metadata, target_metadata = self._load_table_details_parallel(
+                common_tables, source_pool, target_pool
+            )
+        else:
+            source_metadata = _get_table_details(source_conn, common_tables)
+            target_metadata = _get_table_details(target_conn, common_tables)
+
+        return self.diff(
+            task_log_id,
+            {"tables": source_tables, **source_metadata},
+            {"tables": target_tables, **target_metadata},
+            config,
+        )
+
+    def diff(
+        self,
+        task_log_id: int,
+        source: Dict[str, Dict],
+        target: Dict[str, Dict],
+        config: Dict[str, Any] = None,
+    ) -> List[Result]:
+        """比较两侧的表及其结构明细"""
+        source_tables = source["tables"]
+        target_tables = target["tables"]
 
         results = []
-        
-        # 处理忽略表配置
-        ignored_tables = []
-        ignored_prefixes = []
-        
-        if config and 'ignored_tables' in config:
-            # 处理具体表名忽略
-            if 'exact' in config['ignored_tables'] and isinstance(config['ignored_tables']['exact'], list):
-                ignored_tables = config['ignored_tables']['exact']
-            
-            # 处理表名前缀忽略
-            if 'prefixes' in config['ignored_tables'] and isinstance(config['ignored_tables']['prefixes'], list):
-                ignored_prefixes = config['ignored_tables']['prefixes']
-
-        # 比较表是否存在
-        all_tables = set(source_tables.keys()) | set(target_tables.keys())
-        
-        # 过滤掉需要忽略的表
-        filtered_tables = set()
-        for table_name in all_tables:
-            # 检查是否在忽略表列表中
-            if table_name in ignored_tables:
-                continue
-                
-            # 检查是否匹配忽略前缀
-            should_ignore = False
-            for prefix in ignored_prefixes:
-                if table_name.startswith(prefix):
-                    should_ignore = True
-                    break
-                    
-            if not should_ignore:
-                filtered_tables.add(table_name)
-        
-        # 使用过滤后的表集合
-        all_tables = filtered_tables
-
-        for table_name in all_tables:
+
+        # 处理忽略表配置（具体表名及表名前缀）
+        is_ignored = self._ignore_filter(config)
+
+        # 比较表是否存在，过滤掉需要忽略的表
+        all_tables = {
+            table_name
+            for table_name in set(source_tables.keys()) | set(target_tables.keys())
+            if not is_ignored(table_name)
+        }
+
+        for table_name in sorted(all_tables):
             source_exists = table_name in source_tables
             target_exists = table_name in target_tables
 
@@ -510,14 +819,14 @@ class TableComparator(BaseComparator):
                 continue
 
             # 比较表结构
-            source_columns = _get_table_columns(source_conn, table_name)
-            target_columns = _get_table_columns(target_conn, table_name)
+            source_columns = source["columns"].get(table_name, {})
+            target_columns = target["columns"].get(table_name, {})
 
-            source_indexes = _get_table_indexes(source_conn, table_name)
-            target_indexes = _get_table_indexes(target_conn, table_name)
+            source_indexes = source["indexes"].get(table_name, {})
+            target_indexes = target["indexes"].get(table_name, {})
 
-            source_constraints = _get_table_constraints(source_conn, table_name)
-            target_constraints = _get_table_constraints(target_conn, table_name)
+            source_constraints = source["constraints"].get(table_name, {})
+            target_constraints = target["constraints"].get(table_name, {})
 
             differences = self._compare_table_details(
                 table_name,
@@ -1,12 +1,15 @@
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Callable
 import pymysql
 
 from app.models.tasks import Result
 from .base_comparator import BaseComparator
+from .sql_normalizer import normalize_sql
 
 
-def _get_triggers(conn: pymysql.Connection) -> Dict[str, str]:
-    """获取数据库中的所有触发器及其创建语句"""
+def _get_triggers(
+    conn: pymysql.Connection, name_filter: Callable[[str], bool] = None
+) -> Dict[str, str]:
+    """获取数据库中的所有触发器及其创建语句，name_filter 返回 False 的对象不获取"""
     triggers = {}
     with conn.cursor() as cursor:
         # 获取所有触发器
@@ -18,6 +21,8 @@ def _get_triggers(conn: pymysql.Connection) -> Dict[str, str]:
         """
         )
         for (trigger_name,) in cursor.fetchall():
+            if name_filter is not None and not name_filter(trigger_name):
+                continue
             # 获取触发器的创建语句
             cursor.execute(f"SHOW CREATE TRIGGER `{trigger_name}`")
             create_stmt = cursor.fetchone()[2]  # 第3列是创建语句
@@ -25,36 +30,64 @@ def _get_triggers(conn: pymysql.Connection) -> Dict[str, str]:
     return triggers
 
 
+def _get_trigger_fingerprints(conn: pymysql.Connection) -> Dict[str, str]:
+    """一次查询获取所有触发器的指纹，由创建时间和触发器定义计算"""
+    fingerprints = {}
+    with conn.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT
+                TRIGGER_NAME,
+                MD5(CONCAT_WS('|',
+                    CREATED, EVENT_MANIPULATION, EVENT_OBJECT_TABLE, ACTION_ORDER,
+                    ACTION_TIMING, MD5(ACTION_STATEMENT), DEFINER, SQL_MODE
+                ))
+            FROM INFORMATION_SCHEMA.TRIGGERS
+            WHERE TRIGGER_SCHEMA = DATABASE()
+        """
+        )
+        for trigger_name, fingerprint in cursor.fetchall():
+            fingerprints[trigger_name] = fingerprint
+    return fingerprints
+
+
 class TriggerComparator(BaseComparator):
     """触发器比较器"""
 
-    def _do_compare(
+    ignore_config_key = 'ignored_triggers'
+    object_kind = 'trigger'
+
+    def _get_fingerprints(self, conn: pymysql.Connection) -> Dict[str, str]:
+        """获取所有触发器的指纹"""
+        return _get_trigger_fingerprints(conn)
+
+    def fetch(
+        self,
+        conn: pymysql.Connection,
+        config: Dict[str, Any] = None,
+        name_filter: Callable[[str], bool] = None,
+    ) -> Dict[str, str]:
+        """获取单侧数据库的所有触发器定义"""
+        return _get_triggers(conn, self._name_filter(config, name_filter))
+
+    def diff(
         self,
         task_log_id: int,
-        source_conn: pymysql.Connection,
-        target_conn: pymysql.Connection,
+        source_triggers: Dict[str, str],
+        target_triggers: Dict[str, str],
         config: Dict[str, Any] = None,
     ) -> List[Result]:
         """执行触发器比较"""
-        # 获取源数据库和目标数据库的所有触发器
-        source_triggers = _get_triggers(source_conn)
-        target_triggers = _get_triggers(target_conn)
-
         results = []
 
         # 处理忽略触发器配置
-        ignored_triggers = []
-
-        if config and 'ignored_triggers' in config:
-            # 处理具体触发器名忽略
-            if 'exact' in config['ignored_triggers'] and isinstance(config['ignored_triggers']['exact'], list):
-                ignored_triggers = config['ignored_triggers']['exact']
+        is_ignored = self._ignore_filter(config)
 
         # 比较触发器
         all_trigger_names = set(source_triggers.keys()) | set(target_triggers.keys())
 
         # 过滤掉需要忽略的触发器
-        all_trigger_names = {trigger_name for trigger_name in all_trigger_names if trigger_name not in ignored_triggers}
+        all_trigger_names = {trigger_name for trigger_name in all_trigger_names if not is_ignored(trigger_name)}
 
         for trigger_name in all_trigger_names:
             if trigger_name not in source_triggers:
@@ -89,7 +122,9 @@ class TriggerComparator(BaseComparator):
                 results.append(result)
             else:
                 # 比较触发器定义
-                if source_triggers[trigger_name] != target_triggers[trigger_name]:
+                norm_source = normalize_sql(source_triggers[trigger_name])
+                norm_target = normalize_sql(target_triggers[trigger_name])
+                if norm_source != norm_target:
                     result = self._create_result(
                         task_log_id=task_log_id,
                         object_name=trigger_name,
@@ -1,12 +1,15 @@
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Callable
 import pymysql
 
 from app.models.tasks import Result
 from .base_comparator import BaseComparator
+from .sql_normalizer import normalize_sql
 
 
-def _get_views(conn: pymysql.Connection) -> Dict[str, str]:
-    """获取数据库中的所有视图及其创建语句"""
+def _get_views(
+    conn: pymysql.Connection, name_filter: Callable[[str], bool] = None
+) -> Dict[str, str]:
+    """获取数据库中的所有视图及其创建语句，name_filter 返回 False 的对象不获取"""
     views = {}
     with conn.cursor() as cursor:
         # 获取所有视图
@@ -18,6 +21,8 @@ def _get_views(conn: pymysql.Connection) -> Dict[str, str]:
         """
         )
         for (view_name,) in cursor.fetchall():
+            if name_filter is not None and not name_filter(view_name):
+                continue
             # 获取视图的创建语句
             cursor.execute(f"SHOW CREATE VIEW `{view_name}`")
             create_stmt = cursor.fetchone()[1]
@@ -25,36 +30,64 @@ def _get_views(conn: pymysql.Connection) -> Dict[str, str]:
     return views
 
 
+def _get_view_fingerprints(conn: pymysql.Connection) -> Dict[str, str]:
+    """一次查询获取所有视图的定义指纹"""
+    fingerprints = {}
+    with conn.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT
+                TABLE_NAME,
+                MD5(CONCAT_WS('|',
+                    VIEW_DEFINITION, CHECK_OPTION, DEFINER, SECURITY_TYPE,
+                    CHARACTER_SET_CLIENT, COLLATION_CONNECTION
+                ))
+            FROM INFORMATION_SCHEMA.VIEWS
+            WHERE TABLE_SCHEMA = DATABASE()
+        """
+        )
+        for view_name, fingerprint in cursor.fetchall():
+            fingerprints[view_name] = fingerprint
+    return fingerprints
+
+
 class ViewComparator(BaseComparator):
     """视图比较器"""
 
-    def _do_compare(
+    ignore_config_key = 'ignored_views'
+    object_kind = 'view'
+
+    def _get_fingerprints(self, conn: pymysql.Connection) -> Dict[str, str]:
+        """获取所有视图的指纹"""
+        return _get_view_fingerprints(conn)
+
+    def fetch(
+        self,
+        conn: pymysql.Connection,
+        config: Dict[str, Any] = None,
+        name_filter: Callable[[str], bool] = None,
+    ) -> Dict[str, str]:
+        """获取单侧数据库中的所有视图定义"""
+        return _get_views(conn, self._name_filter(config, name_filter))
+
+    def diff(
         self,
         task_log_id: int,
-        source_conn: pymysql.Connection,
-        target_conn: pymysql.Connection,
+        source_views: Dict[str, str],
+        target_views: Dict[str, str],
         config: Dict[str, Any] = None,
     ) -> List[Result]:
         """执行视图比较"""
-        # 获取源数据库和目标数据库中的所有视图
-        source_views = _get_views(source_conn)
-        target_views = _get_views(target_conn)
-
         results = []
 
         # 处理忽略视图配置
-        ignored_views = []
-
-        if config and 'ignored_views' in config:
-            # 处理具体视图名忽略
-            if 'exact' in config['ignored_views'] and isinstance(config['ignored_views']['exact'], list):
-                ignored_views = config['ignored_views']['exact']
+        is_ignored = self._ignore_filter(config)
 
         # 比较视图
         all_view_names = set(source_views.keys()) | set(target_views.keys())
 
         # 过滤掉需要忽略的视图
-        all_view_names = {view_name for view_name in all_view_names if view_name not in ignored_views}
+        all_view_names = {view_name for view_name in all_view_names if not is_ignored(view_name)}
         for view_name in all_view_names:
             if view_name not in source_views:
                 # 视图在源数据库中不存在
@@ -88,13 +121,6 @@ class ViewComparator(BaseComparator):
                 results.append(result)
             else:
                 # 比较视图定义
-                def normalize_sql(sql):
-                    import re
-                    sql = re.sub(r'/\*.*?\*/', '', sql, flags=re.DOTALL)
-                    sql = re.sub(r'--.*?$', '', sql, flags=re.MULTILINE)
-                    sql = re.sub(r'#.*?$', '', sql, flags=re.MULTILINE)
-                    sql = re.sub(r'\s+', '', sql)
-                    return sql
                 norm_source = normalize_sql(source_views[view_name])
                 norm_target = normalize_sql(target_views[view_name])
                 if norm_source != norm_target:
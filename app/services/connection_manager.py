@@ -0,0 +1,249 @@
+import queue
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+import pymysql
+
+from app.core.config import settings
+
+
+class _InstrumentedConnection(pymysql.connections.Connection):
+    """记录查询往返次数与接收字节数的连接，由所属连接池汇总"""
+
+    def __init__(self, *args, **kwargs):
+        # 建立连接时的握手也会读取数据，计数器需在父类初始化前就绪
+        self.query_count = 0
+        self.bytes_received = 0
+        super().__init__(*args, **kwargs)
+
+    def query(self, sql, unbuffered=False):
+        self.query_count += 1
+        return super().query(sql, unbuffered)
+
+    def _read_bytes(self, num_bytes):
+        data = super()._read_bytes(num_bytes)
+        self.bytes_received += len(data)
+        return data
+
+
+def _get_connection(
+    host: str, port: str, user: str, password: str, database: str
+) -> pymysql.Connection:
+    """创建数据库连接"""
+    return _InstrumentedConnection(
+        host=host,
+        port=int(port),
+        user=user,
+        password=password,
+        database=database,
+        charset="utf8mb4",
+    )
+
+
+def _connection_params(conn_obj: Any) -> Dict[str, Any]:
+    """提取连接参数，供不持有数据库会话的线程使用"""
+    return {
+        "host": conn_obj.host,
+        "port": conn_obj.port,
+        "user": conn_obj.user,
+        "password": conn_obj.password,
+        "database": conn_obj.database,
+    }
+
+
+def _close_quietly(conn: pymysql.Connection) -> None:
+    """关闭连接并忽略异常"""
+    try:
+        if hasattr(conn, 'close') and callable(conn.close):
+            conn.close()
+    except Exception:
+        pass
+
+
+class ConnectionPool:
+    """单个数据库连接配置的有界连接池，线程安全"""
+
+    def __init__(
+        self,
+        name: str,
+        params: Dict[str, Any],
+        max_size: int,
+        timeout: float,
+        ping_interval: float,
+    ):
+        self.name = name
+        self.params = params
+        self.max_size = max(1, max_size)
+        self.timeout = timeout
+        self.ping_interval = ping_interval
+
+        # 空闲连接及其最近归还时间，后进先出以便优先复用热连接
+        self._idle: "queue.LifoQueue[tuple[pymysql.Connection, float]]" = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(self.max_size)
+        self._lock = threading.Lock()
+        self._closed = False
+
+        # 统计指标
+        self._created = 0
+        self._checkouts = 0
+        self._ping_failures = 0
+        self._in_use = 0
+        self._peak_in_use = 0
+        self._wait_seconds = 0.0
+        self._max_wait_seconds = 0.0
+        # 本池创建过的所有连接，用于汇总查询次数与接收字节数；连接池只在单次运行内存在
+        self._connections: List[pymysql.Connection] = []
+
+    def acquire(self) -> pymysql.Connection:
+        """借出一个可用连接，池满时最多等待 timeout 秒"""
+        if self._closed:
+            raise RuntimeError(f"连接池 {self.name} 已关闭")
+
+        start = time.perf_counter()
+        if not self._slots.acquire(timeout=self.timeout):
+            raise TimeoutError(f"等待连接池 {self.name} 的空闲连接超时（{self.timeout} 秒）")
+        waited = time.perf_counter() - start
+
+        try:
+            conn = self._take_idle()
+            if conn is None:
+                conn = _get_connection(**self.params)
+                with self._lock:
+                    self._created += 1
+                    self._connections.append(conn)
+        except Exception:
+            self._slots.release()
+            raise
+
+        with self._lock:
+            self._checkouts += 1
+            self._wait_seconds += waited
+            self._max_wait_seconds = max(self._max_wait_seconds, waited)
+            self._in_use += 1
+            self._peak_in_use = max(self._peak_in_use, self._in_use)
+        return conn
+
+    def release(self, conn: pymysql.Connection, discard: bool = False) -> None:
+        """归还连接；出错的连接应以 discard=True 归还，直接关闭不再复用"""
+        with self._lock:
+            self._in_use -= 1
+        if discard or self._closed:
+            _close_quietly(conn)
+        else:
+            self._idle.put((conn, time.monotonic()))
+        self._slots.release()
+
+    @contextmanager
+    def connection(self) -> Iterator[pymysql.Connection]:
+        """以上下文方式借用连接"""
+        conn = self.acquire()
+        try:
+            yield conn
+        except Exception:
+            self.release(conn, discard=True)
+            raise
+        else:
+            self.release(conn)
+
+    def _take_idle(self) -> Optional[pymysql.Connection]:
+        """取出一个健康的空闲连接，空闲过久的连接先 ping 检查"""
+        while True:
+            try:
+                conn, released_at = self._idle.get_nowait()
+            except queue.Empty:
+                return None
+            if time.monotonic() - released_at < self.ping_interval:
+                return conn
+            try:
+                conn.ping(reconnect=False)
+                return conn
+            except Exception:
+                with self._lock:
+                    self._ping_failures += 1
+                _close_quietly(conn)
+
+    def close(self) -> None:
+        """关闭池内所有空闲连接"""
+        self._closed = True
+        while True:
+            try:
+                conn, _ = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            _close_quietly(conn)
+
+    def stats(self) -> Dict[str, Any]:
+        """返回连接池的借出、等待、查询往返次数与接收字节数统计"""
+        with self._lock:
+            return {
+                "max_size": self.max_size,
+                "created": self._created,
+                "checkouts": self._checkouts,
+                "ping_failures": self._ping_failures,
+                "peak_in_use": self._peak_in_use,
+                "wait_seconds": round(self._wait_seconds, 4),
+                "max_wait_seconds": round(self._max_wait_seconds, 4),
+                "queries": sum(getattr(conn, "query_count", 0) for conn in self._connections),
+                "bytes_received": sum(
+                    getattr(conn, "bytes_received", 0) for conn in self._connections
+                ),
+            }
+
+
+class ConnectionManager:
+    """
+    单次对比运行内共享的连接管理器。
+    每个 Connection 记录对应一个有界连接池，所有比较器共用，
+    密码只在登记时解密一次。
+    """
+
+    def __init__(
+        self,
+        pool_size: Optional[int] = None,
+        timeout: Optional[float] = None,
+        ping_interval: Optional[float] = None,
+    ):
+        self.pool_size = pool_size or settings.CONNECTION_POOL_SIZE
+        self.timeout = timeout if timeout is not None else settings.CONNECTION_POOL_TIMEOUT
+        self.ping_interval = (
+            ping_interval if ping_interval is not None else settings.CONNECTION_POOL_PING_INTERVAL
+        )
+        self._pools: Dict[Any, ConnectionPool] = {}
+        self._lock = threading.Lock()
+
+    def pool(self, conn_obj: Any) -> ConnectionPool:
+        """获取（必要时创建）Connection 记录对应的连接池，需在持有 ORM 会话的线程调用"""
+        key = conn_obj.id
+        with self._lock:
+            pool = self._pools.get(key)
+            if pool is None:
+                pool = ConnectionPool(
+                    name=f"{conn_obj.name}({conn_obj.host}:{conn_obj.port}/{conn_obj.database})",
+                    params=_connection_params(conn_obj),
+                    max_size=self.pool_size,
+                    timeout=self.timeout,
+                    ping_interval=self.ping_interval,
+                )
+                self._pools[key] = pool
+            return pool
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """按连接池名称汇总统计"""
+        with self._lock:
+            return {pool.name: pool.stats() for pool in self._pools.values()}
+
+    def close(self) -> None:
+        """关闭所有连接池"""
+        with self._lock:
+            pools = list(self._pools.values())
+            self._pools.clear()
+        for pool in pools:
+            pool.close()
+
+    def __enter__(self) -> "ConnectionManager":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
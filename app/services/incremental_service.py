@@ -0,0 +1,176 @@
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+from sqlalchemy import insert, literal, select
+from sqlalchemy.orm import Session
+
+from app.models.base import get_now_in_east8
+from app.models.tasks import (
+    ObjectFingerprint,
+    Result,
+    ResultType,
+    Task,
+    TaskLog,
+    TaskStatus,
+)
+
+# 沿用上次结果时每条 INSERT ... SELECT 覆盖的对象数
+_CARRY_FORWARD_BATCH_SIZE = 500
+
+Fingerprints = Dict[str, Tuple[Optional[str], Optional[str]]]
+
+
+class IncrementalState:
+    """
+    单次增量运行的指纹状态。
+    previous 为上一次成功运行记录的指纹，current 为本次采集的指纹，
+    unchanged 为两侧指纹都与上次一致、可直接沿用上次结果的对象。
+    各比较阶段只读写自己类型的条目，可在并行线程中共用。
+    """
+
+    def __init__(
+        self,
+        previous_log_id: Optional[int],
+        previous: Dict[ResultType, Fingerprints],
+    ):
+        self.previous_log_id = previous_log_id
+        self.previous = previous
+        self.current: Dict[ResultType, Fingerprints] = {}
+        self.unchanged: Dict[ResultType, Set[str]] = {}
+
+    def plan(
+        self,
+        type: ResultType,
+        source_fingerprints: Dict[str, str],
+        target_fingerprints: Dict[str, str],
+        is_ignored: Callable[[str], bool],
+    ) -> Set[str]:
+        """记录本次指纹，返回两侧均未变化、无需重新获取和比较的对象名"""
+        previous = self.previous.get(type, {})
+        current = {}
+        unchanged = set()
+        for name in set(source_fingerprints) | set(target_fingerprints):
+            if is_ignored(name):
+                continue
+            fingerprint = (source_fingerprints.get(name), target_fingerprints.get(name))
+            current[name] = fingerprint
+            if previous.get(name) == fingerprint:
+                unchanged.add(name)
+
+        self.current[type] = current
+        self.unchanged[type] = unchanged
+        return unchanged
+
+
+class IncrementalComparisonService:
+    """增量比较：加载上次成功运行的指纹，保存本次指纹并沿用未变化对象的结果"""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def load_state(self, task: Task, task_log_id: int) -> IncrementalState:
+        """以该任务最近一次成功完成的运行为基线"""
+        previous_log = (
+            self.db.query(TaskLog)
+            .filter(
+                TaskLog.task_id == task.id,
+                TaskLog.id != task_log_id,
+                TaskLog.status == TaskStatus.COMPLETED,
+            )
+            .order_by(TaskLog.id.desc())
+            .first()
+        )
+        if not previous_log:
+            return IncrementalState(None, {})
+
+        previous: Dict[ResultType, Fingerprints] = {}
+        rows = self.db.execute(
+            select(
+                ObjectFingerprint.type,
+                ObjectFingerprint.object_name,
+                ObjectFingerprint.source_fingerprint,
+                ObjectFingerprint.target_fingerprint,
+            ).where(ObjectFingerprint.task_log_id == previous_log.id)
+        )
+        for type, object_name, source_fingerprint, target_fingerprint in rows:
+            previous.setdefault(type, {})[object_name] = (
+                source_fingerprint,
+                target_fingerprint,
+            )
+        return IncrementalState(previous_log.id, previous)
+
+    def save_state(self, task: Task, task_log_id: int, state: IncrementalState) -> int:
+        """保存本次指纹，并把未变化对象的上次结果复制到本次运行，返回沿用的对象数"""
+        rows = [
+            {
+                "task_id": task.id,
+                "task_log_id": task_log_id,
+                "type": type,
+                "object_name": name,
+                "source_fingerprint": source_fingerprint,
+                "target_fingerprint": target_fingerprint,
+            }
+            for type, fingerprints in state.current.items()
+            for name, (source_fingerprint, target_fingerprint) in fingerprints.items()
+        ]
+        if rows:
+            self.db.execute(insert(ObjectFingerprint), rows)
+
+        carried = 0
+        if state.previous_log_id is not None:
+            for type, names in state.unchanged.items():
+                carried += self._carry_forward_results(
+                    state.previous_log_id, task_log_id, type, sorted(names)
+                )
+
+        self.db.commit()
+        return carried
+
+    def _carry_forward_results(
+        self, previous_log_id: int, task_log_id: int, type: ResultType, names: List[str]
+    ) -> int:
+        """在数据库端用 INSERT ... SELECT 复制上次结果，不经过应用层；定义只复制内容哈希"""
+        now = get_now_in_east8()
+        carried = 0
+        for i in range(0, len(names), _CARRY_FORWARD_BATCH_SIZE):
+            batch = names[i:i + _CARRY_FORWARD_BATCH_SIZE]
+            source = select(
+                literal(task_log_id),
+                Result.type,
+                Result.object_name,
+                Result.has_differences,
+                Result.source_definition_inline,
+                Result.target_definition_inline,
+                Result.source_definition_hash,
+                Result.target_definition_hash,
+                Result.difference_details,
+                Result.change_sql,
+                literal(now),
+                literal(now),
+                literal(False),
+            ).where(
+                Result.task_log_id == previous_log_id,
+                Result.type == type,
+                Result.object_name.in_(batch),
+            )
+            result = self.db.execute(
+                insert(Result).from_select(
+                    [
+                        "task_log_id",
+                        "type",
+                        "object_name",
+                        "has_differences",
+                        "source_definition",
+                        "target_definition",
+                        "source_definition_hash",
+                        "target_definition_hash",
+                        "difference_details",
+                        "change_sql",
+                        "created_at",
+                        "updated_at",
+                        "deleted",
+                    ],
+                    source,
+                )
+            )
+            carried += result.rowcount or 0
+        return carried
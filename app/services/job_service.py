@@ -0,0 +1,318 @@
+import os
+import socket
+import threading
+from contextlib import contextmanager
+from datetime import timedelta
+from typing import Callable, Iterator, List, Optional, Set
+
+from sqlalchemy import func, select, text, update
+from sqlalchemy.orm import Session, aliased
+
+from app.core.config import settings
+from app.database import SessionLocal
+from app.models.base import get_now_in_east8
+from app.models.jobs import Job, JobStatus
+from app.models.tasks import Task, TaskLog, TaskStatus
+from app.services.task_service import DatabaseComparisonService
+
+# 启用全局并发上限时，串行化各 worker 领取操作的 MySQL 命名锁
+_CLAIM_LOCK_NAME = "dbcapture_job_claim"
+
+
+class JobQueueService:
+    """基于元数据库的持久化执行队列，多个 worker 通过 FOR UPDATE SKIP LOCKED 互斥领取"""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def enqueue(self, task_id: int) -> Job:
+        """提交任务执行，同一任务已有排队中的执行时直接返回该执行"""
+        job = (
+            self.db.query(Job)
+            .filter(Job.task_id == task_id, Job.status == JobStatus.QUEUED)
+            .first()
+        )
+        if job:
+            return job
+
+        # 入队时即创建执行日志，执行前在日志列表中显示为 pending
+        task_log = TaskLog(task_id=task_id, status=TaskStatus.PENDING)
+        self.db.add(task_log)
+        self.db.flush()
+
+        job = Job(task_id=task_id, task_log_id=task_log.id, status=JobStatus.QUEUED)
+        self.db.add(job)
+        self.db.commit()
+        self.db.refresh(job)
+        return job
+
+    def claim(self, worker_id: str) -> Optional[Job]:
+        """
+        领取最早排队的一条执行，已被其他 worker 锁定的行直接跳过；
+        同一任务已有执行中的记录时不领取，配置了全局并发上限时达到上限不领取
+        """
+        limit = settings.JOB_GLOBAL_CONCURRENCY
+        if limit <= 0:
+            return self._claim_next(worker_id)
+        with self._claim_lock():
+            running = (
+                self.db.query(func.count(Job.id))
+                .filter(Job.status == JobStatus.RUNNING)
+                .scalar()
+            )
+            if running >= limit:
+                self.db.rollback()
+                return None
+            return self._claim_next(worker_id)
+
+    @contextmanager
+    def _claim_lock(self) -> Iterator[None]:
+        """
+        全局并发上限需要“计数 + 领取”原子执行，MySQL 下用独立连接持有命名锁串行化各 worker 的领取，
+        其他数据库不加锁
+        """
+        bind = self.db.get_bind()
+        if bind.dialect.name != "mysql":
+            yield
+            return
+        with bind.connect() as lock_conn:
+            acquired = lock_conn.execute(
+                text("SELECT GET_LOCK(:name, :timeout)"),
+                {"name": _CLAIM_LOCK_NAME, "timeout": settings.JOB_POLL_INTERVAL},
+            ).scalar()
+            if not acquired:
+                raise TimeoutError("等待队列领取锁超时")
+            try:
+                yield
+            finally:
+                lock_conn.execute(text("SELECT RELEASE_LOCK(:name)"), {"name": _CLAIM_LOCK_NAME})
+
+    def _claim_next(self, worker_id: str) -> Optional[Job]:
+        running = aliased(Job)
+        running_tasks = select(running.task_id).where(running.status == JobStatus.RUNNING)
+        job = (
+            self.db.query(Job)
+            .filter(
+                Job.status == JobStatus.QUEUED,
+                Job.deleted == False,
+                Job.task_id.notin_(running_tasks),
+            )
+            .order_by(Job.id)
+            .with_for_update(skip_locked=True, of=Job)
+            .first()
+        )
+        if not job:
+            # 结束只读事务，释放快照
+            self.db.rollback()
+            return None
+
+        now = get_now_in_east8()
+        job.status = JobStatus.RUNNING
+        job.worker_id = worker_id
+        job.attempts += 1
+        job.started_at = now
+        job.heartbeat_at = now
+        job.error_message = None
+        self.db.commit()
+        return job
+
+    def heartbeat(self, worker_id: str, job_ids: List[int]) -> None:
+        """刷新本 worker 正在执行的任务心跳"""
+        if not job_ids:
+            return
+        self.db.execute(
+            update(Job)
+            .where(
+                Job.id.in_(job_ids),
+                Job.worker_id == worker_id,
+                Job.status == JobStatus.RUNNING,
+            )
+            .values(heartbeat_at=get_now_in_east8())
+        )
+        self.db.commit()
+
+    def finish(self, job: Job, task_log: TaskLog) -> None:
+        """按执行日志的最终状态结束队列任务"""
+        failed = task_log is None or task_log.status == TaskStatus.FAILED
+        job.status = JobStatus.FAILED if failed else JobStatus.COMPLETED
+        job.error_message = task_log.error_message if task_log is not None else None
+        job.finished_at = get_now_in_east8()
+        self.db.commit()
+
+    def fail(self, job: Job, error: str) -> None:
+        """执行过程抛出未处理异常时结束队列任务"""
+        job.status = JobStatus.FAILED
+        job.error_message = error[:500]
+        job.finished_at = get_now_in_east8()
+        self.db.commit()
+
+    def recover_orphans(self) -> int:
+        """
+        回收心跳超时的执行：原执行日志标记为失败，未超过重试次数的重新排队，
+        同时把没有存活执行对应、长时间停留在 RUNNING 的执行日志标记为失败。返回回收条数
+        """
+        deadline = get_now_in_east8() - timedelta(seconds=settings.JOB_HEARTBEAT_TIMEOUT)
+        message = "执行进程中断，心跳超时"
+
+        stale_jobs = (
+            self.db.query(Job)
+            .filter(Job.status == JobStatus.RUNNING, Job.heartbeat_at < deadline)
+            .with_for_update(skip_locked=True)
+            .all()
+        )
+        for job in stale_jobs:
+            task_log = self.db.query(TaskLog).get(job.task_log_id) if job.task_log_id else None
+            if task_log is not None and task_log.status in (TaskStatus.PENDING, TaskStatus.RUNNING):
+                task_log.status = TaskStatus.FAILED
+                task_log.error_message = message
+
+            if job.attempts < settings.JOB_MAX_ATTEMPTS:
+                # 重新排队，新的尝试使用新的执行日志，避免与中断时写入的部分结果混在一起
+                retry_log = TaskLog(task_id=job.task_id, status=TaskStatus.PENDING)
+                self.db.add(retry_log)
+                self.db.flush()
+                job.task_log_id = retry_log.id
+                job.status = JobStatus.QUEUED
+                job.worker_id = None
+                job.heartbeat_at = None
+                print(f"执行 {job.id} 心跳超时，重新排队（第 {job.attempts} 次执行中断）")
+            else:
+                job.status = JobStatus.FAILED
+                job.error_message = message
+                job.finished_at = get_now_in_east8()
+                task = self.db.query(Task).get(job.task_id)
+                if task is not None and task.status == TaskStatus.RUNNING:
+                    task.status = TaskStatus.FAILED
+                print(f"执行 {job.id} 心跳超时且已达到最大执行次数，标记为失败")
+
+        # 没有排队中或执行中的队列任务引用、且已超时的 RUNNING 日志
+        live_logs = select(Job.task_log_id).where(
+            Job.status.in_([JobStatus.QUEUED, JobStatus.RUNNING]),
+            Job.task_log_id.isnot(None),
+        )
+        orphan_logs = (
+            self.db.query(TaskLog)
+            .filter(
+                TaskLog.status == TaskStatus.RUNNING,
+                TaskLog.created_at < deadline,
+                TaskLog.id.notin_(live_logs),
+            )
+            .all()
+        )
+        for task_log in orphan_logs:
+            task_log.status = TaskStatus.FAILED
+            task_log.error_message = message
+
+        self.db.commit()
+        return len(stale_jobs) + len(orphan_logs)
+
+
+class JobWorker:
+    """
+    队列 worker：按配置的并发数启动执行线程，各自领取并执行比较任务；
+    心跳线程定期刷新执行中任务的心跳，并回收其他 worker 遗留的超时任务。
+    """
+
+    def __init__(
+        self,
+        concurrency: int = None,
+        poll_interval: float = None,
+        session_factory: Callable[[], Session] = SessionLocal,
+    ):
+        self.concurrency = max(1, concurrency or settings.JOB_WORKER_CONCURRENCY)
+        self.poll_interval = poll_interval or settings.JOB_POLL_INTERVAL
+        self.session_factory = session_factory
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+
+        self._stop = threading.Event()
+        # 所有执行线程退出后才停止心跳，避免停机期间执行中的任务被误判为中断
+        self._done = threading.Event()
+        self._running: Set[int] = set()
+        self._lock = threading.Lock()
+
+    def run(self) -> None:
+        """启动执行线程和心跳线程，阻塞直到 stop() 被调用且执行中的任务结束"""
+        print(f"worker {self.worker_id} 启动，并发数：{self.concurrency}")
+        self._recover_orphans()
+
+        threads = [
+            threading.Thread(target=self._heartbeat_loop, name="job-heartbeat", daemon=True)
+        ]
+        threads += [
+            threading.Thread(target=self._slot_loop, name=f"job-slot-{i}")
+            for i in range(self.concurrency)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads[1:]:
+            thread.join()
+        self._done.set()
+        print(f"worker {self.worker_id} 已停止")
+
+    def stop(self) -> None:
+        """停止领取新任务，执行中的任务完成后退出"""
+        self._stop.set()
+
+    def _slot_loop(self) -> None:
+        """单个执行线程：领取一条任务并执行，队列为空时等待轮询间隔"""
+        while not self._stop.is_set():
+            try:
+                executed = self._run_next()
+            except Exception as e:
+                print(f"领取或执行队列任务失败：{e}")
+                executed = False
+            if not executed:
+                self._stop.wait(self.poll_interval)
+
+    def _run_next(self) -> bool:
+        """领取并执行一条任务，队列为空时返回 False"""
+        db = self.session_factory()
+        try:
+            queue = JobQueueService(db)
+            job = queue.claim(self.worker_id)
+            if job is None:
+                return False
+
+            with self._lock:
+                self._running.add(job.id)
+            print(f"worker {self.worker_id} 领取执行 {job.id}（任务 {job.task_id}）")
+            try:
+                task_log = DatabaseComparisonService(db).run_comparison(
+                    job.task_id, job.task_log_id
+                )
+                queue.finish(job, task_log)
+            except Exception as e:
+                db.rollback()
+                queue.fail(job, str(e))
+            finally:
+                with self._lock:
+                    self._running.discard(job.id)
+            return True
+        finally:
+            db.close()
+
+    def _heartbeat_loop(self) -> None:
+        """定期刷新心跳并回收超时任务"""
+        while not self._done.wait(settings.JOB_HEARTBEAT_INTERVAL):
+            with self._lock:
+                job_ids = list(self._running)
+            db = self.session_factory()
+            try:
+                JobQueueService(db).heartbeat(self.worker_id, job_ids)
+            except Exception as e:
+                print(f"刷新队列任务心跳失败：{e}")
+            finally:
+                db.close()
+            if not self._stop.is_set():
+                self._recover_orphans()
+
+    def _recover_orphans(self) -> None:
+        db = self.session_factory()
+        try:
+            recovered = JobQueueService(db).recover_orphans()
+            if recovered:
+                print(f"已回收 {recovered} 条中断的执行")
+        except Exception as e:
+            print(f"回收中断的执行失败：{e}")
+        finally:
+            db.close()
@@ -1,10 +1,17 @@
+import gzip
 import os
 from datetime import datetime
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterator, TextIO
 from jinja2 import Environment, FileSystemLoader
+from sqlalchemy import Row, case, func, select, tuple_
+from sqlalchemy.orm import Session, object_session
 
 from app.core.config import settings
-from app.models.tasks import Result, TaskLog
+from app.models.connections import Connection
+from app.models.tasks import Result, ResultType, TaskLog
+
+# 模板流式渲染时累积多少个片段再写入文件
+_STREAM_BUFFER_SIZE = 64
 
 
 class ReportService:
@@ -27,22 +34,30 @@ class ReportService:
         return reports
 
     def generate_html_report(self, task_log: TaskLog) -> Dict[str, Any]:
-        """生成HTML报告"""
+        """生成HTML报告，按类型分页读取结果并边渲染边写入文件"""
         template = self.env.get_template("report.html")
 
-        # 准备报告数据
+        # 准备报告数据，结果列表是惰性分页的迭代器
         report_data = self._prepare_report_data(task_log)
 
-        # 生成HTML内容
-        html_content = template.render(**report_data)
-
-        # 保存HTML文件
+        # 保存HTML文件，先写临时文件，渲染完成后再替换，避免留下半份报告；
+        # 开启压缩时边渲染边写入 gzip，由 /reports 接口按客户端是否支持 gzip 返回
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         filename = f"comparison_report_{task_log.id}_{timestamp}.html"
+        if settings.REPORT_COMPRESSION:
+            filename += ".gz"
         file_path = os.path.join(self.output_dir, filename)
-
-        with open(file_path, "w", encoding="utf-8") as f:
-            f.write(html_content)
+        tmp_path = f"{file_path}.tmp"
+
+        try:
+            with self._open_report(tmp_path) as f:
+                stream = template.stream(**report_data)
+                stream.enable_buffering(_STREAM_BUFFER_SIZE)
+                stream.dump(f)
+            os.replace(tmp_path, file_path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
 
         # 创建报告记录
         return {
@@ -51,76 +66,134 @@ class ReportService:
             "file_path": file_path,
         }
 
+    def _open_report(self, path: str) -> TextIO:
+        """以文本方式打开报告文件，开启压缩时写入 gzip"""
+        if settings.REPORT_COMPRESSION:
+            return gzip.open(
+                path, "wt", encoding="utf-8", compresslevel=settings.REPORT_COMPRESSION_LEVEL
+            )
+        return open(path, "w", encoding="utf-8")
+
     def _prepare_report_data(self, task_log: TaskLog) -> Dict[str, Any]:
         """准备报告数据"""
         task = task_log.task
-        results = self._get_results(task_log)
+        db = object_session(task_log)
+        summary = self._generate_summary(db, task_log.id)
 
         # 获取数据库连接信息
         source_conn = task.source_conn
-        target_conn = task.target_conn
+        target_conns = [task.target_conn]
+        targets = {}
+        if task.target_conn_ids:
+            # 多目标比较：汇总报告中按目标库标注每条差异
+            conns = {
+                conn.id: conn
+                for conn in db.query(Connection).filter(Connection.id.in_(task.target_conn_ids))
+            }
+            target_conns = [conns[conn_id] for conn_id in task.target_conn_ids if conn_id in conns]
+            targets = {conn.id: conn.name for conn in target_conns}
+            summary["differences_by_target"] = self._summarize_targets(db, task_log.id, targets)
 
         return {
             "task": {
                 "id": task.id,
                 "source_database": f"{source_conn.host}:{source_conn.port}/{source_conn.database}",
-                "target_database": f"{target_conn.host}:{target_conn.port}/{target_conn.database}",
+                "target_database": ", ".join(
+                    f"{conn.host}:{conn.port}/{conn.database}" for conn in target_conns
+                ),
                 "status": task_log.status.value,
                 "created_at": task_log.created_at.strftime("%Y-%m-%d %H:%M:%S"),
                 "error_message": task_log.error_message,
             },
-            "results": self._group_results_by_type(results),
-            "summary": self._generate_summary(results),
+            "results": self._group_results_by_type(db, task_log.id, summary),
+            "summary": summary,
+            "targets": targets,
         }
 
-    def _get_results(self, task_log: TaskLog) -> List[Result]:
-        # 获取该日志下所有比对结果
-        return task_log.results if hasattr(task_log, "results") else []
-
     def _group_results_by_type(
-        self, results: List[Result]
-    ) -> Dict[str, List[Dict[str, Any]]]:
-        """按类型分组比较结果"""
-        grouped_results = {
-            "config": [],
-            "table": [],
-            "view": [],
-            "procedure": [],
-            "function": [],
-            "trigger": [],
+        self, db: Session, task_log_id: int, summary: Dict[str, Any]
+    ) -> Dict[str, Iterator[Row]]:
+        """按类型返回有差异结果的分页迭代器，没有任何对象的类型不出现在报告中"""
+        return {
+            type.value: self._iter_differences(db, task_log_id, type)
+            for type in ResultType
+            if summary["objects_by_type"][type.value] > 0
         }
 
-        for result in results:
-            result_dict = {
-                "object_name": result.object_name,
-                "has_differences": result.has_differences,
-                "source_definition": result.source_definition,
-                "target_definition": result.target_definition,
-                "difference_details": result.difference_details,
-                "change_sql": result.change_sql,
-            }
-            grouped_results[result.type.value].append(result_dict)
-
-        return grouped_results
-
-    def _generate_summary(self, results: List[Result]) -> Dict[str, int]:
-        """生成比较结果摘要"""
+    def _iter_differences(
+        self, db: Session, task_log_id: int, type: ResultType
+    ) -> Iterator[Row]:
+        """
+        按 (object_name, id) 键集分页读取某类型的有差异结果。
+        报告不展示对象定义，只查询渲染需要的列，每页用完即释放
+        """
+        last_name, last_id = None, None
+        while True:
+            query = (
+                select(
+                    Result.id,
+                    Result.object_name,
+                    Result.target_conn_id,
+                    Result.has_differences,
+                    Result.difference_details,
+                    Result.change_sql,
+                )
+                .where(
+                    Result.task_log_id == task_log_id,
+                    Result.type == type,
+                    Result.has_differences.is_(True),
+                )
+                .order_by(Result.object_name, Result.id)
+                .limit(settings.REPORT_PAGE_SIZE)
+            )
+            if last_name is not None:
+                query = query.where(
+                    tuple_(Result.object_name, Result.id) > tuple_(last_name, last_id)
+                )
+            rows = db.execute(query).all()
+            yield from rows
+            if len(rows) < settings.REPORT_PAGE_SIZE:
+                return
+            last_name, last_id = rows[-1].object_name, rows[-1].id
+
+    def _generate_summary(self, db: Session, task_log_id: int) -> Dict[str, Any]:
+        """在数据库端按类型汇总对象数与差异数，生成比较结果摘要"""
         summary = {
-            "total_objects": len(results),
+            "total_objects": 0,
             "total_differences": 0,
-            "differences_by_type": {
-                "config": 0,
-                "table": 0,
-                "view": 0,
-                "procedure": 0,
-                "function": 0,
-                "trigger": 0,
-            },
+            "objects_by_type": {type.value: 0 for type in ResultType},
+            "differences_by_type": {type.value: 0 for type in ResultType},
         }
 
-        for result in results:
-            if result.has_differences:
-                summary["total_differences"] += 1
-                summary["differences_by_type"][result.type.value] += 1
+        rows = db.execute(
+            select(
+                Result.type,
+                func.count(Result.id),
+                func.sum(case((Result.has_differences.is_(True), 1), else_=0)),
+            )
+            .where(Result.task_log_id == task_log_id)
+            .group_by(Result.type)
+        )
+        for type, objects, differences in rows:
+            differences = int(differences or 0)
+            summary["total_objects"] += objects
+            summary["total_differences"] += differences
+            summary["objects_by_type"][type.value] = objects
+            summary["differences_by_type"][type.value] = differences
 
         return summary
+
+    def _summarize_targets(
+        self, db: Session, task_log_id: int, targets: Dict[int, str]
+    ) -> Dict[str, int]:
+        """多目标比较时按目标库汇总差异数，按目标库列表顺序返回 {目标库名称: 差异数}"""
+        rows = db.execute(
+            select(Result.target_conn_id, func.count(Result.id))
+            .where(
+                Result.task_log_id == task_log_id,
+                Result.has_differences.is_(True),
+            )
+            .group_by(Result.target_conn_id)
+        )
+        counts = dict(rows.all())
+        return {name: counts.get(conn_id, 0) for conn_id, name in targets.items()}
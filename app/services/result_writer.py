@@ -0,0 +1,74 @@
+import time
+from typing import Any, Dict, List
+
+from sqlalchemy import inspect, insert
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.definitions import store_definitions
+from app.models.tasks import Result
+
+
+def _result_row(result: Result) -> Dict[str, Any]:
+    """把未保存的 Result 对象转换为 INSERT 参数，未赋值的列按列默认值补齐"""
+    state = result.__dict__
+    row = {}
+    for attr in inspect(Result).column_attrs:
+        column = attr.columns[0]
+        if column.primary_key:
+            continue
+        if attr.key in state:
+            row[column.key] = state[attr.key]
+        elif column.default is not None:
+            # 每行键集合一致才能合并为 executemany，默认值在这里显式计算
+            default = column.default.arg
+            row[column.key] = default(None) if column.default.is_callable else default
+        else:
+            row[column.key] = None
+    return row
+
+
+class ResultWriter:
+    """
+    比较结果批量写入器。
+    绕过 ORM 工作单元，按批执行多行 INSERT 并逐批提交，
+    同时按阶段累计写入行数与耗时，供运行统计使用。
+    """
+
+    def __init__(self, db: Session, batch_size: int = None):
+        self.db = db
+        self.batch_size = max(1, batch_size or settings.RESULT_BATCH_SIZE)
+        self.stats: Dict[str, Dict[str, Any]] = {}
+
+    def write(
+        self, results: List[Result], phase: str = None, return_ids: bool = False
+    ) -> List[Result]:
+        """
+        批量保存结果并提交，返回传入的结果列表。
+        只有 return_ids=True 时才走 ORM 插入以回填自增 ID，否则结果对象保持未持久化状态。
+        """
+        start = time.perf_counter()
+        for i in range(0, len(results), self.batch_size):
+            batch = results[i:i + self.batch_size]
+            if return_ids:
+                self.db.add_all(batch)
+                self.db.flush()
+            else:
+                self._insert_batch(batch)
+            self.db.commit()
+
+        if phase:
+            stat = self.stats.setdefault(phase, {"rows": 0, "seconds": 0.0})
+            stat["rows"] += len(results)
+            stat["seconds"] = round(stat["seconds"] + time.perf_counter() - start, 4)
+        return results
+
+    def _insert_batch(self, batch: List[Result]) -> None:
+        """先写入本批引用的定义内容，再以 executemany 插入结果行"""
+        definitions: Dict[str, str] = {}
+        for result in batch:
+            pending = result.__dict__.get("_pending_definitions")
+            if pending:
+                definitions.update(pending)
+        store_definitions(self.db, definitions)
+        self.db.execute(insert(Result.__table__), [_result_row(result) for result in batch])
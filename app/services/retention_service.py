@@ -0,0 +1,355 @@
+import hashlib
+import json
+import os
+import re
+import time
+import traceback
+from dataclasses import dataclass, field
+from datetime import timedelta
+from typing import List, Set
+
+from sqlalchemy import delete, exists, literal, select, update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.database import SessionLocal
+from app.models.base import get_now_in_east8
+from app.models.definitions import definition_hash
+from app.models.jobs import Job, JobStatus
+from app.models.tasks import ObjectFingerprint, Result, Task, TaskLog, TaskStatus
+
+# 报告文件名：comparison_report_<任务日志ID>_<时间戳>.html，可能带压缩或临时文件后缀
+_REPORT_FILE_RE = re.compile(r"^comparison_report_(\d+)_\d{8}_\d{6}\.html")
+
+# 未结束的运行不参与清理和压缩
+_ACTIVE_STATUSES = (TaskStatus.PENDING, TaskStatus.RUNNING)
+
+
+@dataclass
+class RetentionPolicy:
+    """
+    单个任务的保留策略：保留最近 keep_runs 次运行或最近 keep_days 天内的运行（满足其一即保留），
+    keep_differences 为真时有差异的运行始终保留；compact 为真时把结果完全相同的相邻运行压缩为引用
+    """
+
+    keep_runs: int
+    keep_days: int
+    keep_differences: bool = True
+    compact: bool = False
+
+    @classmethod
+    def for_task(cls, task: Task) -> "RetentionPolicy":
+        """读取任务配置 retention 节，未配置或取值无效的项使用全局默认值"""
+        config = (task.config or {}).get("retention")
+        config = config if isinstance(config, dict) else {}
+
+        def number(key: str, default: int) -> int:
+            value = config.get(key)
+            return value if isinstance(value, int) and value >= 0 else default
+
+        def flag(key: str, default: bool) -> bool:
+            value = config.get(key)
+            return value if isinstance(value, bool) else default
+
+        return cls(
+            keep_runs=number("keep_runs", settings.RETENTION_KEEP_RUNS),
+            keep_days=number("keep_days", settings.RETENTION_KEEP_DAYS),
+            keep_differences=flag("keep_differences", True),
+            compact=flag("compact", settings.RETENTION_COMPACT),
+        )
+
+
+@dataclass
+class RetentionStats:
+    """一次清理的统计"""
+
+    deleted_logs: int = 0
+    deleted_results: int = 0
+    compacted_logs: int = 0
+    deleted_reports: int = 0
+    errors: List[str] = field(default_factory=list)
+
+
+class RetentionError(RuntimeError):
+    """部分任务清理失败，已完成任务的统计保存在 stats 中"""
+
+    def __init__(self, message: str, stats: RetentionStats):
+        super().__init__(message)
+        self.stats = stats
+
+
+class RetentionService:
+    """
+    任务日志、比较结果和报告文件的保留与压缩。
+    按任务的保留策略删除过期运行，子表按批删除并逐批提交，避免长时间持有锁；
+    最近一次成功的运行是增量比较的基线，始终保留
+    """
+
+    def __init__(self, db: Session, batch_size: int = None):
+        self.db = db
+        self.batch_size = max(1, batch_size or settings.RETENTION_BATCH_SIZE)
+        self.stats = RetentionStats()
+
+    def run(self) -> RetentionStats:
+        """
+        对所有任务执行保留策略，最后清理没有对应日志的报告文件。
+        单个任务失败不影响其他任务，全部执行后有失败时抛出 RetentionError，原始异常作为其 __cause__
+        """
+        task_ids = self.db.execute(select(Task.id).order_by(Task.id)).scalars().all()
+        first_error = None
+        for task_id in task_ids:
+            try:
+                self.apply(self.db.get(Task, task_id))
+            except Exception as e:
+                self.db.rollback()
+                traceback.print_exc()
+                self.stats.errors.append(f"任务 {task_id}：{e!r}")
+                first_error = first_error or e
+        self.purge_orphan_reports()
+        if self.stats.errors:
+            raise RetentionError(
+                f"{len(self.stats.errors)} 项清理失败：{'；'.join(self.stats.errors)}", self.stats
+            ) from first_error
+        return self.stats
+
+    def apply(self, task: Task) -> None:
+        """对单个任务先压缩相同的运行，再删除超出保留范围的运行"""
+        policy = RetentionPolicy.for_task(task)
+        if policy.compact:
+            self.compact(task.id)
+
+        expired = self._expired_log_ids(task.id, policy)
+        for i in range(0, len(expired), self.batch_size):
+            self._delete_logs(expired[i:i + self.batch_size])
+
+    def _expired_log_ids(self, task_id: int, policy: RetentionPolicy) -> List[int]:
+        """返回超出保留范围、可以删除的任务日志ID，按ID升序"""
+        # 天数条件在数据库端比较：created_at 按东八区本地时间无时区存储，截止时间同样去掉时区
+        if policy.keep_days:
+            cutoff = get_now_in_east8().replace(tzinfo=None) - timedelta(days=policy.keep_days)
+            recent = (TaskLog.created_at >= cutoff).label("recent")
+        else:
+            recent = literal(False).label("recent")
+        logs = self.db.execute(
+            select(TaskLog.id, TaskLog.status, recent, TaskLog.duplicate_of)
+            .where(TaskLog.task_id == task_id)
+            .order_by(TaskLog.id.desc())
+        ).all()
+        if not logs:
+            return []
+
+        kept: Set[int] = set()
+        baseline_kept = False
+        for index, (log_id, status, is_recent, _) in enumerate(logs):
+            if index < policy.keep_runs or is_recent or status in _ACTIVE_STATUSES:
+                kept.add(log_id)
+            elif status == TaskStatus.COMPLETED and not baseline_kept:
+                kept.add(log_id)
+            if status == TaskStatus.COMPLETED:
+                baseline_kept = True
+
+        candidates = [log_id for log_id, *_ in logs if log_id not in kept]
+        if policy.keep_differences and candidates:
+            kept.update(self._logs_with_differences(candidates))
+        # 被保留的压缩运行引用的运行也须保留
+        kept.update(
+            duplicate_of for log_id, _, _, duplicate_of in logs
+            if log_id in kept and duplicate_of is not None
+        )
+        return sorted(log_id for log_id, *_ in logs if log_id not in kept)
+
+    def _logs_with_differences(self, log_ids: List[int]) -> Set[int]:
+        """返回其中存在差异结果的运行，压缩的运行按其引用的运行判断"""
+        found = set()
+        for i in range(0, len(log_ids), self.batch_size):
+            batch = log_ids[i:i + self.batch_size]
+            has_differences = exists().where(
+                Result.task_log_id == TaskLog.id, Result.has_differences == True
+            )
+            referenced_differences = exists().where(
+                Result.task_log_id == TaskLog.duplicate_of, Result.has_differences == True
+            )
+            found.update(
+                self.db.execute(
+                    select(TaskLog.id).where(
+                        TaskLog.id.in_(batch), has_differences | referenced_differences
+                    )
+                ).scalars()
+            )
+        return found
+
+    def _delete_rows(self, model, log_ids: List[int]) -> int:
+        """按批删除子表中属于这些运行的行，每批单独提交"""
+        deleted = 0
+        while True:
+            ids = self.db.execute(
+                select(model.id).where(model.task_log_id.in_(log_ids)).limit(self.batch_size)
+            ).scalars().all()
+            if not ids:
+                return deleted
+            self.db.execute(delete(model).where(model.id.in_(ids)))
+            self.db.commit()
+            deleted += len(ids)
+
+    def _delete_logs(self, log_ids: List[int]) -> None:
+        """删除运行及其结果、指纹、已结束的队列记录和报告文件"""
+        reports = self.db.execute(
+            select(TaskLog.result_url).where(
+                TaskLog.id.in_(log_ids), TaskLog.result_url.isnot(None)
+            )
+        ).scalars().all()
+
+        self.stats.deleted_results += self._delete_rows(Result, log_ids)
+        self._delete_rows(ObjectFingerprint, log_ids)
+        self.db.execute(
+            delete(Job).where(
+                Job.task_log_id.in_(log_ids),
+                Job.status.in_([JobStatus.COMPLETED, JobStatus.FAILED]),
+            )
+        )
+        # 尚未结束的队列记录只解除关联
+        self.db.execute(
+            update(Job).where(Job.task_log_id.in_(log_ids)).values(task_log_id=None)
+        )
+        self.db.execute(delete(TaskLog).where(TaskLog.id.in_(log_ids)))
+        self.db.commit()
+        self.stats.deleted_logs += len(log_ids)
+
+        # 压缩的运行与其引用的运行共用报告，仍被引用的文件不删除
+        still_used = set(
+            self.db.execute(
+                select(TaskLog.result_url).where(TaskLog.result_url.in_(reports))
+            ).scalars()
+        ) if reports else set()
+        for path in set(reports) - still_used:
+            self._remove_report(path)
+
+    def _result_digest(self, log_id: int) -> str:
+        """按对象排序计算运行全部结果的摘要，结果完全相同的运行摘要相同"""
+        digest = hashlib.sha256()
+        rows = self.db.execute(
+            select(
+                Result.type,
+                Result.object_name,
+                Result.target_conn_id,
+                Result.has_differences,
+                Result.source_definition_hash,
+                Result.source_definition_inline,
+                Result.target_definition_hash,
+                Result.target_definition_inline,
+                Result.difference_details,
+                Result.change_sql,
+            )
+            .where(Result.task_log_id == log_id)
+            .order_by(Result.type, Result.object_name, Result.target_conn_id)
+            .execution_options(yield_per=self.batch_size)
+        )
+        for (
+            type, object_name, target_conn_id, has_differences,
+            source_hash, source_inline, target_hash, target_inline,
+            difference_details, change_sql,
+        ) in rows:
+            row = [
+                type.value,
+                object_name,
+                target_conn_id,
+                bool(has_differences),
+                source_hash or (definition_hash(source_inline) if source_inline else None),
+                target_hash or (definition_hash(target_inline) if target_inline else None),
+                difference_details,
+                change_sql,
+            ]
+            digest.update(json.dumps(row, sort_keys=True, default=str).encode("utf-8"))
+            digest.update(b"\n")
+        return digest.hexdigest()
+
+    def compact(self, task_id: int) -> None:
+        """
+        把结果完全相同的相邻成功运行压缩为引用：较早的运行保留日志记录，
+        删除其结果、指纹和报告文件，duplicate_of 指向较新的运行
+        """
+        logs = self.db.execute(
+            select(TaskLog)
+            .where(
+                TaskLog.task_id == task_id,
+                TaskLog.status == TaskStatus.COMPLETED,
+                TaskLog.duplicate_of.is_(None),
+            )
+            .order_by(TaskLog.id)
+        ).scalars().all()
+
+        for log in logs:
+            if log.result_digest is None:
+                log.result_digest = self._result_digest(log.id)
+        self.db.commit()
+
+        for older, newer in zip(logs, logs[1:]):
+            if older.result_digest != newer.result_digest:
+                continue
+            own_report = older.result_url
+            self.stats.deleted_results += self._delete_rows(Result, [older.id])
+            self._delete_rows(ObjectFingerprint, [older.id])
+            # 原先引用较早运行的记录改为引用较新的运行
+            self.db.execute(
+                update(TaskLog)
+                .where(TaskLog.duplicate_of == older.id)
+                .values(duplicate_of=newer.id, result_url=newer.result_url)
+            )
+            older.duplicate_of = newer.id
+            older.result_url = newer.result_url
+            self.db.commit()
+            self.stats.compacted_logs += 1
+            if own_report and own_report != newer.result_url:
+                self._remove_report(own_report)
+
+    def purge_orphan_reports(self) -> None:
+        """删除报告目录中没有任何任务日志引用的报告文件；最近修改的文件可能仍在生成，跳过"""
+        output_dir = settings.REPORT_OUTPUT_DIR
+        if not os.path.isdir(output_dir):
+            return
+        referenced = {
+            os.path.basename(url)
+            for url in self.db.execute(
+                select(TaskLog.result_url).where(TaskLog.result_url.isnot(None))
+            ).scalars()
+        }
+        grace = time.time() - settings.RETENTION_REPORT_GRACE_PERIOD
+        for entry in os.scandir(output_dir):
+            if not entry.is_file() or not _REPORT_FILE_RE.match(entry.name):
+                continue
+            if entry.name in referenced or entry.stat().st_mtime > grace:
+                continue
+            self._remove_report(entry.path)
+
+    def _remove_report(self, path: str) -> None:
+        try:
+            os.remove(path)
+            self.stats.deleted_reports += 1
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            self.stats.errors.append(f"删除报告文件 {path} 失败：{e}")
+
+
+def _print_stats(stats: RetentionStats) -> None:
+    print(
+        f"数据清理：删除运行 {stats.deleted_logs} 次、结果 {stats.deleted_results} 条、"
+        f"报告文件 {stats.deleted_reports} 个，压缩运行 {stats.compacted_logs} 次"
+    )
+
+
+def run_retention() -> RetentionStats:
+    """
+    定时清理入口，使用独立会话。失败时异常继续抛出，
+    由调度器记录带堆栈的错误日志，命令行执行时以非零状态退出
+    """
+    db = SessionLocal()
+    try:
+        stats = RetentionService(db).run()
+    except RetentionError as e:
+        _print_stats(e.stats)
+        raise
+    finally:
+        db.close()
+    _print_stats(stats)
+    return stats
@@ -0,0 +1,58 @@
+import threading
+import time
+from contextlib import contextmanager
+from functools import wraps
+from typing import Any, Callable, Dict, Iterator
+
+from app.services.connection_manager import ConnectionManager
+from app.services.result_writer import ResultWriter
+
+
+class RunTelemetry:
+    """
+    单次比较运行的结构化统计。
+    记录各阶段耗时，结束时与各数据库的查询往返次数、接收字节数和结果写入统计合并，保存到 TaskLog
+    """
+
+    def __init__(self):
+        self._started = time.perf_counter()
+        self._phases: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def record(self, name: str, seconds: float) -> None:
+        """累加阶段耗时，可在工作线程中调用"""
+        with self._lock:
+            self._phases[name] = round(self._phases.get(name, 0.0) + seconds, 4)
+
+    @contextmanager
+    def measure(self, name: str) -> Iterator[None]:
+        """统计代码块耗时，异常退出时同样记录"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    def timed(self, name: str, func: Callable[..., Any]) -> Callable[..., Any]:
+        """包装函数，在执行它的线程中统计耗时，用于提交到线程池的阶段"""
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with self.measure(name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    def to_dict(self, connections: ConnectionManager, writer: ResultWriter) -> Dict[str, Any]:
+        """
+        汇总为可 JSON 序列化的统计：phases 为各阶段耗时（秒），
+        databases 按连接池统计查询往返与接收字节，persisted 为各阶段结果写入行数与耗时
+        """
+        with self._lock:
+            phases = dict(self._phases)
+        return {
+            "total_seconds": round(time.perf_counter() - self._started, 4),
+            "phases": phases,
+            "databases": connections.stats(),
+            "persisted": {phase: dict(stats) for phase, stats in writer.stats.items()},
+        }
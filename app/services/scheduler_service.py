@@ -0,0 +1,212 @@
+from typing import Dict, Optional, Tuple
+
+from apscheduler.schedulers.base import BaseScheduler
+from apscheduler.schedulers.background import BackgroundScheduler
+from apscheduler.triggers.base import BaseTrigger
+from apscheduler.triggers.cron import CronTrigger
+from apscheduler.triggers.interval import IntervalTrigger
+
+from app.core.config import settings
+from app.database import SessionLocal
+from app.models.jobs import Job, JobStatus
+from app.models.tasks import Task
+from app.services.job_service import JobQueueService
+from app.services.retention_service import run_retention
+
+# 调度器内部作业：定期从数据库同步任务定时配置
+_SYNC_JOB_ID = "sync-task-schedules"
+# 调度器内部作业：定期清理过期的任务日志、比较结果和报告文件
+_RETENTION_JOB_ID = "retention"
+
+
+def _crontab_weekday(value: str) -> int:
+    """crontab 星期数字（0 和 7 为周日）转为 APScheduler 的编号（0 为周一）"""
+    if not value.isdigit() or int(value) > 7:
+        raise ValueError(f"cron表达式星期字段无效：{value}")
+    return (int(value) + 6) % 7
+
+
+def _crontab_day_of_week(field: str) -> str:
+    """
+    转换 crontab 的星期字段。数字按 crontab 约定（0/7 为周日、1 为周一）展开为 APScheduler 的编号列表，
+    英文缩写（mon-fri 等）两者含义相同，原样保留
+    """
+    if any(char.isalpha() for char in field):
+        return field
+    days = set()
+    for part in field.split(","):
+        base, _, step = part.partition("/")
+        if step and (not step.isdigit() or int(step) == 0):
+            raise ValueError(f"cron表达式星期字段无效：{field}")
+        if base == "*":
+            if not step:
+                return "*"
+            start, end = 0, 6
+        elif "-" in base:
+            start, _, end = base.partition("-")
+            if not start.isdigit() or not end.isdigit() or int(start) > int(end):
+                raise ValueError(f"cron表达式星期字段无效：{field}")
+            start, end = int(start), int(end)
+        else:
+            start = end = int(base) if base.isdigit() else -1
+            if step:
+                end = 7
+        if start < 0 or end > 7:
+            raise ValueError(f"cron表达式星期字段无效：{field}")
+        days.update(
+            _crontab_weekday(str(day)) for day in range(start, end + 1, int(step or 1))
+        )
+    return ",".join(str(day) for day in sorted(days))
+
+
+def _crontab_trigger(expr: str, jitter: Optional[int] = None) -> CronTrigger:
+    """解析五段式 cron 表达式（分 时 日 月 周），星期字段按 crontab 约定解释"""
+    fields = expr.split()
+    if len(fields) != 5:
+        raise ValueError(f"cron表达式需为5段（分 时 日 月 周）：{expr}")
+    minute, hour, day, month, day_of_week = fields
+    return CronTrigger(
+        minute=minute,
+        hour=hour,
+        day=day,
+        month=month,
+        day_of_week=_crontab_day_of_week(day_of_week),
+        timezone=settings.SCHEDULER_TIMEZONE,
+        jitter=jitter,
+    )
+
+
+def validate_schedule(cron: Optional[str], interval: Optional[int]) -> None:
+    """校验定时配置，cron 表达式与执行间隔二选一，不合法时抛出 ValueError"""
+    if cron and interval:
+        raise ValueError("cron表达式与执行间隔只能设置一个")
+    if cron:
+        _crontab_trigger(cron)
+    if interval is not None and interval <= 0:
+        raise ValueError("执行间隔必须大于0秒")
+
+
+def _build_trigger(task: Task) -> Optional[BaseTrigger]:
+    """根据任务定时配置创建触发器，附加随机抖动，避免大量任务在同一时刻访问同一批数据库"""
+    jitter = settings.SCHEDULER_JITTER or None
+    if task.schedule_cron:
+        return _crontab_trigger(task.schedule_cron, jitter)
+    if task.schedule_interval:
+        return IntervalTrigger(
+            seconds=task.schedule_interval,
+            timezone=settings.SCHEDULER_TIMEZONE,
+            jitter=jitter,
+        )
+    return None
+
+
+def run_scheduled_task(task_id: int) -> None:
+    """定时触发：任务已有排队中或执行中的执行时跳过本次，避免同一任务重叠执行"""
+    db = SessionLocal()
+    try:
+        active = (
+            db.query(Job)
+            .filter(
+                Job.task_id == task_id,
+                Job.status.in_([JobStatus.QUEUED, JobStatus.RUNNING]),
+            )
+            .first()
+        )
+        if active:
+            print(f"定时任务 {task_id} 上一次执行（{active.id}）尚未结束，跳过本次触发")
+            return
+        job = JobQueueService(db).enqueue(task_id)
+        print(f"定时任务 {task_id} 已提交执行 {job.id}")
+    except Exception as e:
+        print(f"定时任务 {task_id} 提交执行失败：{e}")
+    finally:
+        db.close()
+
+
+class TaskScheduler:
+    """
+    任务定时调度器。
+    只负责按 Task 上的定时配置把执行提交到队列，实际执行和全局并发限制由 worker 负责；
+    定期从数据库同步定时配置，接口修改后无需重启。
+    """
+
+    def __init__(self, scheduler: BaseScheduler = None):
+        self.scheduler = scheduler or BackgroundScheduler(
+            timezone=settings.SCHEDULER_TIMEZONE
+        )
+        # 已登记任务的定时配置，用于判断是否需要重建触发器
+        self._signatures: Dict[int, Tuple[Optional[str], Optional[int]]] = {}
+
+    def start(self) -> None:
+        """同步定时配置并启动调度器；BlockingScheduler 会在此阻塞"""
+        self.sync()
+        self.scheduler.add_job(
+            self.sync,
+            IntervalTrigger(seconds=settings.SCHEDULER_SYNC_INTERVAL),
+            id=_SYNC_JOB_ID,
+            replace_existing=True,
+            coalesce=True,
+            max_instances=1,
+        )
+        if settings.RETENTION_ENABLED:
+            self.scheduler.add_job(
+                run_retention,
+                IntervalTrigger(seconds=settings.RETENTION_INTERVAL),
+                id=_RETENTION_JOB_ID,
+                replace_existing=True,
+                coalesce=True,
+                max_instances=1,
+            )
+        print("任务调度器已启动")
+        self.scheduler.start()
+
+    def shutdown(self) -> None:
+        if self.scheduler.running:
+            self.scheduler.shutdown(wait=False)
+
+    def sync(self) -> None:
+        """按数据库中的定时配置新增、更新或移除调度作业"""
+        db = SessionLocal()
+        try:
+            tasks = (
+                db.query(Task)
+                .filter(Task.deleted == False, Task.schedule_enabled == True)
+                .all()
+            )
+            current = {}
+            for task in tasks:
+                signature = (task.schedule_cron, task.schedule_interval)
+                if self._signatures.get(task.id) == signature:
+                    current[task.id] = signature
+                    continue
+                try:
+                    trigger = _build_trigger(task)
+                except ValueError as e:
+                    print(f"任务 {task.id} 定时配置无效：{e}")
+                    continue
+                if trigger is None:
+                    continue
+                self.scheduler.add_job(
+                    run_scheduled_task,
+                    trigger,
+                    args=[task.id],
+                    id=f"task-{task.id}",
+                    name=task.name,
+                    replace_existing=True,
+                    coalesce=True,
+                    max_instances=1,
+                    misfire_grace_time=settings.SCHEDULER_MISFIRE_GRACE_TIME,
+                )
+                current[task.id] = signature
+                print(f"已登记定时任务 {task.id}（{task.name}）：{signature[0] or f'每 {signature[1]} 秒'}")
+
+            for task_id in set(self._signatures) - set(current):
+                job = self.scheduler.get_job(f"task-{task_id}")
+                if job:
+                    job.remove()
+                print(f"已移除定时任务 {task_id}")
+            self._signatures = current
+        except Exception as e:
+            print(f"同步定时任务配置失败：{e}")
+        finally:
+            db.close()
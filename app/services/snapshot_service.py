@@ -0,0 +1,180 @@
+import gzip
+import io
+import json
+import zlib
+from typing import Any, Dict, List, Set
+
+from sqlalchemy.orm import Session
+
+from app.models.base import get_now_in_east8
+from app.models.connections import Connection
+from app.models.snapshots import SchemaSnapshot
+from app.models.tasks import Result, ResultType
+from app.services.connection_manager import ConnectionManager
+from app.services.task_service import DatabaseComparisonService
+
+# 快照文件格式标识与版本，目录数据结构变化时递增版本
+SNAPSHOT_FORMAT = "dbcapture-schema-snapshot"
+SNAPSHOT_VERSION = 1
+
+# gzip 文件头，用于识别导入的快照是否经过压缩
+_GZIP_MAGIC = b"\x1f\x8b"
+
+# 快照表中名称类字段的长度
+_NAME_LENGTH = 100
+_CONNECTION_NAME_LENGTH = 50
+_DATABASE_LENGTH = 64
+
+
+def dump_snapshot(document: Dict[str, Any], compress: bool = True) -> bytes:
+    """把快照序列化为紧凑 JSON，默认 gzip 压缩"""
+    data = json.dumps(
+        document, ensure_ascii=False, separators=(",", ":"), default=str
+    ).encode("utf-8")
+    return gzip.compress(data, 6) if compress else data
+
+
+def _decompress(data: bytes, max_size: int = None) -> bytes:
+    """解压 gzip 快照，文件损坏或解压后超过 max_size 字节时抛出 ValueError"""
+    try:
+        with gzip.GzipFile(fileobj=io.BytesIO(data)) as f:
+            if max_size is None:
+                return f.read()
+            content = f.read(max_size + 1)
+    except (OSError, EOFError, zlib.error) as e:
+        raise ValueError(f"快照文件解压失败：{e}")
+    if len(content) > max_size:
+        raise ValueError(f"快照解压后超过 {max_size} 字节")
+    return content
+
+
+def _truncate(value: Any, length: int) -> Any:
+    return value[:length] if isinstance(value, str) else value
+
+
+def load_snapshot(data: bytes, max_size: int = None) -> Dict[str, Any]:
+    """
+    解析快照文件，自动识别 gzip 压缩，max_size 限制解压后的字节数；
+    文件损坏、格式或版本不符时抛出 ValueError
+    """
+    if data[:2] == _GZIP_MAGIC:
+        data = _decompress(data, max_size)
+    try:
+        document = json.loads(data)
+    except ValueError as e:
+        raise ValueError(f"快照内容不是有效的JSON：{e}")
+    if not isinstance(document, dict) or document.get("format") != SNAPSHOT_FORMAT:
+        raise ValueError("不是有效的库结构快照文件")
+    if document.get("version") != SNAPSHOT_VERSION:
+        raise ValueError(f"不支持的快照格式版本：{document.get('version')}")
+    if not isinstance(document.get("objects"), dict):
+        raise ValueError("快照缺少目录数据")
+    return document
+
+
+def _object_counts(objects: Dict[str, Any]) -> Dict[str, int]:
+    """统计快照中各类对象的数量"""
+    counts = {}
+    for type, data in objects.items():
+        if type == ResultType.TABLE.value:
+            counts[type] = len(data.get("tables") or {})
+        else:
+            counts[type] = len(data or {})
+    return counts
+
+
+class SchemaSnapshotService:
+    """
+    库结构快照服务。
+    快照内容与多目标比较共用比较器的 fetch 结果，比较时只调用各比较器的 diff，
+    快照之间的比较不访问任何业务数据库。
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+        self.comparison = DatabaseComparisonService(db)
+
+    def capture_document(
+        self,
+        connection: Connection,
+        config: Dict[str, Any] = None,
+        types: Set[ResultType] = None,
+    ) -> Dict[str, Any]:
+        """从数据库连接采集目录数据，返回快照文档"""
+        connections = ConnectionManager()
+        try:
+            objects = self.comparison.fetch_snapshot(
+                connections.pool(connection), config, types
+            )
+        finally:
+            connections.close()
+
+        return {
+            "format": SNAPSHOT_FORMAT,
+            "version": SNAPSHOT_VERSION,
+            "captured_at": get_now_in_east8().strftime("%Y-%m-%d %H:%M:%S"),
+            "source": {
+                "connection_id": connection.id,
+                "name": connection.name,
+                "host": connection.host,
+                "port": connection.port,
+                "database": connection.database,
+            },
+            "objects": {type.value: data for type, data in objects.items()},
+        }
+
+    def capture(self, connection: Connection, name: str = None) -> SchemaSnapshot:
+        """采集并保存快照"""
+        document = self.capture_document(connection)
+        name = name or f"{connection.name}_{document['captured_at']}"
+        return self.save(document, name, connection)
+
+    def save(
+        self, document: Dict[str, Any], name: str, connection: Connection = None
+    ) -> SchemaSnapshot:
+        """保存快照文档，导入的快照不关联数据库连接；名称类字段超出列长度时截断"""
+        data = dump_snapshot(document, compress=False)
+        source = document.get("source") or {}
+        snapshot = SchemaSnapshot(
+            name=_truncate(name, _NAME_LENGTH),
+            connection_id=connection.id if connection is not None else None,
+            connection_name=_truncate(
+                connection.name if connection is not None else source.get("name"),
+                _CONNECTION_NAME_LENGTH,
+            ),
+            database=_truncate(source.get("database"), _DATABASE_LENGTH),
+            format_version=document["version"],
+            content=gzip.compress(data, 6),
+            length=len(data),
+            object_counts=_object_counts(document["objects"]),
+        )
+        self.db.add(snapshot)
+        self.db.commit()
+        self.db.refresh(snapshot)
+        return snapshot
+
+    def load(self, snapshot: SchemaSnapshot) -> Dict[str, Any]:
+        """读取已保存快照的文档"""
+        return load_snapshot(snapshot.content)
+
+    def compare(
+        self,
+        source: Dict[str, Any],
+        target: Dict[str, Any],
+        types: Set[ResultType] = None,
+        config: Dict[str, Any] = None,
+    ) -> List[Result]:
+        """
+        比较两份快照文档，只返回未保存的结果对象。
+        任一侧快照缺少某类目录数据时跳过该类比较
+        """
+        results = []
+        for _, type, _, diff in self.comparison.snapshot_phases():
+            if types and type not in types:
+                continue
+            if type.value not in source["objects"] or type.value not in target["objects"]:
+                continue
+            results.extend(
+                diff(None, source["objects"][type.value], target["objects"][type.value], config)
+            )
+        return results
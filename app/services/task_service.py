@@ -1,4 +1,5 @@
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Callable, Set, Tuple
+from concurrent.futures import ThreadPoolExecutor
 import pymysql
 from sqlalchemy.orm import Session
 
@@ -17,7 +18,13 @@ from app.services.comparators import (
     ProcedureComparator,
     FunctionComparator,
     TriggerComparator,
+    DataComparator,
+    StatisticsComparator,
 )
+from app.services.connection_manager import ConnectionManager, ConnectionPool
+from app.services.incremental_service import IncrementalComparisonService, IncrementalState
+from app.services.result_writer import ResultWriter
+from app.services.run_telemetry import RunTelemetry
 from app.schemas.task import TaskCreate
 from app.services.report_service import ReportService
 
@@ -87,29 +94,75 @@ def _generate_config_change_sql(differences: Dict[str, Any]) -> str:
     return "\n".join(sql_statements)
 
 
-def _get_connection(
-    host: str, port: str, user: str, password: str, database: str
-) -> pymysql.Connection:
-    """创建数据库连接"""
-    return pymysql.connect(
-        host=host,
-        port=int(port),
-        user=user,
-        password=password,
-        database=database,
-        charset="utf8mb4",
+def _fetch_database_config(
+    conn: pymysql.Connection,
+    config: Dict[str, Any] = None,
+    name_filter: Callable[[str], bool] = None,
+) -> Dict[str, Any]:
+    """获取单侧数据库配置，签名与比较器的 fetch 一致"""
+    return _get_database_config(conn)
+
+
+def _diff_database_config(
+    task_log_id: int,
+    source_config: Dict[str, Any],
+    target_config: Dict[str, Any],
+    config: Dict[str, Any] = None,
+) -> List[Result]:
+    """比较两侧数据库配置，只返回未保存的结果对象"""
+    # 调试日志
+    print("====[compare_database_config 调试]====")
+    print("source_config:", source_config)
+    print("target_config:", target_config)
+    differences = _compare_configs(source_config, target_config)
+    print("differences:", differences)
+    print("====[调试结束]====")
+
+    result = Result(
+        task_log_id=task_log_id,
+        object_name="database_config",
+        has_differences=bool(differences),
+        source_definition=str(source_config),
+        target_definition=str(target_config),
+        difference_details=differences,
+        change_sql=(
+            _generate_config_change_sql(differences) if differences else None
+        ),
+        type=ResultType.CONFIG,
     )
+    return [result]
+
+
+def _collect_database_config(
+    task_log_id: int,
+    source_pool: ConnectionPool,
+    target_pool: ConnectionPool,
+    config: Dict[str, Any] = None,
+    incremental: IncrementalState = None,
+) -> List[Result]:
+    """比较数据库配置，只返回未保存的结果对象，不访问数据库会话；配置项很少，始终全量比较"""
+    with source_pool.connection() as source_conn:
+        source_config = _get_database_config(source_conn)
+    with target_pool.connection() as target_conn:
+        target_config = _get_database_config(target_conn)
+    return _diff_database_config(task_log_id, source_config, target_config)
 
 
 class DatabaseComparisonService:
     def __init__(self, db: Session):
         self.db = db
-        self.view_comparator = ViewComparator(db)
-        self.table_comparator = TableComparator(db)
-        self.procedure_comparator = ProcedureComparator(db)
-        self.function_comparator = FunctionComparator(db)
-        self.trigger_comparator = TriggerComparator(db)
+        # 所有阶段共用的结果批量写入器，按阶段累计写入耗时
+        self.result_writer = ResultWriter(db)
+        self.view_comparator = ViewComparator(db, self.result_writer)
+        self.table_comparator = TableComparator(db, self.result_writer)
+        self.procedure_comparator = ProcedureComparator(db, self.result_writer)
+        self.function_comparator = FunctionComparator(db, self.result_writer)
+        self.trigger_comparator = TriggerComparator(db, self.result_writer)
+        self.data_comparator = DataComparator(db, self.result_writer)
+        self.statistics_comparator = StatisticsComparator(db, self.result_writer)
         self.report_service = ReportService()
+        # 当前运行的阶段耗时统计，每次 run_comparison 重新创建
+        self.telemetry = RunTelemetry()
 
     def create_task(self, task_data: TaskCreate) -> Task:
         """创建新的数据库比较任务"""
@@ -144,7 +197,9 @@ class DatabaseComparisonService:
 
         return task
 
-    def compare_database_config(self, task_log_id: int) -> Result:
+    def compare_database_config(
+        self, task_log_id: int, connections: ConnectionManager = None
+    ) -> Result:
         """比较数据库配置"""
         task_log = self.db.query(TaskLog).get(task_log_id)
         if not task_log:
@@ -153,100 +208,351 @@ class DatabaseComparisonService:
         if not task:
             raise ValueError(f"比较任务 {task_log.task_id} 不存在")
 
-        # 获取数据库连接信息
-        source_conn = task.source_conn
-        target_conn = task.target_conn
-
-        source_conn = _get_connection(
-            source_conn.host,
-            source_conn.port,
-            source_conn.user,
-            source_conn.password,
-            source_conn.database,
-        )
-        target_conn = _get_connection(
-            target_conn.host,
-            target_conn.port,
-            target_conn.user,
-            target_conn.password,
-            target_conn.database,
-        )
+        owns_connections = connections is None
+        if owns_connections:
+            connections = ConnectionManager()
 
         try:
-            # 获取数据库配置
-            source_config = _get_database_config(source_conn)
-            target_config = _get_database_config(target_conn)
-
-            # 调试日志
-            print("====[compare_database_config 调试]====")
-            print("source_config:", source_config)
-            print("target_config:", target_config)
-            differences = _compare_configs(source_config, target_config)
-            print("differences:", differences)
-            print("====[调试结束]====")
-
-            task_log = self.db.query(TaskLog).get(task_log_id)
-            if not task_log:
-                raise ValueError(f"任务日志 {task_log_id} 不存在")
-            task_id = task_log.task_id
-
-            result = Result(
-                task_log_id=task_log_id,
-                object_name="database_config",
-                has_differences=bool(differences),
-                source_definition=str(source_config),
-                target_definition=str(target_config),
-                difference_details=differences,
-                change_sql=(
-                    _generate_config_change_sql(differences) if differences else None
-                ),
-                type=ResultType.CONFIG,
+            # 获取数据库连接信息
+            results = _collect_database_config(
+                task_log_id,
+                connections.pool(task.source_conn),
+                connections.pool(task.target_conn),
             )
-
-            self.db.add(result)
-            self.db.commit()
-            return result
-
         finally:
-            # 只关闭pymysql.Connection对象
-            try:
-                if hasattr(source_conn, 'close') and callable(source_conn.close):
-                    source_conn.close()
-            except Exception:
-                pass
-            try:
-                if hasattr(target_conn, 'close') and callable(target_conn.close):
-                    target_conn.close()
-            except Exception:
-                pass
-
-    def compare_views(self, task_log_id: int) -> List[Result]:
+            if owns_connections:
+                connections.close()
+
+        self.result_writer.write(results, phase=ResultType.CONFIG.value)
+        return results[0]
+
+    def compare_views(
+        self,
+        task_log_id: int,
+        connections: ConnectionManager = None,
+        incremental: IncrementalState = None,
+    ) -> List[Result]:
         """比较视图"""
-        return self.view_comparator.compare(task_log_id)
+        return self.view_comparator.compare(
+            task_log_id, connections=connections, incremental=incremental
+        )
 
-    def compare_table_structure(self, task_log_id: int) -> List[Result]:
+    def compare_table_structure(
+        self,
+        task_log_id: int,
+        connections: ConnectionManager = None,
+        incremental: IncrementalState = None,
+    ) -> List[Result]:
         """比较表结构"""
-        return self.table_comparator.compare(task_log_id)
+        return self.table_comparator.compare(
+            task_log_id, connections=connections, incremental=incremental
+        )
 
-    def compare_procedures(self, task_log_id: int) -> List[Result]:
+    def compare_procedures(
+        self,
+        task_log_id: int,
+        connections: ConnectionManager = None,
+        incremental: IncrementalState = None,
+    ) -> List[Result]:
         """比较存储过程"""
-        return self.procedure_comparator.compare(task_log_id)
+        return self.procedure_comparator.compare(
+            task_log_id, connections=connections, incremental=incremental
+        )
 
-    def compare_functions(self, task_log_id: int) -> List[Result]:
+    def compare_functions(
+        self,
+        task_log_id: int,
+        connections: ConnectionManager = None,
+        incremental: IncrementalState = None,
+    ) -> List[Result]:
         """比较自定义函数"""
-        return self.function_comparator.compare(task_log_id)
+        return self.function_comparator.compare(
+            task_log_id, connections=connections, incremental=incremental
+        )
 
-    def compare_triggers(self, task_log_id: int) -> List[Result]:
+    def compare_triggers(
+        self,
+        task_log_id: int,
+        connections: ConnectionManager = None,
+        incremental: IncrementalState = None,
+    ) -> List[Result]:
         """比较触发器"""
-        return self.trigger_comparator.compare(task_log_id)
+        return self.trigger_comparator.compare(
+            task_log_id, connections=connections, incremental=incremental
+        )
 
-    def run_comparison(self, task_id: int) -> None:
-        # 创建任务日志并记录开始时间
+    def compare_statistics(
+        self,
+        task_log_id: int,
+        connections: ConnectionManager = None,
+        incremental: IncrementalState = None,
+    ) -> List[Result]:
+        """比较表统计信息"""
+        return self.statistics_comparator.compare(
+            task_log_id, connections=connections, incremental=incremental
+        )
+
+    def compare_data(
+        self,
+        task_log_id: int,
+        connections: ConnectionManager = None,
+        incremental: IncrementalState = None,
+    ) -> List[Result]:
+        """比较表数据，任务配置未开启时不做任何查询"""
+        return self.data_comparator.compare(
+            task_log_id, connections=connections, incremental=incremental
+        )
+
+    def _comparison_phases(
+        self,
+    ) -> List[Tuple[str, ResultType, Callable[..., List[Result]]]]:
+        """返回各比较阶段的名称、结果类型及其无会话的结果收集函数"""
+        return [
+            ("数据库配置", ResultType.CONFIG, _collect_database_config),
+            ("表统计信息", ResultType.STATISTICS, self.statistics_comparator.collect),
+            ("表结构", ResultType.TABLE, self.table_comparator.collect),
+            ("视图", ResultType.VIEW, self.view_comparator.collect),
+            ("存储过程", ResultType.PROCEDURE, self.procedure_comparator.collect),
+            ("函数", ResultType.FUNCTION, self.function_comparator.collect),
+            ("触发器", ResultType.TRIGGER, self.trigger_comparator.collect),
+            ("表数据", ResultType.DATA, self.data_comparator.collect),
+        ]
+
+    def snapshot_phases(
+        self,
+    ) -> List[Tuple[str, ResultType, Callable[..., Any], Callable[..., List[Result]]]]:
+        """返回支持快照比较的阶段名称、结果类型及其单侧获取函数和比较函数"""
+        return [
+            ("数据库配置", ResultType.CONFIG, _fetch_database_config, _diff_database_config),
+            ("表统计信息", ResultType.STATISTICS, self.statistics_comparator.fetch, self.statistics_comparator.diff),
+            ("表结构", ResultType.TABLE, self.table_comparator.fetch, self.table_comparator.diff),
+            ("视图", ResultType.VIEW, self.view_comparator.fetch, self.view_comparator.diff),
+            ("存储过程", ResultType.PROCEDURE, self.procedure_comparator.fetch, self.procedure_comparator.diff),
+            ("函数", ResultType.FUNCTION, self.function_comparator.fetch, self.function_comparator.diff),
+            ("触发器", ResultType.TRIGGER, self.trigger_comparator.fetch, self.trigger_comparator.diff),
+        ]
+
+    def fetch_snapshot(
+        self,
+        pool: ConnectionPool,
+        config: Dict[str, Any] = None,
+        types: Set[ResultType] = None,
+    ) -> Dict[ResultType, Any]:
+        """在同一个连接上依次获取单侧各阶段的目录数据，types 不为空时只获取指定类型"""
+        with pool.connection() as conn:
+            return {
+                type: fetch(conn, config)
+                for _, type, fetch, _ in self.snapshot_phases()
+                if not types or type in types
+            }
+
+    def _diff_target(
+        self,
+        task_log_id: int,
+        source_snapshot: Dict[ResultType, Any],
+        source_pool: ConnectionPool,
+        target_id: int,
+        target_pool: ConnectionPool,
+        config: Dict[str, Any] = None,
+    ) -> List[Tuple[ResultType, List[Result]]]:
+        """
+        获取单个目标库的目录数据并与共享的源库快照比较，不访问数据库会话。
+        表数据比较需要按数据块逐步下钻，无法使用快照，仍与源库实时比较
+        """
+        target_snapshot = self.fetch_snapshot(target_pool, config)
+        phases = [
+            (type, diff(task_log_id, source_snapshot[type], target_snapshot[type], config))
+            for _, type, _, diff in self.snapshot_phases()
+        ]
+        if ((config or {}).get("data_comparison") or {}).get("enabled"):
+            phases.append(
+                (
+                    ResultType.DATA,
+                    self.data_comparator.collect(task_log_id, source_pool, target_pool, config),
+                )
+            )
+        for _, results in phases:
+            for result in results:
+                result.target_conn_id = target_id
+        return phases
+
+    def _run_fan_out(
+        self,
+        task_log: TaskLog,
+        task: Task,
+        connections: ConnectionManager,
+    ) -> None:
+        """
+        多目标比较：源库目录数据只获取一次，各目标库在线程池中并行获取并与之比较，
+        结果写入同一个任务日志，按目标库标记来源
+        """
+        targets = {
+            conn.id: conn
+            for conn in self.db.query(Connection)
+            .filter(Connection.id.in_(task.target_conn_ids), Connection.deleted == False)
+            .all()
+        }
+        missing = [conn_id for conn_id in task.target_conn_ids if conn_id not in targets]
+        if missing:
+            raise ValueError(f"目标数据库连接ID {missing} 不存在")
+
+        # ORM 对象只在当前线程访问，工作线程只拿到连接池
+        source_pool = connections.pool(task.source_conn)
+        target_pools = [
+            (conn_id, targets[conn_id].name, connections.pool(targets[conn_id]))
+            for conn_id in task.target_conn_ids
+        ]
+        config = task.config
+
+        print("开始获取源库目录快照...")
+        with self.telemetry.measure("source_snapshot"):
+            source_snapshot = self.fetch_snapshot(source_pool, config)
+        print("源库目录快照获取完成")
+
+        workers = max(1, min(settings.COMPARISON_WORKERS, len(target_pools)))
+        print(f"并行比较 {len(target_pools)} 个目标库，线程数：{workers}")
+
+        saved = 0
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                (
+                    name,
+                    executor.submit(
+                        self.telemetry.timed(f"target:{name}", self._diff_target),
+                        task_log.id,
+                        source_snapshot,
+                        source_pool,
+                        conn_id,
+                        pool,
+                        config,
+                    ),
+                )
+                for conn_id, name, pool in target_pools
+            ]
+            try:
+                # 按目标库顺序保存结果；保存期间其余目标库继续比较
+                for name, future in futures:
+                    for type, results in future.result():
+                        self.result_writer.write(results, phase=type.value)
+                        saved += len(results)
+                    print(f"目标库 {name} 比较完成")
+            except Exception:
+                for _, future in futures:
+                    future.cancel()
+                raise
+
+        print(f"已保存 {saved} 条比较结果")
+
+    def _run_phases_serial(
+        self,
+        task_log: TaskLog,
+        connections: ConnectionManager,
+        incremental: IncrementalState = None,
+    ) -> None:
+        """依次执行各比较阶段，每个阶段单独保存结果"""
+        print("开始执行数据库配置比较...")
+        with self.telemetry.measure(ResultType.CONFIG.value):
+            self.compare_database_config(task_log.id, connections)
+        print("数据库配置比较完成")
+
+        print("开始执行表统计信息比较...")
+        with self.telemetry.measure(ResultType.STATISTICS.value):
+            self.compare_statistics(task_log.id, connections, incremental)
+        print("表统计信息比较完成")
+
+        print("开始执行表结构比较...")
+        with self.telemetry.measure(ResultType.TABLE.value):
+            self.compare_table_structure(task_log.id, connections, incremental)
+        print("表结构比较完成")
+
+        print("开始执行视图比较...")
+        with self.telemetry.measure(ResultType.VIEW.value):
+            self.compare_views(task_log.id, connections, incremental)
+        print("视图比较完成")
+
+        print("开始执行存储过程比较...")
+        with self.telemetry.measure(ResultType.PROCEDURE.value):
+            self.compare_procedures(task_log.id, connections, incremental)
+        print("存储过程比较完成")
+
+        print("开始执行函数比较...")
+        with self.telemetry.measure(ResultType.FUNCTION.value):
+            self.compare_functions(task_log.id, connections, incremental)
+        print("函数比较完成")
+
+        print("开始执行触发器比较...")
+        with self.telemetry.measure(ResultType.TRIGGER.value):
+            self.compare_triggers(task_log.id, connections, incremental)
+        print("触发器比较完成")
+
+        if ((task_log.task.config or {}).get("data_comparison") or {}).get("enabled"):
+            print("开始执行表数据比较...")
+            with self.telemetry.measure(ResultType.DATA.value):
+                self.compare_data(task_log.id, connections, incremental)
+            print("表数据比较完成")
+
+    def _run_phases_parallel(
+        self,
+        task_log: TaskLog,
+        task: Task,
+        connections: ConnectionManager,
+        incremental: IncrementalState = None,
+    ) -> None:
+        """
+        在线程池中并行执行各比较阶段。各阶段从共享连接池借用各自的源库/目标库连接，
+        只在工作线程中构建结果对象，由当前线程按阶段顺序批量保存。
+        """
+        # ORM 对象只在当前线程访问，工作线程只拿到连接池
+        source_pool = connections.pool(task.source_conn)
+        target_pool = connections.pool(task.target_conn)
+        config = task.config
+
+        phases = self._comparison_phases()
+        workers = max(1, min(settings.COMPARISON_WORKERS, len(phases)))
+        print(f"并行执行 {len(phases)} 个比较阶段，线程数：{workers}")
+
+        saved = 0
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                (
+                    name,
+                    type,
+                    executor.submit(
+                        self.telemetry.timed(type.value, collect),
+                        task_log.id,
+                        source_pool,
+                        target_pool,
+                        config,
+                        incremental,
+                    ),
+                )
+                for name, type, collect in phases
+            ]
+            try:
+                # 按阶段顺序保存结果，保证结果顺序稳定；保存期间其余阶段继续执行
+                for name, type, future in futures:
+                    results = future.result()
+                    print(f"{name}比较完成")
+                    self.result_writer.write(results, phase=type.value)
+                    saved += len(results)
+            except Exception:
+                for _, _, future in futures:
+                    future.cancel()
+                raise
+
+        print(f"已保存 {saved} 条比较结果")
+
+    def run_comparison(self, task_id: int, task_log_id: int = None) -> TaskLog:
+        # 创建任务日志并记录开始时间；队列任务入队时已创建日志，直接沿用
         import time
         start_time = time.time()
-        
-        task_log = TaskLog(task_id=task_id, status=TaskStatus.RUNNING)
-        self.db.add(task_log)
+
+        task_log = self.db.query(TaskLog).get(task_log_id) if task_log_id else None
+        if task_log is None:
+            task_log = TaskLog(task_id=task_id, status=TaskStatus.RUNNING)
+            self.db.add(task_log)
+        else:
+            task_log.status = TaskStatus.RUNNING
         self.db.commit()
         self.db.refresh(task_log)
 
@@ -264,33 +570,40 @@ class DatabaseComparisonService:
 
         print(f'开始执行数据库配置比较，使用LogId：{task_log.id}')
 
-        try:
-            print("开始执行数据库配置比较...")
-            self.compare_database_config(task_log.id)
-            print("数据库配置比较完成")
-
-            print("开始执行表结构比较...")
-            self.compare_table_structure(task_log.id)
-            print("表结构比较完成")
-
-            print("开始执行视图比较...")
-            self.compare_views(task_log.id)
-            print("视图比较完成")
-
-            print("开始执行存储过程比较...")
-            self.compare_procedures(task_log.id)
-            print("存储过程比较完成")
+        # 本次运行内所有阶段共享的连接池
+        connections = ConnectionManager()
+        self.telemetry = RunTelemetry()
 
-            print("开始执行函数比较...")
-            self.compare_functions(task_log.id)
-            print("函数比较完成")
-
-            print("开始执行触发器比较...")
-            self.compare_triggers(task_log.id)
-            print("触发器比较完成")
+        try:
+            # 增量模式：以上次成功运行的对象指纹为基线，跳过未变化的对象
+            incremental = None
+            incremental_service = IncrementalComparisonService(self.db)
+            if task.config and task.config.get("incremental"):
+                if task.target_conn_ids:
+                    # 增量基线按单个目标库记录，多目标比较始终全量执行
+                    print("多目标比较不支持增量模式，执行全量比较")
+                else:
+                    with self.telemetry.measure("incremental_load"):
+                        incremental = incremental_service.load_state(task, task_log.id)
+                    print(f"增量比较基线：任务日志 {incremental.previous_log_id}")
+
+            if task.target_conn_ids:
+                self._run_fan_out(task_log, task, connections)
+            elif settings.COMPARISON_PARALLEL:
+                self._run_phases_parallel(task_log, task, connections, incremental)
+            else:
+                self._run_phases_serial(task_log, connections, incremental)
+            print(f"连接池统计：{connections.stats()}")
+            print(f"结果写入统计：{self.result_writer.stats}")
+
+            if incremental is not None:
+                with self.telemetry.measure("incremental_save"):
+                    carried = incremental_service.save_state(task, task_log.id, incremental)
+                print(f"增量比较：沿用上次结果 {carried} 条")
 
             print("开始生成报告...")
-            reports = self.report_service.generate_reports(task_log)
+            with self.telemetry.measure("report"):
+                reports = self.report_service.generate_reports(task_log)
             if reports:
                 report_path = reports[0].get('file_path')
                 if report_path:
@@ -308,9 +621,13 @@ class DatabaseComparisonService:
             task_log.error_message = str(e)
             print(f"更新任务状态为FAILED，错误信息：{str(e)}")
         finally:
+            # 连接池关闭前汇总本次运行的统计，失败的运行同样保存
+            task_log.telemetry = self.telemetry.to_dict(connections, self.result_writer)
+            connections.close()
             # 计算执行耗时并更新到日志
             end_time = time.time()
             task_log.cost_time = round(end_time - start_time, 2)  # 保留两位小数
             print(f"任务执行耗时：{task_log.cost_time} 秒")
             self.db.commit()
             print("====[比较任务执行结束]====\n")
+        return task_log
@@ -0,0 +1,20 @@
+import signal
+
+from app.services.job_service import JobWorker
+
+
+def main() -> None:
+    """队列 worker 入口：python -m app.worker"""
+    worker = JobWorker()
+
+    def _shutdown(signum, frame):
+        print(f"收到信号 {signum}，停止领取新任务，等待执行中的任务完成...")
+        worker.stop()
+
+    signal.signal(signal.SIGINT, _shutdown)
+    signal.signal(signal.SIGTERM, _shutdown)
+    worker.run()
+
+
+if __name__ == "__main__":
+    main()
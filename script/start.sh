@@ -28,6 +28,10 @@ pip install -r requirements.txt
 mkdir -p reports
 mkdir -p log
 
+# 启动执行队列 worker
+echo "正在启动执行队列worker..."
+python -m app.worker > log/worker.log 2>&1 &
+
 # 启动应用
 echo "正在启动应用..."
 uvicorn app.main:app --reload
@@ -0,0 +1,12 @@
+import os
+
+# 导入 app 时需要的必填配置，测试不连接数据库
+for key, value in {
+    "SECRET_KEY": "test",
+    "DB_HOST": "localhost",
+    "DB_PORT": "3306",
+    "DB_USER": "test",
+    "DB_PASSWORD": "test",
+    "DB_NAME": "test",
+}.items():
+    os.environ.setdefault(key, value)
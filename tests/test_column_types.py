@@ -0,0 +1,46 @@
+from app.services.comparators.column_types import column_types_equal, parse_column_type
+
+
+def test_parse_structure():
+    parsed = parse_column_type("decimal(12,2) unsigned zerofill")
+    assert (parsed.base, parsed.length, parsed.scale) == ("decimal", 12, 2)
+    assert parsed.unsigned and parsed.zerofill
+    assert parse_column_type("varchar(64)") is parse_column_type("varchar(64)")
+
+
+def test_aliases():
+    assert parse_column_type("INTEGER").base == "int"
+    for alias in ("dec(10,2)", "numeric(10,2)", "fixed(10,2)"):
+        assert column_types_equal(alias, "decimal(10,2)")
+    assert not column_types_equal("numeric(10,2)", "decimal(10,3)")
+
+
+def test_integer_display_width_is_ignored():
+    assert column_types_equal("int(11)", "int")
+    assert column_types_equal("bigint(20) unsigned", "bigint unsigned")
+    assert not column_types_equal("int(11)", "int unsigned")
+    assert not column_types_equal("varchar(10)", "varchar(20)")
+
+
+def test_zerofill_display_width_is_compared():
+    assert not column_types_equal("int(5) unsigned zerofill", "int(8) unsigned zerofill")
+    assert column_types_equal("int(5) unsigned zerofill", "INT(5) UNSIGNED ZEROFILL")
+    assert not column_types_equal("int(5) unsigned zerofill", "int(5) unsigned")
+
+
+def test_enum_quoting():
+    parsed = parse_column_type("enum('a,b','it''s','(x)')")
+    assert parsed.values == ("a,b", "it's", "(x)")
+    assert column_types_equal("enum('a','b')", 'enum("a","b")')
+    assert not column_types_equal("enum('a','b')", "enum('b','a')")
+    assert not column_types_equal("set('A')", "set('a')")
+
+
+def test_charset_and_collation():
+    parsed = parse_column_type("varchar(64) CHARACTER SET utf8mb4 COLLATE utf8mb4_bin")
+    assert (parsed.charset, parsed.collation) == ("utf8mb4", "utf8mb4_bin")
+    assert column_types_equal("varchar(64) charset utf8mb4", "varchar(64) character set utf8mb4")
+    assert not column_types_equal("varchar(64) charset utf8mb4", "varchar(64) charset latin1")
+    assert not column_types_equal(
+        "varchar(64) collate utf8mb4_bin", "varchar(64) collate utf8mb4_general_ci"
+    )
@@ -0,0 +1,162 @@
+import sqlite3
+import zlib
+from contextlib import contextmanager
+
+import pytest
+
+from app.core.config import settings
+from app.services.comparators import data_comparator
+from app.services.comparators.data_comparator import (
+    DataComparator,
+    _chunk_boundaries,
+    _ranges,
+    _TableSpec,
+)
+
+
+class _BitXor:
+    def __init__(self):
+        self.value = None
+
+    def step(self, value):
+        if value is not None:
+            self.value = value if self.value is None else self.value ^ value
+
+    def finalize(self):
+        return self.value
+
+
+class _Connection:
+    """用 sqlite 执行比较器生成的 SQL，注册 MySQL 的 CRC32、BIT_XOR 等函数"""
+
+    def __init__(self, rows, columns="id INTEGER PRIMARY KEY, v TEXT"):
+        self.db = sqlite3.connect(":memory:")
+        self.db.create_function("CRC32", 1, lambda s: zlib.crc32(str(s).encode()))
+        # ISNULL 在 sqlite 中是关键字，执行时改名
+        self.db.create_function("MYSQL_ISNULL", 1, lambda v: int(v is None))
+        self.db.create_function("CONCAT", -1, lambda *a: "".join(str(v) for v in a))
+        self.db.create_function(
+            "CONCAT_WS", -1, lambda sep, *a: sep.join(str(v) for v in a if v is not None)
+        )
+        self.db.create_aggregate("BIT_XOR", 1, _BitXor)
+        self.db.execute(f"CREATE TABLE t ({columns})")
+        if rows:
+            placeholders = ", ".join("?" * len(rows[0]))
+            self.db.executemany(f"INSERT INTO t VALUES ({placeholders})", rows)
+
+    @contextmanager
+    def cursor(self):
+        yield _Cursor(self)
+
+
+class _Cursor:
+    def __init__(self, conn):
+        self.conn = conn
+        self.cursor = conn.db.cursor()
+
+    def execute(self, sql, params=()):
+        sql = sql.replace("%s", "?").replace("ISNULL(", "MYSQL_ISNULL(")
+        self.cursor.execute(sql, list(params))
+
+    def fetchone(self):
+        return self.cursor.fetchone()
+
+    def fetchall(self):
+        return self.cursor.fetchall()
+
+
+def _spec(primary_key=("id",), columns=("id", "v")):
+    return _TableSpec("t", list(primary_key), list(columns))
+
+
+def _options(**options):
+    return {"chunk_size": 10, "leaf_rows": 3, **options}
+
+
+def _compare(source, target, **options):
+    return DataComparator(None)._compare_table_data(source, target, _spec(), _options(**options))
+
+
+def _rows(n):
+    return [(i, f"v{i}") for i in range(1, n + 1)]
+
+
+def test_ranges_cover_open_ends():
+    assert _ranges([], None, None) == [(None, None)]
+    assert _ranges([(3,), (6,)], None, None) == [(None, (3,)), ((3,), (6,)), ((6,), None)]
+    assert _ranges([(5,)], (1,), (9,)) == [((1,), (5,)), ((5,), (9,))]
+
+
+def test_chunk_boundaries_every_step_rows():
+    conn = _Connection(_rows(10))
+    assert _chunk_boundaries(conn, _spec(), None, None, 3) == [(3,), (6,), (9,)]
+    assert _chunk_boundaries(conn, _spec(), (3,), (9,), 4) == [(7,)]
+    assert _chunk_boundaries(conn, _spec(), (9,), None, 5) == []
+
+
+def test_identical_tables():
+    report = _compare(_Connection(_rows(45)), _Connection(_rows(45)))
+    assert report["has_differences"] is False
+    assert report["source_rows"] == report["target_rows"] == 45
+    assert report["chunks"] == 5
+    assert report["mismatched_chunks"] == 0
+
+
+def test_difference_buckets():
+    target_rows = [row for row in _rows(45) if row[0] != 7]
+    target_rows = [(i, "changed" if i == 23 else v) for i, v in target_rows] + [(50, "v50")]
+    report = _compare(_Connection(_rows(45)), _Connection(target_rows))
+    assert report["has_differences"] is True
+    assert report["missing_in_target"] == ["7"]
+    assert report["different"] == ["23"]
+    assert report["missing_in_source"] == ["50"]
+    assert report["truncated"] is False
+
+
+def test_null_and_empty_string_differ():
+    report = _compare(_Connection([(1, None)]), _Connection([(1, "")]))
+    assert report["different"] == ["1"]
+
+
+def test_locate_terminates_when_one_side_is_empty():
+    report = _compare(_Connection(_rows(60)), _Connection([]), chunk_size=100, leaf_rows=2)
+    assert report["missing_in_target"] == [str(i) for i in range(1, 61)]
+    assert report["truncated"] is False
+
+    report = _compare(_Connection(_rows(200)), _Connection([]), chunk_size=100, leaf_rows=2)
+    assert report["target_rows"] == 0
+    assert len(report["missing_in_target"]) == settings.DATA_MAX_REPORTED_ROWS
+    assert report["truncated"] is True
+
+
+def test_truncated_at_max_reported_rows(monkeypatch):
+    monkeypatch.setattr(settings, "DATA_MAX_REPORTED_ROWS", 2)
+    target_rows = [(i, "changed") for i in range(1, 46)]
+    report = _compare(_Connection(_rows(45)), _Connection(target_rows))
+    assert report["different"] == ["1", "2"]
+    assert report["truncated"] is True
+
+
+def test_composite_primary_key():
+    columns = "a INTEGER, b INTEGER, v TEXT, PRIMARY KEY (a, b)"
+    rows = [(a, b, "x") for a in range(1, 6) for b in range(1, 6)]
+    target_rows = [row for row in rows if row[:2] != (3, 4)]
+    spec = _spec(primary_key=("a", "b"), columns=("a", "b", "v"))
+    report = DataComparator(None)._compare_table_data(
+        _Connection(rows, columns), _Connection(target_rows, columns), spec, _options()
+    )
+    assert report["missing_in_target"] == [["3", "4"]]
+
+
+def test_tables_without_primary_key_are_not_reported_as_matching(monkeypatch):
+    monkeypatch.setattr(data_comparator, "_get_base_tables", lambda conn: ["a", "b"])
+    monkeypatch.setattr(data_comparator, "_get_column_names", lambda conn: {})
+    keys = iter([{"b": ["id"]}, {"b": ["code"]}])
+    monkeypatch.setattr(data_comparator, "_get_primary_keys", lambda conn: next(keys))
+    results = DataComparator(None)._do_compare(
+        1, None, None, {"data_comparison": {"enabled": True}}
+    )
+    assert [r.object_name for r in results] == ["a", "b"]
+    for result in results:
+        assert result.has_differences is True
+        assert result.difference_details["type"] == "skipped"
@@ -0,0 +1,46 @@
+import pytest
+
+from app.services.comparators.object_filter import object_filter, validate_filters
+
+
+def _filter(rules, kind="table"):
+    return object_filter({"filters": rules}, kind, f"ignored_{kind}s")
+
+
+def test_regex_with_global_flag():
+    matches = _filter({"exclude": {"regex": ["(?i)^tmp_", "_bak$"]}})
+    assert not matches("TMP_orders")
+    assert not matches("orders_bak")
+    assert matches("orders")
+
+
+def test_regex_backreferences_are_not_renumbered():
+    matches = _filter({"exclude": {"regex": ["^(x)y", r"^(a)\1"]}})
+    assert not matches("aa_log")
+    assert matches("ab_log")
+
+
+def test_rule_kinds_combined():
+    matches = _filter(
+        {
+            "include": {"prefixes": ["app_", "api_"], "globs": ["sys_*_cfg"]},
+            "table": {"exclude": {"exact": ["app_tmp"]}},
+        }
+    )
+    assert matches("app_user")
+    assert matches("sys_mail_cfg")
+    assert not matches("app_tmp")
+    assert not matches("log_user")
+
+
+def test_legacy_ignored_list_is_exclude():
+    matches = object_filter({"ignored_tables": ["log_*"]}, "table", "ignored_tables")
+    assert not matches("log_2024")
+    assert matches("orders")
+
+
+def test_invalid_regex_raises_value_error():
+    with pytest.raises(ValueError):
+        validate_filters({"filters": {"exclude": {"regex": ["(unclosed"]}}})
+    with pytest.raises(ValueError):
+        validate_filters({"filters": {"exclude": {"regex": ["^a(?i)b"]}}})
@@ -0,0 +1,55 @@
+from datetime import datetime
+
+import pytest
+from zoneinfo import ZoneInfo
+
+from app.core.config import settings
+from app.services.scheduler_service import _crontab_day_of_week, _crontab_trigger
+
+TZ = ZoneInfo(settings.SCHEDULER_TIMEZONE)
+# 2026-10-18 是周日
+SUNDAY = datetime(2026, 10, 18, 10, 0, tzinfo=TZ)
+
+
+def _fire_times(expr, count):
+    trigger = _crontab_trigger(expr)
+    times, previous, now = [], None, SUNDAY
+    for _ in range(count):
+        previous = trigger.get_next_fire_time(previous, now)
+        times.append(previous)
+        now = previous
+    return times
+
+
+def test_weekday_range_is_monday_to_friday():
+    times = _fire_times("0 9 * * 1-5", 6)
+    assert [t.weekday() for t in times] == [0, 1, 2, 3, 4, 0]
+    assert times[0] == datetime(2026, 10, 19, 9, 0, tzinfo=TZ)
+
+
+@pytest.mark.parametrize("field", ["0", "7"])
+def test_zero_and_seven_are_sunday(field):
+    times = _fire_times(f"0 9 * * {field}", 2)
+    assert [t.weekday() for t in times] == [6, 6]
+    assert times[0] == datetime(2026, 10, 25, 9, 0, tzinfo=TZ)
+
+
+@pytest.mark.parametrize(
+    "field, expected",
+    [
+        ("*", "*"),
+        ("1-5", "0,1,2,3,4"),
+        ("0,6", "5,6"),
+        ("5-7", "4,5,6"),
+        ("*/2", "1,3,5,6"),
+        ("mon-fri", "mon-fri"),
+    ],
+)
+def test_day_of_week_translation(field, expected):
+    assert _crontab_day_of_week(field) == expected
+
+
+@pytest.mark.parametrize("field", ["8", "5-1", "1/0", "1-"])
+def test_invalid_day_of_week(field):
+    with pytest.raises(ValueError):
+        _crontab_trigger(f"0 9 * * {field}")
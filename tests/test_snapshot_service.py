@@ -0,0 +1,59 @@
+import gzip
+
+import pytest
+
+from app.services.snapshot_service import (
+    SNAPSHOT_FORMAT,
+    SNAPSHOT_VERSION,
+    SchemaSnapshotService,
+    dump_snapshot,
+    load_snapshot,
+)
+
+
+def _document(**source):
+    return {
+        "format": SNAPSHOT_FORMAT,
+        "version": SNAPSHOT_VERSION,
+        "source": source,
+        "objects": {},
+    }
+
+
+class _Session:
+    def add(self, obj):
+        self.added = obj
+
+    def commit(self):
+        pass
+
+    def refresh(self, obj):
+        pass
+
+
+def test_load_round_trip():
+    document = _document(name="conn", database="db")
+    assert load_snapshot(dump_snapshot(document)) == document
+    assert load_snapshot(dump_snapshot(document, compress=False)) == document
+
+
+def test_corrupt_gzip_raises_value_error():
+    data = dump_snapshot(_document())
+    for corrupt in (data[:len(data) // 2], data[:10], data[:2] + b"\x00" * 20):
+        with pytest.raises(ValueError):
+            load_snapshot(corrupt)
+
+
+def test_decompressed_size_limit():
+    data = gzip.compress(b" " * 10000)
+    with pytest.raises(ValueError):
+        load_snapshot(data, max_size=1000)
+
+
+def test_save_truncates_names():
+    service = SchemaSnapshotService.__new__(SchemaSnapshotService)
+    service.db = _Session()
+    snapshot = service.save(_document(name="c" * 80, database="d" * 80), "n" * 300)
+    assert snapshot.name == "n" * 100
+    assert snapshot.connection_name == "c" * 50
+    assert snapshot.database == "d" * 64
@@ -0,0 +1,76 @@
+from app.services.comparators.sql_normalizer import normalize_sql
+
+
+def test_header_clauses_are_ignored():
+    source = (
+        "CREATE ALGORITHM=UNDEFINED DEFINER=`root`@`%` SQL SECURITY DEFINER "
+        "VIEW `v` AS select 1"
+    )
+    target = "CREATE ALGORITHM=MERGE DEFINER=`app`@`10.0.0.1` SQL SECURITY INVOKER VIEW `v` AS select 1"
+    assert normalize_sql(source) == normalize_sql(target) == "CREATE VIEW `v` AS select 1"
+
+
+def test_definer_forms_in_header():
+    for definer in ("`root`@`%`", "'root'@'localhost'", "root@localhost", "CURRENT_USER()"):
+        sql = f"CREATE DEFINER={definer} PROCEDURE `p`() BEGIN SELECT 1; END"
+        assert normalize_sql(sql) == "CREATE PROCEDURE `p` ( ) BEGIN SELECT 1 ; END"
+
+
+def test_body_clauses_are_kept():
+    body = "CREATE DEFINER=`root`@`%` PROCEDURE `p`() BEGIN ALTER TABLE t ADD c INT, ALGORITHM={}; END"
+    assert normalize_sql(body.format("INPLACE")) != normalize_sql(body.format("COPY"))
+    assert "ALGORITHM = INPLACE" in normalize_sql(body.format("INPLACE"))
+
+
+def test_body_definer_and_sql_security_are_kept():
+    source = "CREATE PROCEDURE `p`() BEGIN CREATE DEFINER=`a`@`%` SQL SECURITY INVOKER VIEW v AS SELECT 1; END"
+    target = "CREATE PROCEDURE `p`() BEGIN CREATE DEFINER=`b`@`%` SQL SECURITY DEFINER VIEW v AS SELECT 1; END"
+    assert normalize_sql(source) != normalize_sql(target)
+
+
+def test_non_create_text_is_not_stripped():
+    assert normalize_sql("ALTER TABLE t ALGORITHM=INPLACE") == "ALTER TABLE t ALGORITHM = INPLACE"
+
+
+def test_comments_whitespace_and_strings():
+    source = "CREATE VIEW v AS /* c */ SELECT  'a  b' -- x\n FROM t"
+    assert normalize_sql(source) == "CREATE VIEW v AS SELECT 'a  b' FROM t"
+
+
+# SHOW CREATE PROCEDURE/FUNCTION 的实际输出：SQL SECURITY 位于参数列表或 RETURNS 子句之后
+_SHOW_CREATE_PROCEDURE = """CREATE DEFINER=`root`@`localhost` PROCEDURE `update_stock`(IN p_id INT, IN p_qty INT)
+    MODIFIES SQL DATA
+    {security}COMMENT 'adjust stock'
+BEGIN
+    UPDATE stock SET qty = qty - p_qty WHERE id = p_id;
+END"""
+
+_SHOW_CREATE_FUNCTION = """CREATE DEFINER=`app`@`%` FUNCTION `full_name`(first VARCHAR(50), last VARCHAR(50)) RETURNS varchar(101) CHARSET utf8mb4 COLLATE utf8mb4_bin
+    {deterministic}
+    {security}RETURN CONCAT(first, ' ', last)"""
+
+
+def test_routine_sql_security_is_ignored():
+    invoker = normalize_sql(_SHOW_CREATE_PROCEDURE.format(security="SQL SECURITY INVOKER\n    "))
+    definer = normalize_sql(_SHOW_CREATE_PROCEDURE.format(security=""))
+    assert invoker == definer
+    assert invoker.startswith(
+        "CREATE PROCEDURE `update_stock` ( IN p_id INT , IN p_qty INT ) "
+        "MODIFIES SQL DATA COMMENT 'adjust stock' BEGIN"
+    )
+
+
+def test_function_sql_security_after_returns_is_ignored():
+    invoker = _SHOW_CREATE_FUNCTION.format(deterministic="DETERMINISTIC", security="SQL SECURITY INVOKER\n")
+    definer = _SHOW_CREATE_FUNCTION.format(deterministic="DETERMINISTIC", security="")
+    assert normalize_sql(invoker) == normalize_sql(definer)
+    assert "SECURITY" not in normalize_sql(invoker)
+
+
+def test_other_routine_characteristics_are_kept():
+    deterministic = _SHOW_CREATE_FUNCTION.format(deterministic="DETERMINISTIC", security="")
+    not_deterministic = _SHOW_CREATE_FUNCTION.format(deterministic="NOT DETERMINISTIC", security="")
+    assert normalize_sql(deterministic) != normalize_sql(not_deterministic)
+    assert normalize_sql(_SHOW_CREATE_PROCEDURE.format(security="")) != normalize_sql(
+        _SHOW_CREATE_PROCEDURE.format(security="").replace("adjust stock", "other")
+    )